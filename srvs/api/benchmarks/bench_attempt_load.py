@@ -0,0 +1,153 @@
+"""
+Explainer pre-stream attempt load: full `get` vs `get_for_item` projection.
+
+Starts a local stand-in for PocketBase serving one attempt whose quiz has
+`--items` items and a materialsContext file with `--clusters` cluster
+vectors, then times PBAttemptRepository over the shared pooled client:
+- before: `get` (expand quiz.quizItems_via_quiz + materialsContext download)
+- after:  `get_for_item` (projected attempt + one item, concurrently)
+
+Run from srvs/api:
+    python -m benchmarks.bench_attempt_load
+    python -m benchmarks.bench_attempt_load --items 50 --clusters 60 --latency-ms 5
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from src.apps.quiz_attempter.adapters.out import PBAttemptRepository
+from src.lib.http_pool import PooledPocketBase, create_http_client
+from src.lib.settings import settings
+
+
+def build_payloads(items: int, clusters: int) -> dict[str, bytes]:
+    item_recs = [
+        {
+            "id": f"item{n:011d}",
+            "quiz": "quiz00000000001",
+            "order": n,
+            "question": f"Question {n} " + "lorem ipsum " * 20,
+            "answers": [
+                {"content": "answer " * 15, "correct": a == 0, "explanation": "why " * 80}
+                for a in range(4)
+            ],
+        }
+        for n in range(items)
+    ]
+    quiz = {
+        "id": "quiz00000000001",
+        "query": "Explain the topic",
+        "materials": ["mat000000000001"],
+        "materialsContext": "context.json",
+    }
+    attempt = {
+        "id": "attempt00000001",
+        "user": "user00000000001",
+        "choices": [{"answerIndex": 1, "correct": False}] * items,
+        "feedback": None,
+    }
+    vectors = [[random.uniform(-1, 1) for _ in range(1024)] for _ in range(clusters)]
+    return {
+        "full": json.dumps(
+            {**attempt, "expand": {"quiz": {**quiz, "expand": {"quizItems_via_quiz": item_recs}}}}
+        ).encode(),
+        "projected": json.dumps({**attempt, "expand": {"quiz": quiz}}).encode(),
+        "item": json.dumps(item_recs[items // 2]).encode(),
+        "file": json.dumps({"vectors": vectors, "thresholds": [0.5] * clusters}).encode(),
+        "item_id": item_recs[items // 2]["id"].encode(),
+    }
+
+
+async def start_standin(latency: float, payloads: dict[str, bytes]):
+    counters = {"requests": 0, "bytes": 0}
+
+    def route(target: str) -> bytes:
+        url = urlsplit(target)
+        params = parse_qs(url.query)
+        if url.path.startswith("/api/files/"):
+            return payloads["file"]
+        if "/quizItems/" in url.path:
+            return payloads["item"]
+        return payloads["projected"] if "fields" in params else payloads["full"]
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                target = head.split(b" ", 2)[1].decode()
+                body = route(target)
+                counters["requests"] += 1
+                counters["bytes"] += len(body)
+                await asyncio.sleep(latency)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"http://127.0.0.1:{port}/", counters
+
+
+async def measure(name, call, runs: int, counters: dict[str, int]) -> None:
+    counters["requests"] = counters["bytes"] = 0
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await call()
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    print(
+        f"{name:<14} p50={samples[len(samples) // 2] * 1000:7.2f} ms  "
+        f"p95={samples[int(len(samples) * 0.95)] * 1000:7.2f} ms  "
+        f"mean={statistics.fmean(samples) * 1000:7.2f} ms  "
+        f"requests/run={counters['requests'] / runs:.0f}  "
+        f"KiB/run={counters['bytes'] / runs / 1024:8.1f}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=30)
+    parser.add_argument("--clusters", type=int, default=40)
+    parser.add_argument("--latency-ms", type=float, default=3.0)
+    parser.add_argument("--runs", type=int, default=100)
+    args = parser.parse_args()
+
+    payloads = build_payloads(args.items, args.clusters)
+    server, url, counters = await start_standin(args.latency_ms / 1000, payloads)
+    settings.pb_url = url
+    client = create_http_client("pocketbase-admin", base_url=url)
+    repository = PBAttemptRepository(PooledPocketBase(client), http=client)
+    item_id = payloads["item_id"].decode()
+
+    # Warm up the connection pool
+    await repository.get_for_item("attempt00000001", item_id)
+
+    async def full():
+        attempt = await repository.get("attempt00000001")
+        # The old `get` downloaded cluster vectors eagerly
+        await repository.load_cluster_vectors(attempt.quiz)
+
+    async def projected():
+        await repository.get_for_item("attempt00000001", item_id)
+
+    await measure("get (before)", full, args.runs, counters)
+    await measure("get_for_item", projected, args.runs, counters)
+
+    await client.aclose()
+    server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
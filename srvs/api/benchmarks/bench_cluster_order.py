@@ -0,0 +1,65 @@
+"""
+Benchmark: farthest-point ordering of cluster centers.
+
+Compares the old pure-Python greedy traversal of KMeansQuizClusterer
+(`candidates` list + `max` with a lambda per step, float64 distance
+matrix) with `farthest_point_order`, for 500 and 5,000 centers of
+1024-dim Voyage-sized vectors. 5,000 is the fallback path of a large book
+where every chunk becomes a center.
+
+Run from srvs/api:
+    python -m benchmarks.bench_cluster_order
+"""
+
+import time
+
+import numpy as np
+
+from src.apps.quiz_owner.adapters.out.kmeans_quiz_clusterer import (
+    farthest_point_order,
+)
+
+DIM = 1024
+
+
+def old_reorder(centers: list[list[float]]) -> list[int]:
+    n = len(centers)
+    vecs = np.array(centers, dtype=np.float64)
+    vecs /= np.maximum(np.linalg.norm(vecs, axis=1, keepdims=True), 1e-12)
+    dists = 1.0 - vecs @ vecs.T
+    path = [0]
+    visited = {0}
+    for _ in range(n - 1):
+        current = path[-1]
+        candidates = [i for i in range(n) if i not in visited]
+        next_idx = max(candidates, key=lambda i: dists[current, i])
+        path.append(next_idx)
+        visited.add(next_idx)
+    return path
+
+
+def best_of(fn, runs: int) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    rng = np.random.default_rng(505)
+    print(f"{'centers':>8} {'old':>10} {'new':>10} {'speedup':>8}")
+    for n in (500, 5000):
+        vectors = rng.standard_normal((n, DIM)).astype(np.float32)
+        centers = vectors.tolist()
+        order = farthest_point_order(vectors)
+        assert sorted(order.tolist()) == list(range(n))
+
+        t_old = best_of(lambda: old_reorder(centers), 1 if n > 1000 else 3)
+        t_new = best_of(lambda: farthest_point_order(vectors), 3)
+        print(f"{n:>8} {t_old * 1000:>8.1f}ms {t_new * 1000:>8.1f}ms {t_old / t_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
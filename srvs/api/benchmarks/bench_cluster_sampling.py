@@ -0,0 +1,99 @@
+"""
+Benchmark: sampled vs full PCA+KMeans for very large quizzes.
+
+KMeansQuizClusterer._run_clustering on every chunk versus the sampled
+path used above `cluster_sample_threshold` (fit on a stratified sample of
+`cluster_sample_size` chunks, then assign all in batches). Input: several
+max-size books (~4,000 chunks of 512 tokens each under
+MAX_TEXT_INDEX_TOKENS), unit-norm 1024-dim vectors whose topics drift over
+the chunk order like book sections, k=50 clusters.
+
+Quality, over all chunks:
+- inertia: sum of (1 - cosine) of each chunk to its nearest center,
+  relative to the full fit (lower is better)
+- coverage: share of chunks a center search reaches, i.e. with cosine to
+  some center at or above that center's threshold
+- mean threshold: looser clusters have lower thresholds
+
+Run from srvs/api:
+    python -m benchmarks.bench_cluster_sampling
+"""
+
+import logging
+import time
+
+import numpy as np
+
+from src.apps.quiz_owner.adapters.out.kmeans_quiz_clusterer import (
+    KMeansQuizClusterer,
+)
+
+DIM = 1024
+CHUNKS_PER_BOOK = 4000
+SECTIONS_PER_BOOK = 80
+QUIZ_LENGTH = 50
+
+
+def books(n_books: int, rng: np.random.Generator) -> tuple[np.ndarray, list[str]]:
+    shared = rng.standard_normal((40, DIM)).astype(np.float32)
+    vectors, ids = [], []
+    for b in range(n_books):
+        # Sections mix shared subjects with book-specific wording
+        sections = shared[rng.integers(0, len(shared), SECTIONS_PER_BOOK)] + 0.7 * (
+            rng.standard_normal((SECTIONS_PER_BOOK, DIM)).astype(np.float32)
+        )
+        section = np.arange(CHUNKS_PER_BOOK) * SECTIONS_PER_BOOK // CHUNKS_PER_BOOK
+        chunks = sections[section] + 1.2 * rng.standard_normal(
+            (CHUNKS_PER_BOOK, DIM)
+        ).astype(np.float32)
+        vectors.append(chunks)
+        ids += [f"book{b}-{i}" for i in range(CHUNKS_PER_BOOK)]
+    matrix = np.concatenate(vectors)
+    return matrix / np.linalg.norm(matrix, axis=1, keepdims=True), ids
+
+
+def quality(
+    embeddings: np.ndarray, centers: list[list[float]], thresholds: list[float]
+) -> tuple[float, float, float]:
+    units = np.asarray(centers, dtype=np.float32)
+    units /= np.linalg.norm(units, axis=1, keepdims=True)
+    similarity = embeddings @ units.T
+    inertia = float((1.0 - similarity.max(axis=1)).sum())
+    coverage = float((similarity >= np.asarray(thresholds)).any(axis=1).mean())
+    return inertia, coverage, float(np.mean(thresholds))
+
+
+def main() -> None:
+    logging.disable(logging.INFO)
+    clusterer = KMeansQuizClusterer(material_app=None)  # type: ignore[arg-type]
+    rng = np.random.default_rng(505)
+    # Pays the lazy sklearn import outside the timings
+    clusterer._run_clustering("warmup", 5, rng.standard_normal((100, 8)))
+    print(
+        f"{'chunks':>7} {'path':>8} {'time':>8} {'inertia':>8} "
+        f"{'coverage':>9} {'threshold':>10} {'k':>4}"
+    )
+    for n_books in (3, 5):
+        embeddings, ids = books(n_books, rng)
+        results = {}
+        for path, path_ids in (("full", None), ("sampled", ids)):
+            elapsed = float("inf")
+            for _ in range(3):
+                started = time.perf_counter()
+                centers, thresholds = clusterer._run_clustering(
+                    "bench", QUIZ_LENGTH, embeddings, path_ids
+                )
+                elapsed = min(elapsed, time.perf_counter() - started)
+            results[path] = (elapsed, *quality(embeddings, centers, thresholds), len(centers))
+
+        full_time, full_inertia = results["full"][:2]
+        for path, (elapsed, inertia, coverage, threshold, k) in results.items():
+            print(
+                f"{len(ids):>7} {path:>8} {elapsed:7.2f}s {inertia / full_inertia:8.3f} "
+                f"{coverage:9.1%} {threshold:10.3f} {k:>4}"
+            )
+        print(f"{'':>7} {'speedup':>8} {full_time / results['sampled'][0]:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark: per-cluster centers and thresholds after KMeans.
+
+Compares the old loop of KMeansQuizClusterer._run_clustering (a boolean
+mask over all embeddings, a mean and a normalisation of the members per
+cluster), a fully vectorised one-hot matmul variant and `cluster_stats`,
+for k=50 clusters over 20,000 chunks of 1024-dim Voyage-sized vectors, and
+checks that they agree.
+
+The one-hot variant is ~2 GFLOP of matmul for k=50 and loses on a single
+core; `cluster_stats` keeps the per-cluster blocks but gathers them from
+one argsort and reduces each while it is in cache.
+
+Run from srvs/api:
+    python -m benchmarks.bench_cluster_stats
+"""
+
+import time
+
+import numpy as np
+
+from src.apps.quiz_owner.adapters.out.cluster_model import cluster_stats
+
+DIM = 1024
+N_CHUNKS = 20_000
+N_CLUSTERS = 50
+
+
+def old_stats(embeddings: np.ndarray, labels: np.ndarray):
+    centers, min_similarities = [], []
+    for cluster_id in sorted(np.unique(labels)):
+        cluster_mask = labels == cluster_id
+        cluster_embeddings = embeddings[cluster_mask]
+        center = np.mean(cluster_embeddings, axis=0)
+        center_normalized = center / np.linalg.norm(center)
+        embeddings_normalized = cluster_embeddings / np.linalg.norm(
+            cluster_embeddings, axis=1, keepdims=True
+        )
+        cosine_similarities = np.dot(embeddings_normalized, center_normalized)
+        centers.append(center)
+        min_similarities.append(float(np.min(cosine_similarities)))
+    return np.array(centers), np.array(min_similarities)
+
+
+def onehot_stats(embeddings: np.ndarray, labels: np.ndarray):
+    clusters, inverse = np.unique(labels, return_inverse=True)
+    one_hot = np.zeros((len(clusters), len(labels)), dtype=np.float32)
+    one_hot[inverse, np.arange(len(labels))] = 1.0
+    counts = one_hot.sum(axis=1)
+    centers = (one_hot @ embeddings) / counts[:, None]
+    units = centers / np.linalg.norm(centers, axis=1, keepdims=True)
+    norms = np.sqrt(np.einsum("ij,ij->i", embeddings, embeddings))
+    similarity = (embeddings @ units.T)[np.arange(len(labels)), inverse] / norms
+    min_similarity = np.full(len(clusters), np.inf, dtype=np.float32)
+    np.minimum.at(min_similarity, inverse, similarity)
+    return centers, min_similarity
+
+
+def best_of(fn, runs: int) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    rng = np.random.default_rng(505)
+    means = rng.standard_normal((N_CLUSTERS, DIM)).astype(np.float32)
+    labels = rng.integers(0, N_CLUSTERS, N_CHUNKS)
+    embeddings = means[labels] + rng.standard_normal((N_CHUNKS, DIM)).astype(
+        np.float32
+    )
+
+    old_centers, old_min = old_stats(embeddings, labels)
+    _, centers, _, min_similarity = cluster_stats(embeddings, labels)
+    assert np.allclose(old_centers, centers, atol=1e-4)
+    assert np.allclose(old_min, min_similarity, atol=1e-4)
+    assert np.allclose(old_min, onehot_stats(embeddings, labels)[1], atol=1e-4)
+
+    t_old = best_of(lambda: old_stats(embeddings, labels), 5)
+    t_onehot = best_of(lambda: onehot_stats(embeddings, labels), 5)
+    t_new = best_of(lambda: cluster_stats(embeddings, labels), 5)
+    print(f"k={N_CLUSTERS}, n={N_CHUNKS}, d={DIM}")
+    print(f"{'old':>8} {t_old * 1000:9.1f} ms")
+    print(f"{'one-hot':>8} {t_onehot * 1000:9.1f} ms  {t_old / t_onehot:4.1f}x")
+    print(f"{'new':>8} {t_new * 1000:9.1f} ms  {t_old / t_new:4.1f}x")
+
+
+if __name__ == "__main__":
+    main()
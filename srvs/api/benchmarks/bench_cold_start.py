@@ -0,0 +1,75 @@
+"""
+Benchmark: cold start of the shared composition root.
+
+Builds the full dependency graph the way the API lifespan and the ARQ worker
+do (`Container.edge_api_app()`), several times in a row with a fresh
+container each time. The first build after a settings change pushes Meili
+index settings; subsequent builds find the stored hash and skip them.
+
+Needs the real services from the environment (.env): PocketBase, Redis,
+Meilisearch. Run from srvs/api:
+    python -m benchmarks.bench_cold_start
+    python -m benchmarks.bench_cold_start --reset   # forget stored hashes first
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from src.bootstrap.container import Container
+from src.lib.index_settings import INDEX_SETTINGS_KEY
+
+
+class _Counter(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.applied = 0
+        self.skipped = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        msg = record.getMessage()
+        if "settings applied" in msg:
+            self.applied += 1
+        elif "settings unchanged" in msg:
+            self.skipped += 1
+
+
+async def build_once(counter: _Counter) -> float:
+    counter.applied = counter.skipped = 0
+    container = Container()
+    started = time.perf_counter()
+    await container.edge_api_app()
+    elapsed = time.perf_counter() - started
+    await container.aclose()
+    return elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--reset", action="store_true")
+    args = parser.parse_args()
+
+    counter = _Counter()
+    index_logger = logging.getLogger("src.lib.index_settings")
+    index_logger.setLevel(logging.INFO)
+    index_logger.addHandler(counter)
+
+    if args.reset:
+        container = Container()
+        redis_client = await container.redis_client()
+        keys = [INDEX_SETTINGS_KEY.format(index_uid=uid) for uid in ("materialChunk", "quizSummaries")]
+        await redis_client.delete(*keys)
+        await container.aclose()
+
+    for run in range(1, args.runs + 1):
+        elapsed = await build_once(counter)
+        print(
+            f"run {run}: {elapsed * 1000:8.1f} ms  "
+            f"(index settings applied: {counter.applied}, skipped: {counter.skipped})"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
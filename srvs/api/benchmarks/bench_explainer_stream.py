@@ -0,0 +1,207 @@
+"""
+Explainer SSE streaming cost with a stubbed model.
+
+A FunctionModel streams `--tokens` tokens, one every `--token-ms`, and the
+answer is pushed all the way to SSE frames. Compares:
+- before: stream_output() re-slicing the accumulated output on every tick,
+  (debounced by 100 ms, so the first frame waits for the first group), a
+  MessageRef per tick, asdict + json.dumps per frame
+- after:  AIGrokExplainer.explain (stream_text(delta=True), first delta
+  sent at once, then one frame per stream window) + SSETextEncoder
+
+Reports CPU time per streamed token, SSE frames per answer and the delay of
+the first frame after the first token. `model`
+only drains the stubbed model stream: the floor neither path can go below.
+
+Run from srvs/api:
+    python -m benchmarks.bench_explainer_stream
+    python -m benchmarks.bench_explainer_stream --tokens 800 --token-ms 1
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import time
+from dataclasses import asdict
+
+os.environ.setdefault("PYDANTIC_AI_NO_BANNER", "1")
+
+from pydantic_ai import Agent
+from pydantic_ai.models.function import FunctionModel
+
+from src.apps.quiz_attempter.adapters.out import AIGrokExplainer
+from src.apps.quiz_attempter.domain._in import AskExplainerResult
+from src.apps.quiz_attempter.domain.models import Attempt
+from src.apps.quiz_attempter.domain.refs import (
+    MessageMetadataRef,
+    MessageRef,
+    MessageRoleRef,
+    MessageStatusRef,
+    QuizItemRef,
+    QuizRef,
+)
+from src.lib.settings import settings
+from src.lib.utils import SSETextEncoder, sse
+
+ITEM = QuizItemRef(id="i1", question="What is ATP?", answers=["Energy carrier"])
+
+
+class StubLangfuse:
+    @contextlib.contextmanager
+    def start_as_current_span(self, name: str):
+        yield None
+
+
+def make_attempt() -> tuple[Attempt, MessageRef]:
+    attempt = Attempt.__new__(Attempt)
+    attempt.id, attempt.user_id, attempt.message_history = "a1", "u1", []
+    attempt.quiz = QuizRef(
+        id="q1", items=[ITEM], query="", material_ids=[], material_content=""
+    )
+    ai_msg = MessageRef(
+        id="msg_0123456789",
+        attempt_id="a1",
+        item_id="i1",
+        content="",
+        role=MessageRoleRef.AI,
+        status=MessageStatusRef.STREAMING,
+        metadata=MessageMetadataRef(),
+    )
+    return attempt, ai_msg
+
+
+async def legacy_explain(agent: Agent, attempt: Attempt, ai_msg: MessageRef):
+    """The previous producer / consumer, kept here for comparison."""
+    queue: asyncio.Queue[MessageRef | None] = asyncio.Queue()
+
+    async def producer():
+        content = ""
+        try:
+            async with agent.run_stream("Why?") as run:
+                async for output in run.stream_output():
+                    delta = output[len(content) :]
+                    content += delta
+                    await queue.put(
+                        MessageRef(
+                            id=ai_msg.id,
+                            attempt_id=attempt.id,
+                            item_id=ITEM.id,
+                            content=delta,
+                            role=MessageRoleRef.AI,
+                            status=MessageStatusRef.STREAMING,
+                            metadata=MessageMetadataRef(),
+                        )
+                    )
+            await queue.put(
+                MessageRef(
+                    id=ai_msg.id,
+                    attempt_id=attempt.id,
+                    item_id=ITEM.id,
+                    content=content,
+                    role=MessageRoleRef.AI,
+                    status=MessageStatusRef.FINAL,
+                    metadata=MessageMetadataRef(),
+                )
+            )
+        finally:
+            await queue.put(None)
+
+    task = asyncio.create_task(producer())
+    while (message := await queue.get()) is not None:
+        yield message
+    await task
+
+
+def to_result(message: MessageRef) -> AskExplainerResult:
+    status = "chunk" if message.status == MessageStatusRef.STREAMING else "done"
+    return AskExplainerResult(text=message.content, msg_id=message.id, i=0, status=status)
+
+
+async def model_only(agent: Agent) -> tuple[list[str], float]:
+    frames, first = [], 0.0
+    async with agent.run_stream("Why?") as run:
+        async for delta in run.stream_text(delta=True, debounce_by=None):
+            first = first or time.perf_counter()
+            frames.append(delta)
+    return frames, first
+
+
+async def before(agent: Agent) -> tuple[list[str], float]:
+    attempt, ai_msg = make_attempt()
+    frames, first = [], 0.0
+    async for message in legacy_explain(agent, attempt, ai_msg):
+        run = to_result(message)
+        frames.append(sse(run.status, asdict(run)))
+        first = first or time.perf_counter()
+    return frames, first
+
+
+async def after(explainer: AIGrokExplainer) -> tuple[list[str], float]:
+    attempt, ai_msg = make_attempt()
+    encoder = SSETextEncoder()
+    frames, first = [], 0.0
+    async for message in explainer.explain(
+        "Why?", attempt, ITEM, ai_msg, "k", [], None, chunks=[]
+    ):
+        run = to_result(message)
+        frames.append(
+            encoder.encode(
+                run.status, run.text, msg_id=run.msg_id, i=run.i, status=run.status
+            )
+        )
+        first = first or time.perf_counter()
+    return frames, first
+
+
+async def measure(
+    name: str, answer, tokens: int, rounds: int, first_token: list[float]
+) -> None:
+    cpu = wall = first = 0.0
+    frames: list[str] = []
+    for _ in range(rounds):
+        started_cpu, started = time.process_time(), time.perf_counter()
+        frames, first_frame = await answer()
+        cpu += time.process_time() - started_cpu
+        wall += time.perf_counter() - started
+        first += first_frame - first_token[0]
+    print(
+        f"{name:<8} cpu/token={cpu / rounds / tokens * 1e6:7.1f} us  "
+        f"frames/answer={len(frames):5d}  "
+        f"bytes/answer={sum(len(f) for f in frames):7d}  "
+        f"first_frame={first / rounds * 1000:6.1f} ms  "
+        f"wall/answer={wall / rounds * 1000:7.1f} ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokens", type=int, default=600)
+    parser.add_argument("--token-ms", type=float, default=2.0)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--window", type=float, default=settings.explainer_stream_window)
+    args = parser.parse_args()
+    settings.explainer_stream_window = args.window
+
+    first_token = [0.0]
+
+    async def stream(messages, info):
+        for n in range(args.tokens):
+            await asyncio.sleep(args.token_ms / 1000)
+            if n == 0:
+                first_token[0] = time.perf_counter()
+            yield f" word{n % 97}"
+
+    agent = Agent(output_type=str)
+    explainer = AIGrokExplainer.__new__(AIGrokExplainer)
+    explainer._lf = StubLangfuse()
+    explainer._ai = agent
+
+    with agent.override(model=FunctionModel(stream_function=stream)):
+        await measure("model", lambda: model_only(agent), args.tokens, args.rounds, first_token)
+        await measure("before", lambda: before(agent), args.tokens, args.rounds, first_token)
+        await measure("after", lambda: after(explainer), args.tokens, args.rounds, first_token)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,203 @@
+"""
+Explainer time-to-first-token with stubbed backends.
+
+Every backend call ask_explainer makes before the first token is replaced
+by a stub that sleeps for a typical latency (flags below). Compares:
+- before: the old strictly sequential order (attempt -> start_message ->
+  full history + Python filter -> embed -> vector search -> rerank)
+- after:  QuizAttempterAppImpl.ask_explainer (history alongside the
+  attempt load; start_message alongside retrieval; history filtered by
+  item server-side)
+
+Run from srvs/api:
+    python -m benchmarks.bench_explainer_ttft
+    python -m benchmarks.bench_explainer_ttft --embed-ms 150 --rerank-ms 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from types import SimpleNamespace
+
+from src.apps.message_owner.domain._in import GetAttemptHistoryCmd, StartMessageCmd
+from src.apps.message_owner.domain.models import (
+    Message,
+    MessageMetadata,
+    MessageRole,
+    MessageStatus,
+)
+from src.apps.quiz_attempter.app.usecases import QuizAttempterAppImpl
+from src.apps.quiz_attempter.domain._in import AskExplainerCmd
+from src.apps.quiz_attempter.domain.models import Attempt
+from src.apps.quiz_attempter.domain.refs import (
+    MessageMetadataRef,
+    MessageRef,
+    MessageRoleRef,
+    MessageStatusRef,
+    QuizItemRef,
+    QuizRef,
+)
+from src.apps.user_owner.domain._in import Principal
+from src.apps.user_owner.domain.models import Tariff
+
+USER = Principal(
+    id="u1",
+    remaining=100,
+    used=0,
+    limit=100,
+    storage_usage=0,
+    storage_limit=0,
+    tariff=Tariff.PLUS,
+)
+
+
+def sleep_ms(ms: float):
+    return asyncio.sleep(ms / 1000)
+
+
+class StubAttempts:
+    def __init__(self, lat):
+        self.lat = lat
+
+    async def get_for_item(self, id: str, item_id: str) -> Attempt:
+        await sleep_ms(self.lat.attempt_ms)
+        item = QuizItemRef(id=item_id, question="Q?", answers=["A"])
+        quiz = QuizRef(
+            id="q1", items=[item], query="", material_ids=["m1"], material_content=""
+        )
+        return Attempt(id=id, user_id=USER.id, quiz=quiz)
+
+
+class StubMessages:
+    def __init__(self, lat, items: int):
+        self.lat = lat
+        self.items = items
+
+    def _message(self, item_id: str, n: int) -> Message:
+        return Message(
+            attempt_id="a1",
+            content=f"message {n}",
+            role=MessageRole.USER if n % 2 else MessageRole.AI,
+            status=MessageStatus.FINAL,
+            metadata=MessageMetadata(item_id=item_id),
+        )
+
+    async def start_message(self, cmd: StartMessageCmd) -> Message:
+        await sleep_ms(self.lat.create_ms)
+        return Message.create(cmd.attempt_id, MessageRole.AI, cmd.item_id)
+
+    async def get_attempt_history(self, cmd: GetAttemptHistoryCmd) -> list[Message]:
+        if cmd.item_id:
+            await sleep_ms(self.lat.history_item_ms)
+            return [self._message(cmd.item_id, n) for n in range(6)]
+        await sleep_ms(self.lat.history_full_ms)
+        return [
+            self._message(f"i{i}", n) for i in range(self.items) for n in range(6)
+        ][-cmd.limit :]
+
+    async def finalize_message(self, cmd) -> None: ...
+
+
+class StubExplainer:
+    def __init__(self, lat):
+        self.lat = lat
+
+    async def retrieve(self, query, item, material_ids, user, follow_up=False):
+        await sleep_ms(self.lat.embed_ms)
+        await sleep_ms(self.lat.search_ms)
+        await sleep_ms(self.lat.rerank_ms)
+        return []
+
+    async def explain(self, query, attempt, item, ai_msg, cache_key, material_ids, user, chunks=None):
+        if chunks is None:
+            chunks = await self.retrieve(query, item, material_ids, user)
+        yield MessageRef(
+            id=ai_msg.id,
+            attempt_id=attempt.id,
+            item_id=item.id,
+            content="first token",
+            role=MessageRoleRef.AI,
+            status=MessageStatusRef.STREAMING,
+            metadata=MessageMetadataRef(),
+        )
+
+
+async def sequential_ttft(app: QuizAttempterAppImpl, cmd: AskExplainerCmd) -> None:
+    """The pre-change order of ask_explainer, on the same stubs."""
+    attempt = await app.attempt_repository.get_for_item(cmd.attempt_id, cmd.item_id)
+    await app.validate_attempt(attempt, cmd.user, with_feedback=False)
+    ai_message = await app.message_owner.start_message(
+        StartMessageCmd(attempt_id=attempt.id, item_id=cmd.item_id)
+    )
+    history = await app.message_owner.get_attempt_history(
+        GetAttemptHistoryCmd(attempt_id=attempt.id, limit=100)
+    )
+    history = [app._to_message_ref(m) for m in history]
+    attempt.set_history([m for m in history if m.item_id == cmd.item_id])
+    item = attempt.get_item(cmd.item_id)
+    async for _ in app.explainer.explain(
+        cmd.query,
+        attempt,
+        item,
+        app._to_message_ref(ai_message),
+        cmd.cache_key,
+        attempt.quiz.material_ids,
+        cmd.user,
+    ):
+        return
+
+
+async def parallel_ttft(app: QuizAttempterAppImpl, cmd: AskExplainerCmd) -> None:
+    async for _ in app.ask_explainer(cmd):
+        return
+
+
+async def measure(name: str, fn, app, cmd, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await fn(app, cmd)
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    p50 = samples[len(samples) // 2]
+    print(
+        f"{name:<12} TTFT p50={p50:7.1f} ms  p95={samples[int(len(samples) * 0.95)]:7.1f} ms"
+        f"  mean={statistics.fmean(samples):7.1f} ms"
+    )
+    return p50
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--attempt-ms", type=float, default=7)
+    parser.add_argument("--create-ms", type=float, default=12)
+    parser.add_argument("--history-full-ms", type=float, default=25)
+    parser.add_argument("--history-item-ms", type=float, default=6)
+    parser.add_argument("--embed-ms", type=float, default=90)
+    parser.add_argument("--search-ms", type=float, default=35)
+    parser.add_argument("--rerank-ms", type=float, default=120)
+    parser.add_argument("--items", type=int, default=30)
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+
+    lat = SimpleNamespace(**vars(args))
+    app = QuizAttempterAppImpl(
+        attempt_repository=StubAttempts(lat),
+        explainer=StubExplainer(lat),
+        message_owner=StubMessages(lat, args.items),
+        llm_tools=None,
+        finalizer=None,
+        material_app=None,
+    )
+    cmd = AskExplainerCmd(
+        cache_key="k", query="why?", item_id="i3", attempt_id="a1", user=USER
+    )
+
+    before = await measure("before", sequential_ttft, app, cmd, args.runs)
+    after = await measure("after", parallel_ttft, app, cmd, args.runs)
+    print(f"TTFT p50: {before:.1f} ms -> {after:.1f} ms ({before / after:.2f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+"""
+Benchmark: cold import cost of the API entrypoint.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter, sums
+the self time per root package, reports peak RSS of the child and whether the
+heavy ML stack (sklearn / bertopic / umap / hdbscan / torch ...) got loaded.
+
+Run from srvs/api:
+    python -m benchmarks.bench_import_time
+    python -m benchmarks.bench_import_time src.apps.quiz_owner.di --top 20
+
+Note: `src.bootstrap.app` queries Stripe prices at import time, so without
+network access the import aborts there; the modules loaded up to that point
+are still reported.
+"""
+
+import argparse
+import resource
+import subprocess
+import sys
+from collections import defaultdict
+
+HEAVY = (
+    "sklearn",
+    "bertopic",
+    "umap",
+    "hdbscan",
+    "numba",
+    "pynndescent",
+    "torch",
+    "sentence_transformers",
+    "pandas",
+    "scipy",
+)
+
+PROBE = """
+import sys
+try:
+    import {module}
+except BaseException as e:
+    print(f"IMPORT_ERROR {{type(e).__name__}}", file=sys.stderr)
+print("LOADED " + ",".join(m for m in {heavy!r} if m in sys.modules), file=sys.stderr)
+"""
+
+
+def run(module: str) -> tuple[dict[str, int], list[str], str | None, int]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(module=module, heavy=HEAVY)],
+        capture_output=True,
+        text=True,
+    )
+    rss_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+
+    by_package: dict[str, int] = defaultdict(int)
+    loaded: list[str] = []
+    error = None
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            self_us, _, name = line[len("import time:") :].split("|")
+            if self_us.strip().isdigit():
+                by_package[name.strip().split(".")[0]] += int(self_us)
+        elif line.startswith("LOADED "):
+            loaded = [m for m in line[len("LOADED ") :].split(",") if m]
+        elif line.startswith("IMPORT_ERROR "):
+            error = line[len("IMPORT_ERROR ") :]
+    return by_package, loaded, error, rss_kb
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("module", nargs="?", default="src.bootstrap.app")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    by_package, loaded, error, rss_kb = run(args.module)
+
+    total_ms = sum(by_package.values()) / 1000
+    print(f"module     : {args.module}")
+    if error:
+        print(f"!! import aborted with {error}, numbers cover the partial import")
+    print(f"import time: {total_ms:8.1f} ms")
+    print(f"peak RSS   : {rss_kb / 1024:8.1f} MiB")
+    print(f"heavy deps : {', '.join(loaded) or 'none'}")
+    print()
+    print(f"top {args.top} packages by self import time:")
+    for pkg, us in sorted(by_package.items(), key=lambda kv: kv[1], reverse=True)[
+        : args.top
+    ]:
+        print(f"  {us / 1000:8.1f} ms  {pkg}")
+
+
+if __name__ == "__main__":
+    main()
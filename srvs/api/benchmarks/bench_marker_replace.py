@@ -0,0 +1,53 @@
+"""
+Benchmark: image marker substitution for a 300-slide deck with 300 images.
+
+Compares the old per-marker `str.replace` loop with the single-pass
+`replace_markers` used by MaterialAppImpl.add_material.
+
+Run from srvs/api:
+    python -m benchmarks.bench_marker_replace
+"""
+
+import timeit
+
+from src.lib.utils.markers import replace_markers
+
+SLIDES = 300
+SLIDE_TEXT = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 60
+PB_URL = "http://localhost:8090/api/files/materials/m123"
+
+
+def build_deck() -> tuple[str, dict[str, str]]:
+    parts = []
+    replacements = {}
+    for n in range(1, SLIDES + 1):
+        marker = f"{{quizbee_image_p{n}_img0}}"
+        parts.append(f"{{quizbee_page_number_{n}}}\n\n{SLIDE_TEXT}\n{marker}\n")
+        replacements[marker] = (
+            f"\n{{quizbee_unique_image_url:{PB_URL}/m123_p{n}_img0.png}}\n"
+        )
+    return "\n\n".join(parts), replacements
+
+
+def loop_replace(text: str, replacements: dict[str, str]) -> str:
+    for marker, url in replacements.items():
+        text = text.replace(marker, url)
+    return text
+
+
+def main() -> None:
+    text, replacements = build_deck()
+    assert loop_replace(text, replacements) == replace_markers(text, replacements)
+
+    runs = 20
+    t_loop = timeit.timeit(lambda: loop_replace(text, replacements), number=runs)
+    t_single = timeit.timeit(lambda: replace_markers(text, replacements), number=runs)
+
+    print(f"text: {len(text) / 1024 / 1024:.2f} MiB, markers: {len(replacements)}")
+    print(f"str.replace loop : {t_loop / runs * 1000:8.2f} ms")
+    print(f"replace_markers  : {t_single / runs * 1000:8.2f} ms")
+    print(f"speedup          : {t_loop / t_single:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Load test: user-token PocketBase calls, per-request client vs shared pool.
+
+Starts a local stand-in for PocketBase (HTTP/1.1 keep-alive, fixed service
+latency) and fires `auth.refresh` the way PBUserVerifier.verify does:
+- before: a brand-new `PocketBase(url)` (and connection pool) per call
+- after:  `PooledPocketBase` over one shared, configured httpx client
+
+Run from srvs/api:
+    python -m benchmarks.load_pb_pool
+    python -m benchmarks.load_pb_pool --requests 5000 --concurrency 100 --latency-ms 2
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import statistics
+import time
+from typing import Awaitable, Callable
+
+from pocketbase import PocketBase
+
+from src.lib.http_pool import PooledPocketBase, create_http_client, pool_stats
+
+TOKEN = (
+    "eyJhbGciOiJIUzI1NiJ9."
+    "eyJpZCI6InUxIiwidHlwZSI6ImF1dGgiLCJleHAiOjQxMDI0NDQ4MDB9."
+    "sig"
+)
+BODY = json.dumps({"token": TOKEN, "record": {"id": "u1", "email": "u@x.io"}}).encode()
+
+
+async def start_standin(latency: float) -> tuple[asyncio.Server, str, dict[str, int]]:
+    counters = {"connections": 0, "requests": 0}
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        counters["connections"] += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                if length:
+                    await reader.readexactly(length)
+                counters["requests"] += 1
+                await asyncio.sleep(latency)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: " + str(len(BODY)).encode() + b"\r\n\r\n" + BODY
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"http://127.0.0.1:{port}", counters
+
+
+async def run(
+    call: Callable[[], Awaitable[None]], requests: int, concurrency: int
+) -> list[float]:
+    latencies: list[float] = []
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with sem:
+            started = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies
+
+
+def report(name: str, latencies: list[float], wall: float, counters: dict[str, int]):
+    ordered = sorted(latencies)
+    p = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+    print(
+        f"{name:<22} p50={p(0.50):7.2f} ms  p99={p(0.99):7.2f} ms  "
+        f"mean={statistics.fmean(latencies) * 1000:7.2f} ms  "
+        f"rps={len(latencies) / wall:8.0f}  tcp_conns={counters['connections']}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    # BEFORE: new PocketBase (and pool) per call, as in the old verifier
+    server, url, counters = await start_standin(args.latency_ms / 1000)
+
+    async def per_request_client():
+        pb = PocketBase(url)
+        pb._inners.auth.set_user({"token": TOKEN, "record": {}})
+        await pb.collection("users").auth.refresh()
+
+    started = time.perf_counter()
+    before = await run(per_request_client, args.requests, args.concurrency)
+    report("per-request client", before, time.perf_counter() - started, counters)
+    server.close()
+    # Drop the abandoned per-request clients before measuring the next phase
+    gc.collect()
+    await asyncio.sleep(0.5)
+
+    # AFTER: one shared pool for all user-token calls
+    server, url, counters = await start_standin(args.latency_ms / 1000)
+    shared = create_http_client("pocketbase-user", base_url=url)
+
+    async def pooled_client():
+        pb = PooledPocketBase(shared)
+        pb._inners.auth.set_user({"token": TOKEN, "record": {}})
+        await pb.collection("users").auth.refresh()
+
+    started = time.perf_counter()
+    after = await run(pooled_client, args.requests, args.concurrency)
+    report("shared pool", after, time.perf_counter() - started, counters)
+    print(f"pool stats: {pool_stats()['pocketbase-user']}")
+
+    await shared.aclose()
+    server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
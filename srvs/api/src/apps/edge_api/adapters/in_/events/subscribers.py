@@ -27,13 +27,18 @@ def job(**opts):
     return deco
 
 
+def _with_job_id(ctx, payload: dict) -> dict:
+    # job_id survives ARQ retries: usage of a retried job is charged once
+    return {**payload, "idempotency_key": ctx.get("job_id", "")}
+
+
 @job(name=JobName.start_quiz, max_tries=3)
 async def start_quiz_job(ctx, payload: dict):
     logger.info(f"Starting quiz job with payload: {payload}")
 
     await ensure_admin_pb(ctx)
     edge: EdgeAPIApp = ctx["edge"]
-    cmd = PublicStartQuizCmd(**payload)
+    cmd = PublicStartQuizCmd(**_with_job_id(ctx, payload))
     return await edge.start_quiz(cmd)
 
 
@@ -42,16 +47,26 @@ async def finalize_quiz_job(ctx, payload: dict):
     logger.info(f"Finalizing quiz job with payload: {payload}")
     await ensure_admin_pb(ctx)
     edge: EdgeAPIApp = ctx["edge"]
-    cmd = PublicFinalizeQuizCmd(**payload)
+    cmd = PublicFinalizeQuizCmd(**_with_job_id(ctx, payload))
     return await edge.finalize_quiz(cmd)
 
 
 @job(name=JobName.generate_quiz_items, max_tries=3)
 async def generate_quiz_items_job(ctx, payload: dict):
     logger.info(f"Generating quiz items job with payload: {payload}")
+    if payload.get("coalesce_key"):
+        # Every PATCH enqueued under this job id since the previous claim
+        patches = await ctx["job_coalescer"].claim(
+            payload["coalesce_key"], ctx["job_id"]
+        )
+        if patches == 0:
+            logger.info(f"Nothing pending for {payload['coalesce_key']}, skipping")
+            return
+        payload = {**payload, "patches": patches}
+
     await ensure_admin_pb(ctx)
     edge: EdgeAPIApp = ctx["edge"]
-    cmd = PublicGenerateQuizItemsCmd(**payload)
+    cmd = PublicGenerateQuizItemsCmd(**_with_job_id(ctx, payload))
     return await edge.generate_quiz_items(cmd)
 
 
@@ -60,7 +75,7 @@ async def finalize_attempt_job(ctx, payload: dict):
     logger.info(f"Finalizing attempt job with payload: {payload}")
     await ensure_admin_pb(ctx)
     edge: EdgeAPIApp = ctx["edge"]
-    cmd = PublicFinalizeAttemptCmd(**payload)
+    cmd = PublicFinalizeAttemptCmd(**_with_job_id(ctx, payload))
     return await edge.finalize_attempt(cmd)
 
 
@@ -82,6 +97,7 @@ async def add_material_job(ctx, payload: dict):
         title=payload["title"],
         material_id=payload["material_id"],
         hash=payload.get("hash", ""),
+        idempotency_key=ctx.get("job_id", ""),
     )
     return await edge.add_material(cmd)
 
@@ -91,5 +107,5 @@ async def remove_material_job(ctx, payload: dict):
     logger.info(f"Removing material job with payload: {payload}")
     await ensure_admin_pb(ctx)
     edge: EdgeAPIApp = ctx["edge"]
-    cmd = PublicRemoveMaterialCmd(**payload)
+    cmd = PublicRemoveMaterialCmd(**_with_job_id(ctx, payload))
     return await edge.remove_material(cmd)
@@ -2,9 +2,11 @@ import time
 from typing import Annotated
 from src.apps.edge_api.adapters.in_.http.schemas import JobDto
 from arq import ArqRedis
+import httpx
 from pocketbase import PocketBase
 from fastapi import Depends, HTTPException, Request
 
+from src.lib.job_coalescer import JobCoalescer
 from src.lib.settings import settings
 
 from ....domain._in import EdgeAPIApp
@@ -36,6 +38,13 @@ def get_arq_pool(request: Request) -> ArqRedis:
 ArqPoolDeps = Annotated[ArqRedis, Depends(get_arq_pool)]
 
 
+def get_job_coalescer(request: Request) -> JobCoalescer:
+    return request.app.state.job_coalescer
+
+
+JobCoalescerDeps = Annotated[JobCoalescer, Depends(get_job_coalescer)]
+
+
 def get_admin_pb(request: Request) -> PocketBase:
     return request.app.state.admin_pb
 
@@ -43,6 +52,14 @@ def get_admin_pb(request: Request) -> PocketBase:
 AdminPBDeps = Annotated[PocketBase, Depends(get_admin_pb)]
 
 
+def get_user_pb_http(request: Request) -> httpx.AsyncClient:
+    """Shared connection pool for PocketBase calls made with user tokens."""
+    return request.app.state.user_pb_http
+
+
+UserPBHttpDeps = Annotated[httpx.AsyncClient, Depends(get_user_pb_http)]
+
+
 async def enqueue_job(r: ArqRedis, job: JobDto, window_ms: int):
     now_s = int(time.time())
     window_s = max(1, window_ms // 1000)
@@ -1,15 +1,20 @@
 from dataclasses import asdict
+import logging
+import time
+
 from fastapi import (
     APIRouter,
     File,
     Form,
+    Header,
     Query,
     UploadFile,
     status,
 )
 from fastapi.responses import JSONResponse, StreamingResponse
 
-from src.lib.utils import cache_key, sse
+from src.lib.latency import latency_recorder
+from src.lib.utils import cache_key, sse, SSETextEncoder, SSE_PING
 
 from src.apps.material_owner.domain._in import MaterialFile
 
@@ -22,6 +27,7 @@ from ....domain._in import (
     PublicFinalizeAttemptCmd,
     PublicAskExplainerCmd,
     PublicAddMaterialCmd,
+    PublicSubscribeProgressCmd,
 )
 
 from ....domain.constants import ARQ_QUEUE_NAME
@@ -30,9 +36,15 @@ from .deps import (
     EdgeAPIAppDeps,
     UserTokenDeps,
     ArqPoolDeps,
+    JobCoalescerDeps,
 )
 from .schemas import StartQuizDto, PatchQuizDto, FinalizeQuizDto
 
+logger = logging.getLogger(__name__)
+
+# Time from request to the first streamed explainer token
+explainer_ttft = latency_recorder("explainer_ttft")
+
 
 edge_api_router = APIRouter(prefix="", tags=["Edge Logic"], dependencies=[])
 
@@ -75,21 +87,29 @@ async def generate_quiz_items(
     quiz_id: str,
     arq_pool: ArqPoolDeps,
     token: UserTokenDeps,
+    job_coalescer: JobCoalescerDeps,
 ):
+    coalesce_key = f"generate:{quiz_id}:{dto.mode}"
     cmd = PublicGenerateQuizItemsCmd(
         token=token,
         quiz_id=quiz_id,
         cache_key=cache_key(dto.attempt_id),
         mode=dto.mode,
+        coalesce_key=coalesce_key,
     )
-    # Distributed lock inside QuizGeneratorImpl ensures sequential execution
-    await arq_pool.enqueue_job(
+    # PATCHes that arrive before the job starts share its id: ARQ keeps one
+    # queued job, which generates the combined count. Distributed lock inside
+    # QuizGeneratorImpl still orders it after a running one.
+    job = await arq_pool.enqueue_job(
         JobName.generate_quiz_items,
         asdict(cmd),
         _queue_name=ARQ_QUEUE_NAME,
+        _job_id=await job_coalescer.request(coalesce_key),
     )
 
-    return JSONResponse(content={"scheduled": True, "quiz_id": quiz_id})
+    return JSONResponse(
+        content={"scheduled": True, "quiz_id": quiz_id, "coalesced": job is None}
+    )
 
 
 @edge_api_router.put(
@@ -154,7 +174,11 @@ async def ask_explainer(
     query: str = Query(alias="q"),
     item_id: str = Query(alias="item"),
 ):
+    started = time.perf_counter()
+
     async def event_generator():
+        first = True
+        encoder = SSETextEncoder()
         async for run in edge_api_app.ask_explainer(
             PublicAskExplainerCmd(
                 quiz_id=quiz_id,
@@ -165,7 +189,37 @@ async def ask_explainer(
                 token=token,
             ),
         ):
-            yield sse(run.status, asdict(run))
+            if first:
+                first = False
+                ttft = explainer_ttft.since(started)
+                logger.info(f"Explainer TTFT: {ttft * 1000:.0f} ms ({attempt_id})")
+            yield encoder.encode(
+                run.status, run.text, msg_id=run.msg_id, i=run.i, status=run.status
+            )
+
+    return StreamingResponse(event_generator(), media_type="text/event-stream")
+
+
+# Progress
+@edge_api_router.get("/progress/sse")
+async def progress(
+    token: UserTokenDeps,
+    edge_api_app: EdgeAPIAppDeps,
+    last_event_id: str | None = Header(None, alias="Last-Event-ID"),
+):
+    """
+    One stream per client for everything the worker does for the user:
+    item-ready, material-progress and quiz-finalized events.
+    """
+
+    async def event_generator():
+        async for event in edge_api_app.subscribe_progress(
+            PublicSubscribeProgressCmd(token=token, last_event_id=last_event_id)
+        ):
+            if event is None:
+                yield SSE_PING
+            else:
+                yield sse(event.kind, event.data, id=event.id)
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
 
@@ -6,7 +6,7 @@ from posthog import Posthog
 from src.lib.stripe import stripe_client
 from src.lib.settings import settings
 
-from .deps import AdminPBDeps, UserTokenDeps
+from .deps import AdminPBDeps, UserPBHttpDeps, UserTokenDeps
 from .schemas import CreateStripeCheckoutDto, CreateBillingPortalSessionDto
 from .stripe_legacy import stripe_subscription_to_pb, verify, PRICES_MAP
 
@@ -128,8 +128,9 @@ async def stripe_webhook(request: Request, admin_pb: AdminPBDeps):
 async def create_stripe_checkout(
     dto: CreateStripeCheckoutDto,
     token: UserTokenDeps,
+    user_pb_http: UserPBHttpDeps,
 ):
-    user, subscription = await verify(token)
+    user, subscription = await verify(token, user_pb_http)
 
     sub_status = subscription.get("status")
     cpe = subscription.get("currentPeriodEnd")
@@ -193,8 +194,9 @@ async def create_stripe_checkout(
 async def create_billing_portal_session(
     token: UserTokenDeps,
     dto: CreateBillingPortalSessionDto,
+    user_pb_http: UserPBHttpDeps,
 ):
-    _, subscription = await verify(token)
+    _, subscription = await verify(token, user_pb_http)
     customer = subscription.get("stripeCustomer")
     if not customer:
         raise HTTPException(400, "No Stripe customer for this user")
@@ -1,11 +1,12 @@
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from fastapi import HTTPException
+import httpx
 from pocketbase import PocketBase
 from pocketbase.models.dtos import Record
 import logging
 
-from src.lib.settings import settings
+from src.lib.http_pool import PooledPocketBase
 from src.lib.stripe import stripe_client
 
 logger = logging.getLogger(__name__)
@@ -123,9 +124,9 @@ async def stripe_subscription_to_pb(
     return existing.get("id", "")
 
 
-async def verify(token: str):
+async def verify(token: str, http: httpx.AsyncClient):
 
-    pb = PocketBase(settings.pb_url)
+    pb = PooledPocketBase(http)
     pb._inners.auth.set_user({"token": token, "record": {}})
 
     try:
@@ -1,3 +1,5 @@
+import math
+
 from src.apps.quiz_owner.domain._in import (
     QuizApp,
     GenerateCmd,
@@ -18,11 +20,14 @@ from src.apps.material_owner.domain._in import (
 from src.apps.user_owner.domain._in import AuthUserApp
 from src.apps.user_owner.domain.models import Tariff
 from src.apps.quiz_owner.domain.constants import PATCH_LIMIT
+from src.lib.progress_bus import ProgressHub
+from src.lib.settings import settings
 
 from ..domain.errors import NotEnoughQuizItemsError
 
 from ..domain._in import (
     EdgeAPIApp,
+    BaseCmd,
     PublicRemoveMaterialCmd,
     PublicStartQuizCmd,
     PublicGenerateQuizItemsCmd,
@@ -30,9 +35,17 @@ from ..domain._in import (
     PublicFinalizeAttemptCmd,
     PublicAskExplainerCmd,
     PublicAddMaterialCmd,
+    PublicSubscribeProgressCmd,
 )
 
 
+def _idempotency(
+    op: str, cmd: BaseCmd | PublicAddMaterialCmd | PublicRemoveMaterialCmd
+) -> str | None:
+    """One charge per (operation, job) even if ARQ retries the job."""
+    return f"{op}:{cmd.idempotency_key}" if cmd.idempotency_key else None
+
+
 class EdgeAPIAppImpl(EdgeAPIApp):
     def __init__(
         self,
@@ -40,11 +53,13 @@ class EdgeAPIAppImpl(EdgeAPIApp):
         quiz_app: QuizApp,
         quiz_attempter: QuizAttempterApp,
         material: MaterialApp,
+        progress_hub: ProgressHub | None = None,
     ):
         self.user_auth = user_auth
         self.quiz_app = quiz_app
         self.quiz_attempter = quiz_attempter
         self.material = material
+        self.progress_hub = progress_hub
 
     async def start_quiz(self, cmd: PublicStartQuizCmd) -> None:
         user = await self.user_auth.validate(cmd.token)
@@ -63,27 +78,41 @@ class EdgeAPIAppImpl(EdgeAPIApp):
             )
         )
 
-        await self.user_auth.charge(user.id, cost)
+        await self.user_auth.charge(
+            user.id, cost, idempotency_key=_idempotency("start_quiz", cmd)
+        )
 
     async def generate_quiz_items(self, cmd: PublicGenerateQuizItemsCmd) -> None:
         user = await self.user_auth.validate(cmd.token)
-        cost = PATCH_LIMIT if cmd.mode != GenMode.Regenerate else 0
+        # Coalesced Continue clicks: as many patches as the user can pay for;
+        # repeated Regenerate clicks are one regeneration
+        patches = 1
+        if cmd.mode == GenMode.Continue and cmd.patches > 1:
+            patches = max(1, min(cmd.patches, (user.remaining - 1) // PATCH_LIMIT))
+        cost = PATCH_LIMIT * patches if cmd.mode != GenMode.Regenerate else 0
         if user.remaining <= cost:
             raise NotEnoughQuizItemsError(
                 quiz_id=cmd.quiz_id, user_id=user.id, cost=cost, stored=user.remaining
             )
 
-        await self.quiz_app.generate(
+        reserved = await self.quiz_app.generate(
             GenerateCmd(
                 user=user,
                 quiz_id=cmd.quiz_id,
                 mode=cmd.mode,
                 cache_key=cmd.cache_key,
+                patches=patches,
             )
         )
 
+        # Billed per patch actually generated: the quiz may have fewer blank
+        # items left than the coalesced clicks asked for
+        if cost > 0:
+            cost = min(cost, PATCH_LIMIT * math.ceil(reserved / PATCH_LIMIT))
         if cost > 0:
-            await self.user_auth.charge(user.id, cost)
+            await self.user_auth.charge(
+                user.id, cost, idempotency_key=_idempotency("generate", cmd)
+            )
 
     async def finalize_quiz(self, cmd: PublicFinalizeQuizCmd) -> None:
         user = await self.user_auth.validate(cmd.token)
@@ -130,7 +159,9 @@ class EdgeAPIAppImpl(EdgeAPIApp):
             )
         )
 
-        await self.user_auth.update_storage(user.id, file_size)
+        await self.user_auth.update_storage(
+            user.id, file_size, idempotency_key=_idempotency("add_material", cmd)
+        )
 
         return material
 
@@ -149,7 +180,11 @@ class EdgeAPIAppImpl(EdgeAPIApp):
         )
 
         if size_to_free > 0:
-            await self.user_auth.update_storage(user.id, -size_to_free)
+            await self.user_auth.update_storage(
+                user.id,
+                -size_to_free,
+                idempotency_key=_idempotency("remove_material", cmd),
+            )
 
     async def ask_explainer(self, cmd: PublicAskExplainerCmd):
         user = await self.user_auth.validate(cmd.token)
@@ -171,3 +206,15 @@ class EdgeAPIAppImpl(EdgeAPIApp):
             if result.status == "done":
                 await self.user_auth.charge(user.id, cost)
             yield result
+
+    async def subscribe_progress(self, cmd: PublicSubscribeProgressCmd):
+        user = await self.user_auth.validate(cmd.token)
+        if self.progress_hub is None:
+            return
+
+        async for event in self.progress_hub.subscribe(
+            user.id,
+            last_event_id=cmd.last_event_id,
+            heartbeat=settings.progress_sse_heartbeat,
+        ):
+            yield event
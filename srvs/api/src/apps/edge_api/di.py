@@ -5,6 +5,7 @@ from src.apps.user_owner.domain._in import AuthUserApp
 from src.apps.quiz_owner.domain._in import QuizApp
 from src.apps.quiz_attempter.domain._in import QuizAttempterApp
 from src.apps.material_owner.domain._in import MaterialApp
+from src.lib.progress_bus import ProgressHub
 
 from .app.usecases import EdgeAPIAppImpl
 
@@ -14,10 +15,12 @@ def init_edge_api_app(
     quiz_app: QuizApp,
     quiz_attempter_app: QuizAttempterApp,
     material_app: MaterialApp,
+    progress_hub: ProgressHub | None = None,
 ):
     return EdgeAPIAppImpl(
         user_auth=auth_user_app,
         quiz_app=quiz_app,
         quiz_attempter=quiz_attempter_app,
         material=material_app,
+        progress_hub=progress_hub,
     )
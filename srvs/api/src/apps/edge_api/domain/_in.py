@@ -1,10 +1,11 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import StrEnum
 from typing import AsyncIterable, Protocol
 
 from src.apps.quiz_owner.domain._in import GenMode
 from src.apps.material_owner.domain._in import MaterialFile, Material
 from src.apps.quiz_attempter.domain._in import AskExplainerResult
+from src.lib.progress_bus import ProgressEvent
 
 
 class JobName(StrEnum):
@@ -21,6 +22,8 @@ class BaseCmd:
     quiz_id: str
     token: str
     cache_key: str
+    # ARQ job id: stays the same across retries, so usage is charged once
+    idempotency_key: str = field(default="", kw_only=True)
 
 
 @dataclass(frozen=True, slots=True)
@@ -30,6 +33,9 @@ class PublicStartQuizCmd(BaseCmd): ...
 @dataclass(frozen=True, slots=True)
 class PublicGenerateQuizItemsCmd(BaseCmd):
     mode: GenMode
+    # PATCHes merged into this job (see src/lib/job_coalescer.py)
+    patches: int = 1
+    coalesce_key: str = ""
 
 
 @dataclass(frozen=True, slots=True)
@@ -57,6 +63,7 @@ class PublicAddMaterialCmd:
     title: str
     material_id: str
     hash: str = ""
+    idempotency_key: str = ""
 
 
 @dataclass(frozen=True, slots=True)
@@ -64,6 +71,14 @@ class PublicRemoveMaterialCmd:
     token: str
     cache_key: str
     material_id: str
+    idempotency_key: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class PublicSubscribeProgressCmd:
+    token: str
+    # SSE Last-Event-ID of a reconnecting client
+    last_event_id: str | None = None
 
 
 class EdgeAPIApp(Protocol):
@@ -78,3 +93,7 @@ class EdgeAPIApp(Protocol):
     def ask_explainer(
         self, cmd: PublicAskExplainerCmd
     ) -> AsyncIterable[AskExplainerResult]: ...
+
+    def subscribe_progress(
+        self, cmd: PublicSubscribeProgressCmd
+    ) -> AsyncIterable[ProgressEvent | None]: ...
@@ -0,0 +1,68 @@
+from src.apps.edge_api.app.usecases import EdgeAPIAppImpl
+from src.apps.edge_api.domain._in import PublicGenerateQuizItemsCmd
+from src.apps.quiz_owner.domain._in import GenMode
+from src.apps.quiz_owner.domain.constants import PATCH_LIMIT
+from src.apps.user_owner.domain._in import Principal
+from src.apps.user_owner.domain.models import Tariff
+
+USER = Principal(
+    id="u1",
+    remaining=100,
+    used=0,
+    limit=100,
+    storage_usage=0,
+    storage_limit=0,
+    tariff=Tariff.PLUS,
+)
+
+
+class FakeAuth:
+    def __init__(self):
+        self.charges: list[int] = []
+
+    async def validate(self, token: str) -> Principal:
+        return USER
+
+    async def charge(self, user_id, cost, idempotency_key=None) -> None:
+        self.charges.append(cost)
+
+
+class FakeQuizApp:
+    def __init__(self, blank: int):
+        self.blank = blank
+        self.cmds = []
+
+    async def generate(self, cmd) -> int:
+        self.cmds.append(cmd)
+        reserved = min(self.blank, PATCH_LIMIT * cmd.patches)
+        self.blank -= reserved
+        return reserved
+
+
+def edge(quiz_app: FakeQuizApp, auth: FakeAuth) -> EdgeAPIAppImpl:
+    return EdgeAPIAppImpl(
+        user_auth=auth, quiz_app=quiz_app, quiz_attempter=None, material=None
+    )
+
+
+def continue_cmd(patches: int) -> PublicGenerateQuizItemsCmd:
+    return PublicGenerateQuizItemsCmd(
+        quiz_id="q1", token="t", cache_key="k", mode=GenMode.Continue, patches=patches
+    )
+
+
+async def test_coalesced_clicks_pay_for_reserved_items_only():
+    auth, quiz_app = FakeAuth(), FakeQuizApp(blank=3 * PATCH_LIMIT)
+
+    await edge(quiz_app, auth).generate_quiz_items(continue_cmd(20))
+
+    assert quiz_app.cmds[0].patches == 20
+    assert auth.charges == [3 * PATCH_LIMIT]
+
+
+async def test_nothing_left_to_generate_is_free():
+    auth, quiz_app = FakeAuth(), FakeQuizApp(blank=0)
+
+    await edge(quiz_app, auth).generate_quiz_items(continue_cmd(5))
+
+    assert auth.charges == []
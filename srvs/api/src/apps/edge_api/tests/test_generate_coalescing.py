@@ -0,0 +1,119 @@
+import asyncio
+import json
+
+import fakeredis
+import pytest
+
+from src.apps.edge_api.adapters.in_.events import subscribers
+from src.apps.edge_api.adapters.in_.events.subscribers import generate_quiz_items_job
+from src.apps.edge_api.adapters.in_.http.public_router import generate_quiz_items
+from src.apps.edge_api.adapters.in_.http.schemas import PatchQuizDto
+from src.lib.job_coalescer import RedisJobCoalescer
+
+
+class FakeArqPool:
+    """ARQ enqueue semantics: a job id is refused while queued or running."""
+
+    def __init__(self):
+        self.queued: dict[str, dict] = {}
+        self.running: set[str] = set()
+
+    async def enqueue_job(self, name, payload, _queue_name=None, _job_id=None):
+        await asyncio.sleep(0)
+        if _job_id in self.queued or _job_id in self.running:
+            return None
+        self.queued[_job_id] = payload
+        return _job_id
+
+
+class FakeEdge:
+    def __init__(self):
+        self.cmds = []
+        self.lock = asyncio.Lock()  # QuizGeneratorImpl's distributed lock
+
+    async def generate_quiz_items(self, cmd):
+        async with self.lock:
+            await asyncio.sleep(0.02)
+            self.cmds.append(cmd)
+
+
+class Worker:
+    def __init__(self, pool: FakeArqPool, coalescer: RedisJobCoalescer):
+        self.pool = pool
+        self.edge = FakeEdge()
+        self.coalescer = coalescer
+        self.slots_used = 0
+        self.tasks: list[asyncio.Task] = []
+
+    def poll(self) -> None:
+        for job_id, payload in list(self.pool.queued.items()):
+            del self.pool.queued[job_id]
+            self.pool.running.add(job_id)
+            self.slots_used += 1
+            self.tasks.append(asyncio.create_task(self._run(job_id, payload)))
+
+    async def _run(self, job_id: str, payload: dict) -> None:
+        ctx = {"edge": self.edge, "job_coalescer": self.coalescer, "job_id": job_id}
+        try:
+            await generate_quiz_items_job.coroutine(ctx, payload)
+        finally:
+            self.pool.running.discard(job_id)
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    async def no_admin(ctx):
+        return None
+
+    monkeypatch.setattr(subscribers, "ensure_admin_pb", no_admin)
+    return Worker(FakeArqPool(), RedisJobCoalescer(fakeredis.FakeAsyncRedis()))
+
+
+async def patch(worker: Worker, n: int) -> list[dict]:
+    responses = await asyncio.gather(
+        *(
+            generate_quiz_items(
+                dto=PatchQuizDto(attempt_id="a1"),
+                quiz_id="q1",
+                arq_pool=worker.pool,
+                token="t",
+                job_coalescer=worker.coalescer,
+            )
+            for _ in range(n)
+        )
+    )
+    return [json.loads(r.body) for r in responses]
+
+
+async def test_twenty_concurrent_patches_take_one_worker_slot(worker):
+    responses = await patch(worker, 20)
+
+    worker.poll()
+    await asyncio.gather(*worker.tasks)
+
+    assert sum(not r["coalesced"] for r in responses) == 1
+    assert worker.slots_used == 1
+    assert [cmd.patches for cmd in worker.edge.cmds] == [20]
+
+
+async def test_patches_during_a_run_get_one_follow_up_job(worker):
+    await patch(worker, 10)
+    worker.poll()
+    await asyncio.sleep(0.005)  # the first job has claimed its 10
+
+    await patch(worker, 10)
+    worker.poll()
+    await asyncio.gather(*worker.tasks)
+
+    assert worker.slots_used == 2
+    assert [cmd.patches for cmd in worker.edge.cmds] == [10, 10]
+
+
+async def test_retried_job_keeps_its_claim(worker):
+    await patch(worker, 3)
+    (job_id,) = worker.pool.queued
+    payload = worker.pool.queued[job_id]
+
+    assert await worker.coalescer.claim(payload["coalesce_key"], job_id) == 3
+    await patch(worker, 1)  # belongs to the next job
+    assert await worker.coalescer.claim(payload["coalesce_key"], job_id) == 3
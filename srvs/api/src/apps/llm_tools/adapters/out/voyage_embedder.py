@@ -1,5 +1,4 @@
 import numpy as np
-from bertopic.backend import BaseEmbedder
 from voyageai.client import Client
 from voyageai.client_async import AsyncClient
 
@@ -10,18 +9,16 @@ from ...domain.out import Vectorizer
 BATCH_SIZE = 128
 
 
-class VoyageEmbedder(Vectorizer, BaseEmbedder):
-    """Voyage AI embedder for BERTopic - inherits from BaseEmbedder"""
+class VoyageEmbedder(Vectorizer):
+    """Voyage AI embedder. BERTopic wraps it lazily in its own backend adapter."""
 
     def __init__(self, model: str = "voyage-3.5-lite"):
-        super().__init__()
-
         self._client = Client(api_key=settings.voyageai_api_key)
         self._aclient = AsyncClient(api_key=settings.voyageai_api_key)
         self._model = model
 
     async def vectorize(self, chunks: list[str], verbose: bool = False) -> np.ndarray:
-        """Synchronous embed method required by BaseEmbedder"""
+        """Asynchronous batch embedding of document chunks"""
         if not chunks:
             return np.array([], dtype=np.float32)
 
@@ -40,7 +37,7 @@ class VoyageEmbedder(Vectorizer, BaseEmbedder):
         return embeddings
 
     def embed(self, documents: list[str], verbose: bool = False) -> np.ndarray:
-        """Synchronous embed method required by BaseEmbedder"""
+        """Synchronous embed method (used by the BERTopic backend adapter)"""
         if not documents:
             return np.array([], dtype=np.float32)
 
@@ -10,3 +10,5 @@ from .searchers import (
     MeiliGeneratorVectorSearcher,
 )
 from .llm_tools_adapter import LLMToolsAdapter
+from .coverage_index import init_coverage_index
+from .chunk_vector_store import init_chunk_vector_store
@@ -0,0 +1,96 @@
+"""
+Local copy of the chunk vectors of each material.
+
+Written once when the material is indexed: `<material_id>.npy` holds the
+(n, d) float32 vectors of the chunks with content, `<material_id>.json` the
+owner and the id, idx and pages of each row. Readers map the `.npy` with
+`np.load(mmap_mode="r")`, so a material's vectors are one mmap served from
+the page cache instead of a JSON search. Materials are indexed and clustered
+by the worker, so its local directory is enough; materials missing here
+(indexed by another host, or before the store existed) are read from
+Meilisearch.
+"""
+
+import asyncio
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from src.lib.settings import settings
+
+from ...domain.models import ChunkVectors, MaterialChunk
+from ...domain.out import ChunkVectorStore
+
+
+class NpyChunkVectorStore(ChunkVectorStore):
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    async def write(
+        self, user_id: str, material_id: str, chunks: list[MaterialChunk]
+    ) -> None:
+        await asyncio.to_thread(self._write, user_id, material_id, chunks)
+
+    async def read(
+        self, material_id: str, user_id: str | None = None
+    ) -> ChunkVectors | None:
+        return await asyncio.to_thread(self._read, material_id, user_id)
+
+    async def delete(self, material_ids: list[str]) -> None:
+        for material_id in material_ids:
+            for path in self._paths(material_id):
+                path.unlink(missing_ok=True)
+
+    def _read(self, material_id: str, user_id: str | None) -> ChunkVectors | None:
+        vectors_path, meta_path = self._paths(material_id)
+        try:
+            meta = json.loads(meta_path.read_text())
+            vectors = np.load(vectors_path, mmap_mode="r")
+        except (FileNotFoundError, ValueError):
+            return None
+        # Rewritten between the two reads, or someone else's material
+        if len(meta["ids"]) != len(vectors) or user_id not in (None, meta["user_id"]):
+            return None
+        return ChunkVectors(ids=meta["ids"], vectors=vectors)
+
+    def _write(self, user_id: str, material_id: str, chunks: list[MaterialChunk]) -> None:
+        vectors_path, meta_path = self._paths(material_id)
+        rows = [c for c in chunks if c.vector is not None and c.content.strip()]
+        if not rows:
+            # Nothing to map; readers fall back to Meilisearch
+            vectors_path.unlink(missing_ok=True)
+            meta_path.unlink(missing_ok=True)
+            return
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "user_id": user_id,
+            "ids": [c.id for c in rows],
+            "idx": [c.idx for c in rows],
+            "pages": [c.pages for c in rows],
+        }
+        # Replaced atomically: a reader never maps a half-written file
+        tmp_vectors = vectors_path.with_name(f"{vectors_path.name}.tmp")
+        tmp_meta = meta_path.with_name(f"{meta_path.name}.tmp")
+        with open(tmp_vectors, "wb") as f:
+            np.save(f, np.asarray([c.vector for c in rows], dtype=np.float32))
+        tmp_meta.write_text(json.dumps(meta))
+        os.replace(tmp_vectors, vectors_path)
+        os.replace(tmp_meta, meta_path)
+
+    def _paths(self, material_id: str) -> tuple[Path, Path]:
+        # Material ids are PocketBase ids; anything else must not become a path
+        if not material_id.isalnum():
+            raise ValueError(f"Invalid material id: {material_id!r}")
+        return (
+            self.root / f"{material_id}.npy",
+            self.root / f"{material_id}.json",
+        )
+
+
+def init_chunk_vector_store() -> ChunkVectorStore | None:
+    if not settings.vector_store_dir:
+        return None
+    return NpyChunkVectorStore(settings.vector_store_dir)
@@ -0,0 +1,38 @@
+import redis.asyncio as redis
+
+from src.lib.settings import settings
+
+from ...domain.out import CoverageIndex
+
+COVERAGE_KEY = "quizbee:coverage:{user_id}"
+
+
+class RedisCoverageIndex(CoverageIndex):
+    """
+    One hash per user: chunk id -> times used. Chunks belong to the user's
+    own materials, so this also covers every quiz built from them.
+    """
+
+    def __init__(self, redis_client: redis.Redis, ttl: int):
+        self.redis = redis_client
+        self.ttl = ttl
+
+    async def record(self, user_id: str, chunk_ids: list[str]) -> None:
+        if not chunk_ids:
+            return
+        key = COVERAGE_KEY.format(user_id=user_id)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for chunk_id in chunk_ids:
+                pipe.hincrby(key, chunk_id, 1)
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
+
+    async def counts(self, user_id: str, chunk_ids: list[str]) -> dict[str, int]:
+        if not chunk_ids:
+            return {}
+        values = await self.redis.hmget(COVERAGE_KEY.format(user_id=user_id), chunk_ids)
+        return {i: int(v) for i, v in zip(chunk_ids, values) if v is not None}
+
+
+def init_coverage_index(redis_client: redis.Redis) -> CoverageIndex:
+    return RedisCoverageIndex(redis_client, ttl=settings.coverage_ttl)
@@ -0,0 +1,141 @@
+"""
+Coalescing writer for the `used` flag of material chunks.
+
+Generation marks the chunks of every question as used. Instead of one
+`update_documents` task per question (and a 500 ms task poll before the
+question can finish), marks are buffered and written as a single task per
+`interval` or as soon as `max_batch` ids are waiting. Nothing waits for the
+task: it is tracked in the background, ids stay pending until Meilisearch
+reports it, and readers treat pending ids as used.
+
+Pending marks are per process; the ARQ worker that generates a quiz is
+also the one that searches its chunks.
+"""
+
+import asyncio
+import logging
+
+from meilisearch_python_sdk.index import AsyncIndex
+from meilisearch_python_sdk.models.task import TaskResult
+
+from src.lib.meili_tasks import MeiliTaskTracker
+
+logger = logging.getLogger(__name__)
+
+
+class MeiliChunkUsageWriter:
+    def __init__(
+        self,
+        tasks: MeiliTaskTracker,
+        index: AsyncIndex,
+        interval: float = 0.25,
+        max_batch: int = 500,
+        task_timeout: float = 30.0,
+    ):
+        self.tasks = tasks
+        self.index = index
+        self.interval = interval
+        self.max_batch = max_batch
+        self.task_timeout = task_timeout
+        # Not yet sent
+        self._buffer: set[str] = set()
+        # Sent, not yet confirmed: id -> number of tasks carrying it
+        self._inflight: dict[str, int] = {}
+        # Requeued once after a failed task; dropped if it fails again
+        self._retried: set[str] = set()
+        # Meilisearch task uid -> ids it carries
+        self._sent: dict[int, list[str]] = {}
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def mark(self, chunk_ids: list[str]) -> None:
+        """Queue the ids; returns immediately."""
+        self._buffer.update(chunk_ids)
+        if len(self._buffer) >= self.max_batch:
+            self._wake.set()
+        if self._buffer and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run(), name="chunk-usage-writer")
+
+    def is_pending(self, chunk_id: str) -> bool:
+        return chunk_id in self._buffer or chunk_id in self._inflight
+
+    def pending_ids(self) -> set[str]:
+        """Ids readers must treat as used: buffered or not yet confirmed."""
+        return self._buffer | self._inflight.keys()
+
+    async def flush(self) -> None:
+        """Send the buffer and wait until every sent task is confirmed."""
+        while True:
+            await self._send()
+            # A failed task puts its marks back into the buffer
+            if not self._sent and not self._buffer:
+                return
+            await asyncio.gather(
+                *(self.tasks.wait(uid, self.task_timeout) for uid in list(self._sent)),
+                return_exceptions=True,
+            )
+            await asyncio.sleep(0)  # let the tracker callbacks settle
+
+    async def aclose(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while self._buffer:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except TimeoutError:
+                pass
+            await self._send()
+
+    async def _send(self) -> None:
+        self._wake.clear()
+        if not self._buffer:
+            return
+        chunk_ids, self._buffer = list(self._buffer), set()
+        for chunk_id in chunk_ids:
+            self._inflight[chunk_id] = self._inflight.get(chunk_id, 0) + 1
+        try:
+            task = await self.index.update_documents(
+                [{"id": chunk_id, "used": True} for chunk_id in chunk_ids],
+                primary_key="id",
+            )
+        except Exception as e:
+            logger.error(f"Failed to send {len(chunk_ids)} chunk marks: {e}")
+            self._settle(chunk_ids, succeeded=False)
+            return
+        self._sent[task.task_uid] = chunk_ids
+        self.tasks.track(
+            task.task_uid,
+            on_done=lambda result, uid=task.task_uid: self._confirmed(uid, result),
+            timeout=self.task_timeout,
+        )
+
+    def _confirmed(self, task_uid: int, task: TaskResult | None) -> None:
+        chunk_ids = self._sent.pop(task_uid, [])
+        if task is None:
+            # Still enqueued in Meilisearch; most likely it lands later
+            self._settle(chunk_ids, succeeded=True)
+            return
+        if task.status == "succeeded":
+            logger.info(f"Marked {len(chunk_ids)} chunks as used")
+        self._settle(chunk_ids, succeeded=task.status == "succeeded")
+
+    def _settle(self, chunk_ids: list[str], succeeded: bool) -> None:
+        for chunk_id in chunk_ids:
+            count = self._inflight.pop(chunk_id, 1) - 1
+            if count > 0:
+                self._inflight[chunk_id] = count
+        if succeeded:
+            self._retried.difference_update(chunk_ids)
+            return
+        retry = [i for i in chunk_ids if i not in self._retried]
+        self._retried.difference_update(chunk_ids)
+        self._retried.update(retry)
+        self.mark(retry)
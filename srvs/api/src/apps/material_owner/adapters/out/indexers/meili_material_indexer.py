@@ -1,25 +1,37 @@
 from dataclasses import dataclass, field
 import logging
 import asyncio
-from typing import Any
+from typing import Any, AsyncIterator
+
+import numpy as np
 from voyageai.client_async import AsyncClient as VoyageAsyncClient
 from langfuse import Langfuse
 from meilisearch_python_sdk import AsyncClient
+from meilisearch_python_sdk.index import AsyncIndex
 from meilisearch_python_sdk.models.search import Hybrid
 from meilisearch_python_sdk.models.settings import Embedders, UserProvidedEmbedder
 from meilisearch_python_sdk.models.settings import Pagination
-
+import redis.asyncio as redis
 
 from src.lib.config import LLMS
+from src.lib.index_settings import apply_index_settings
+from src.lib.meili_tasks import MeiliTaskTracker
 from src.lib.settings import settings
+from src.lib.utils import replace_markers
 
-from ....domain.models import Material, MaterialChunk, MaterialKind
+from ....domain.models import ChunkVectors, Material, MaterialChunk, MaterialKind
 from ....domain.constants import MAX_TEXT_INDEX_TOKENS
-from ....domain.out import MaterialIndexer, LLMTools
+from ....domain.out import ChunkVectorStore, MaterialIndexer, LLMTools
 from ....domain.errors import TooManyTextTokensError
 
+from .chunk_usage_writer import MeiliChunkUsageWriter
+
 EMBEDDER_NAME = "materialChunk"  # здесь я поменял с materialChunks потому что иначе у меня требовало размерность прошлого эмбедера
 EMBEDDER_TEMPLATE = "Chunk {{doc.title}}: {{doc.content}}"
+FILTERABLE_ATTRIBUTES = ["userId", "materialId", "idx", "used", "pages"]
+MAX_TOTAL_HITS = 5000
+# Documents per request when reading every chunk of materials
+DOCUMENTS_PAGE_SIZE = 1000
 
 meiliVoyageEmbeddings = {
     EMBEDDER_NAME: UserProvidedEmbedder(
@@ -89,30 +101,135 @@ class Doc:
         return doc_dict
 
 
+def chunks_filter(user_id: str, material_ids: list[str]) -> str:
+    f = f"userId = {user_id}"
+    if material_ids:
+        f += f" AND materialId IN [{','.join(material_ids)}]"
+    return f
+
+
+async def iter_documents(
+    index: AsyncIndex,
+    filter: str,
+    fields: list[str],
+    retrieve_vectors: bool = False,
+    page_size: int = DOCUMENTS_PAGE_SIZE,
+) -> AsyncIterator[tuple[int, list[dict]]]:
+    """
+    Every document matching `filter` as (total, page). The documents route
+    is not capped by maxTotalHits like search, and only one page is held.
+    """
+    offset = 0
+    while True:
+        page = await index.get_documents(
+            filter=filter,
+            fields=fields + ["_vectors"] if retrieve_vectors else fields,
+            retrieve_vectors=retrieve_vectors,
+            offset=offset,
+            limit=page_size,
+        )
+        if not page.results:
+            return
+        yield page.total, page.results
+        offset += len(page.results)
+        if offset >= page.total:
+            return
+
+
+async def fetch_chunk_vectors(
+    index: AsyncIndex,
+    user_id: str,
+    material_ids: list[str],
+    page_size: int = DOCUMENTS_PAGE_SIZE,
+) -> ChunkVectors:
+    """
+    Vectors of the chunks with content, written page by page into one
+    preallocated float32 matrix instead of Doc/MaterialChunk float lists.
+    """
+    ids: list[str] = []
+    matrix: np.ndarray | None = None
+    async for total, page in iter_documents(
+        index,
+        chunks_filter(user_id, material_ids),
+        ["id", "content"],
+        retrieve_vectors=True,
+        page_size=page_size,
+    ):
+        rows = []
+        for doc in page:
+            vectors = (doc.get("_vectors") or {}).get(EMBEDDER_NAME, {}).get("embeddings")
+            if vectors and (doc.get("content") or "").strip():
+                ids.append(doc.get("id", ""))
+                rows.append(vectors[0])
+        if not rows:
+            continue
+        start = len(ids) - len(rows)
+        if matrix is None:
+            matrix = np.empty((total, len(rows[0])), dtype=np.float32)
+        elif len(ids) > len(matrix):
+            # Chunks indexed while paging
+            grown = np.empty((max(total, len(ids)), matrix.shape[1]), dtype=np.float32)
+            grown[:start] = matrix[:start]
+            matrix = grown
+        matrix[start : len(ids)] = rows
+
+    if matrix is None:
+        return ChunkVectors(ids=[], vectors=np.empty((0, 0), dtype=np.float32))
+    return ChunkVectors(ids=ids, vectors=matrix[: len(ids)])
+
+
 class MeiliMaterialIndexer(MaterialIndexer):
-    def __init__(self, lf: Langfuse, llm_tools: LLMTools, meili: AsyncClient):
+    def __init__(
+        self,
+        lf: Langfuse,
+        llm_tools: LLMTools,
+        meili: AsyncClient,
+        tasks: MeiliTaskTracker | None = None,
+        vector_store: ChunkVectorStore | None = None,
+    ):
         self._lf = lf
         self.llm_tools = llm_tools
         self.meili = meili
+        self.tasks = tasks or MeiliTaskTracker(meili)
+        self.vector_store = vector_store
         self.material_index = meili.index(EMBEDDER_NAME)
         self.voyage_client = VoyageAsyncClient(api_key=settings.voyageai_api_key)
+        self.usage_writer = MeiliChunkUsageWriter(self.tasks, self.material_index)
 
     @classmethod
     async def ainit(
-        cls, lf: Langfuse, llm_tools: LLMTools, meili: AsyncClient
+        cls,
+        lf: Langfuse,
+        llm_tools: LLMTools,
+        meili: AsyncClient,
+        redis_client: redis.Redis | None = None,
+        tasks: MeiliTaskTracker | None = None,
+        vector_store: ChunkVectorStore | None = None,
     ) -> "MeiliMaterialIndexer":
-        instance = cls(lf, llm_tools, meili)
+        instance = cls(lf, llm_tools, meili, tasks, vector_store)
 
-        await instance.material_index.update_embedders(
-            Embedders(
-                embedders=meiliVoyageEmbeddings  # pyright: ignore[reportArgumentType]
+        async def apply() -> None:
+            await instance.material_index.update_embedders(
+                Embedders(
+                    embedders=meiliVoyageEmbeddings  # pyright: ignore[reportArgumentType]
+                )
             )
-        )
-        await instance.material_index.update_filterable_attributes(
-            ["userId", "materialId", "idx", "used", "pages"]
-        )
-        await instance.material_index.update_pagination(
-            settings=Pagination(max_total_hits=5000)
+            await instance.material_index.update_filterable_attributes(
+                FILTERABLE_ATTRIBUTES  # pyright: ignore[reportArgumentType]
+            )
+            await instance.material_index.update_pagination(
+                settings=Pagination(max_total_hits=MAX_TOTAL_HITS)
+            )
+
+        await apply_index_settings(
+            redis_client,
+            EMBEDDER_NAME,
+            {
+                "embedders": meiliVoyageEmbeddings,
+                "filterableAttributes": FILTERABLE_ATTRIBUTES,
+                "pagination": {"maxTotalHits": MAX_TOTAL_HITS},
+            },
+            apply,
         )
         return instance
 
@@ -197,11 +314,7 @@ class MeiliMaterialIndexer(MaterialIndexer):
 
         logging.info(f"Created task for {len(docs)} documents")
 
-        task = await self.meili.wait_for_task(
-            task.task_uid,
-            timeout_in_ms=int(120 * 1000),
-            interval_in_ms=int(1 * 1000),
-        )
+        task = await self.tasks.wait(task.task_uid, timeout=120)
 
         if task.status == "failed":
             logging.error(f"Failed to index material batch: {task}")
@@ -211,6 +324,7 @@ class MeiliMaterialIndexer(MaterialIndexer):
                 indexed = self._fill_template(doc)
                 total_tokens += self.llm_tools.count_text(indexed, LLMS.VOYAGE_3_5_LITE)
                 logging.info(f"Indexed chunk {doc.id}: (tokens: {total_tokens})")
+            await self._store_vectors(material, docs, all_embeddings)
         else:
             logging.error(f"Unknown task status: {task}")
 
@@ -224,14 +338,12 @@ class MeiliMaterialIndexer(MaterialIndexer):
         if len(material_ids) == 0:
             return
 
+        if self.vector_store is not None:
+            await self.vector_store.delete(material_ids)
         task = await self.material_index.delete_documents_by_filter(
             f"materialId IN [{','.join(material_ids)}]"
         )
-        task = await self.meili.wait_for_task(
-            task.task_uid,
-            timeout_in_ms=int(30 * 1000),
-            interval_in_ms=int(0.5 * 1000),
-        )
+        task = await self.tasks.wait(task.task_uid, timeout=30)
         if task.status == "failed":
             logging.error(f"Failed to delete material: {task}")
             # raise ValueError(f"Failed to delete material: {task}")
@@ -250,24 +362,12 @@ class MeiliMaterialIndexer(MaterialIndexer):
         if len(chunk_ids) == 0:
             return
 
-        # Обновляем документы, устанавливая used=True
-        docs_to_update = [{"id": chunk_id, "used": True} for chunk_id in chunk_ids]
-
-        task = await self.material_index.update_documents(
-            docs_to_update, primary_key="id"
-        )
-        task = await self.meili.wait_for_task(
-            task.task_uid,
-            timeout_in_ms=int(30 * 1000),
-            interval_in_ms=int(0.5 * 1000),
-        )
+        # Пишется одной задачей вместе с соседними вопросами, не ждём её
+        self.usage_writer.mark(chunk_ids)
 
-        if task.status == "failed":
-            logging.error(f"Failed to mark chunks as used: {task}")
-        elif task.status == "succeeded":
-            logging.info(f"Marked {len(chunk_ids)} chunks as used")
-        else:
-            logging.error(f"Unknown task status: {task}")
+    async def aclose(self) -> None:
+        """Writes the buffered chunk marks (called at shutdown)."""
+        await self.usage_writer.aclose()
 
     async def get_chunks_info(self, chunk_ids: list[str]) -> list[dict[str, Any]]:
         if not chunk_ids:
@@ -299,9 +399,110 @@ class MeiliMaterialIndexer(MaterialIndexer):
         logging.info(f"Got info for {len(chunks_info)}/{len(chunk_ids)} chunks")
         return chunks_info
 
+    async def get_chunks(
+        self, chunk_ids: list[str], with_vectors: bool = False
+    ) -> list[MaterialChunk]:
+        """Chunks by id, in the order of `chunk_ids`; missing ids are skipped."""
+        if not chunk_ids:
+            return []
+
+        # Called from the API, which sees the worker's store only on a shared volume
+        if (
+            with_vectors
+            and self.vector_store is not None
+            and settings.vector_store_shared
+        ):
+            chunks = await self.get_chunks(chunk_ids)
+            if await self._fill_stored_vectors(chunks):
+                return chunks
+
+        fields = ["id", "materialId", "userId", "title", "content", "idx", "used", "pages"]
+        result = await self.material_index.get_documents(
+            ids=chunk_ids,
+            fields=fields + ["_vectors"] if with_vectors else fields,
+            limit=len(chunk_ids),
+            retrieve_vectors=with_vectors,
+        )
+        by_id = {doc.get("id", ""): Doc.from_hit(doc).to_chunk() for doc in result.results}
+        for chunk in by_id.values():
+            chunk.used = chunk.used or self.usage_writer.is_pending(chunk.id)
+        return [by_id[i] for i in chunk_ids if i in by_id]
+
+    async def get_chunk_vectors(
+        self, user_id: str, material_ids: list[str]
+    ) -> ChunkVectors:
+        parts: list[ChunkVectors] = []
+        missing = material_ids
+        if self.vector_store is not None and material_ids:
+            missing = []
+            for material_id in material_ids:
+                stored = await self.vector_store.read(material_id, user_id)
+                if stored is None:
+                    missing.append(material_id)
+                else:
+                    parts.append(stored)
+        if missing or not parts:
+            parts.append(
+                await fetch_chunk_vectors(self.material_index, user_id, missing)
+            )
+        logging.info(
+            f"Fetched chunk vectors of {len(material_ids) - len(missing)} materials "
+            f"from the vector store, {len(missing)} from Meilisearch"
+        )
+
+        parts = [p for p in parts if p.ids] or parts[:1]
+        if len(parts) == 1:
+            # A single stored material stays memory-mapped
+            return parts[0]
+        return ChunkVectors(
+            ids=[i for p in parts for i in p.ids],
+            vectors=np.concatenate([p.vectors for p in parts]),
+        )
+
+    async def _store_vectors(
+        self, material: Material, docs: list[Doc], embeddings: list[list[float]]
+    ) -> None:
+        if self.vector_store is None:
+            return
+        chunks = [
+            MaterialChunk(
+                id=doc.id,
+                idx=doc.idx,
+                material_id=doc.materialId,
+                title=doc.title,
+                content=doc.content,
+                vector=embedding,
+                pages=doc.pages,
+            )
+            for doc, embedding in zip(docs, embeddings)
+        ]
+        try:
+            await self.vector_store.write(material.user_id, material.id, chunks)
+        except Exception as e:
+            # Readers fall back to Meilisearch
+            logging.warning(f"Failed to store vectors of material {material.id}: {e}")
+
+    async def _fill_stored_vectors(self, chunks: list[MaterialChunk]) -> bool:
+        """Set chunk vectors from the store; False if any is not stored."""
+        by_material: dict[str, list[MaterialChunk]] = {}
+        for chunk in chunks:
+            by_material.setdefault(chunk.material_id, []).append(chunk)
+        for material_id, material_chunks in by_material.items():
+            stored = await self.vector_store.read(material_id)
+            if stored is None:
+                return False
+            rows = {chunk_id: row for row, chunk_id in enumerate(stored.ids)}
+            for chunk in material_chunks:
+                row = rows.get(chunk.id)
+                if row is None:
+                    return False
+                chunk.vector = stored.vectors[row].tolist()
+        return True
+
     def _fill_template(self, doc: Doc):
-        return EMBEDDER_TEMPLATE.replace("{{doc.title}}", doc.title).replace(
-            "{{doc.content}}", doc.content
+        return replace_markers(
+            EMBEDDER_TEMPLATE,
+            {"{{doc.title}}": doc.title, "{{doc.content}}": doc.content},
         )
 
     def _log_langfuse(
@@ -1,25 +1,26 @@
 """
-MeiliMaterialQuerySearcher - поиск по запросу пользователя.
+MeiliMaterialAllSearcher - все чанки материалов.
 
-Использует гибридный поиск (semantic + keyword) с настраиваемым ratio.
+Читает документы постранично (documents route), без лимита maxTotalHits
+поиска, поэтому большие книги не обрезаются.
 """
 
 import logging
 from langfuse import Langfuse
 from meilisearch_python_sdk import AsyncClient
-from meilisearch_python_sdk.models.search import Hybrid
-
-from src.lib.config import LLMS
 
 from ....domain.models import MaterialChunk
 from ....domain.out import Searcher, LLMTools, SearchDto
 
-from ..indexers.meili_material_indexer import EMBEDDER_NAME, Doc
+from ..indexers.meili_material_indexer import (
+    EMBEDDER_NAME,
+    Doc,
+    chunks_filter,
+    iter_documents,
+)
 
 logger = logging.getLogger(__name__)
 
-ALL_CHUNKS_LIMIT = 100000
-
 
 class MeiliMaterialAllSearcher(Searcher):
     def __init__(self, lf: Langfuse, llm_tools: LLMTools, meili: AsyncClient):
@@ -32,23 +33,15 @@ class MeiliMaterialAllSearcher(Searcher):
         self,
         dto: SearchDto,
     ) -> list[MaterialChunk]:
-        f = f"userId = {dto.user_id}"
-        if dto.material_ids:
-            f += f" AND materialId IN [{','.join(dto.material_ids)}]"
+        f = chunks_filter(dto.user_id, dto.material_ids)
 
         logger.info(f"Meili All Search... {f}")
 
-        res = await self._material_index.search(
-            query="*",
-            ranking_score_threshold=0,
-            filter=f,
-            limit=ALL_CHUNKS_LIMIT,
-            retrieve_vectors=True,
-            attributes_to_retrieve=["id", "_vectors", 'content'],
-        )
-
-        docs: list[Doc] = [Doc.from_hit(hit) for hit in res.hits]
-        chunks = [doc.to_chunk() for doc in docs]
+        chunks: list[MaterialChunk] = []
+        async for _, page in iter_documents(
+            self._material_index, f, ["id", "content"], retrieve_vectors=True
+        ):
+            chunks.extend(Doc.from_hit(hit).to_chunk() for hit in page)
 
         logging.info(f"Found {len(chunks)} chunks for query search")
         return chunks
@@ -10,12 +10,32 @@ from langfuse import Langfuse
 from meilisearch_python_sdk import AsyncClient
 from meilisearch_python_sdk.models.search import Hybrid
 
+from src.lib.settings import settings
+
 from ....domain.models import MaterialChunk
-from ....domain.out import SearchDto, Searcher, LLMTools
+from ....domain.out import CoverageIndex, SearchDto, Searcher, LLMTools
 
+from ..indexers.chunk_usage_writer import MeiliChunkUsageWriter
 from ..indexers.meili_material_indexer import EMBEDDER_NAME, Doc
 
 
+def rank_by_coverage(
+    hits: list[dict], counts: dict[str, int], penalty: float, limit: int
+) -> list[Doc]:
+    """
+    Best `limit` hits by ranking score minus `penalty` per earlier use.
+
+    Chunks flagged `used` before usage was counted count as used once.
+    """
+
+    def score(hit: dict) -> float:
+        uses = max(counts.get(hit.get("id", ""), 0), int(bool(hit.get("used"))))
+        return hit.get("_rankingScore", 0.0) - penalty * uses
+
+    # sorted() is stable: equal scores keep Meilisearch's order
+    return [Doc.from_hit(hit) for hit in sorted(hits, key=score, reverse=True)[:limit]]
+
+
 class MeiliGeneratorVectorSearcher(Searcher):
     """
     Searcher для поиска материалов по векторам для генератора квизов.
@@ -23,20 +43,34 @@ class MeiliGeneratorVectorSearcher(Searcher):
     Для каждого вектора из списка находит наиболее похожие чанки
     используя косинусное сходство. Используется для генерации
     квизов на основе кластеризации материалов.
+
+    Один запрос на вектор: кандидаты с запасом (limit x coverage_overfetch)
+    ранжируются по сходству минус штраф за каждое прошлое использование,
+    без второго поиска по `used = true`.
     """
 
-    def __init__(self, lf: Langfuse, llm_tools: LLMTools, meili: AsyncClient):
+    def __init__(
+        self,
+        lf: Langfuse,
+        llm_tools: LLMTools,
+        meili: AsyncClient,
+        coverage: CoverageIndex,
+        usage_writer: MeiliChunkUsageWriter | None = None,
+    ):
         self._lf = lf
         self._llm_tools = llm_tools
         self._meili = meili
         self._material_index = meili.index(EMBEDDER_NAME)
+        # Marks not yet in the index still count as used
+        self._usage_writer = usage_writer
+        self._coverage = coverage
 
     async def search(
         self,
         dto: SearchDto,
     ) -> list[MaterialChunk]:
         """
-        Ищет наиболее похожие чанки для векторов с использованием реранкинга.
+        Ищет наиболее похожие чанки для векторов с учётом покрытия.
 
         Args:
             dto: SearchDto с параметрами поиска
@@ -46,7 +80,7 @@ class MeiliGeneratorVectorSearcher(Searcher):
                 - vectors: Список векторов для поиска
 
         Returns:
-            Список найденных чанков после реранкинга
+            Список найденных чанков
         """
         if not dto.vectors or len(dto.vectors) == 0:
             logging.warning("No vectors provided for vector search")
@@ -55,74 +89,41 @@ class MeiliGeneratorVectorSearcher(Searcher):
         all_chunks: list[MaterialChunk] = []
         seen_chunk_ids = set()
 
+        f = f"userId = {dto.user_id}"
+        if dto.material_ids:
+            f += f" AND materialId IN [{','.join(dto.material_ids)}]"
+
         for idx, vector in enumerate(dto.vectors):
-            logging.info('thresholds: %s', dto.vector_thresholds)
             threshold = 0.0
             if dto.vector_thresholds and idx < len(dto.vector_thresholds):
                 threshold = dto.vector_thresholds[idx]
-            
-            f_unused = f"userId = {dto.user_id} AND used = false"
-            if dto.material_ids:
-                f_unused += f" AND materialId IN [{','.join(dto.material_ids)}]"
-
-        
 
             try:
                 res = await self._material_index.search(
                     query="",
                     vector=vector,
-                    hybrid=Hybrid(
-                        semantic_ratio=1.0, embedder=EMBEDDER_NAME
-                    ),
-                    filter=f_unused,
-                    limit=dto.limit,
+                    hybrid=Hybrid(semantic_ratio=1.0, embedder=EMBEDDER_NAME),
+                    filter=f,
+                    limit=dto.limit * settings.coverage_overfetch,
                     ranking_score_threshold=threshold,
                     show_ranking_score=True,
                 )
 
-                docs: list[Doc] = [Doc.from_hit(hit) for hit in res.hits]
-                
-                logging.info(f" threshold: {threshold}, found {len(docs)} unused chunks")
-                if len(docs) < dto.limit:
-                    needed = dto.limit - len(docs)
-                    logging.info(
-                        f"Found only {len(docs)} unused chunks, fetching {needed} used chunks"
-                    )
-                    
-                    f_used = f"userId = {dto.user_id} AND used = true"
-                    if dto.material_ids:
-                        f_used += f" AND materialId IN [{','.join(dto.material_ids)}]"
-                    
-                    res_used = await self._material_index.search(
-                        query="",
-                        vector=vector,
-                        hybrid=Hybrid(
-                            semantic_ratio=1.0, embedder=EMBEDDER_NAME
-                        ),
-                        filter=f_used,
-                        limit=needed,
-                        ranking_score_threshold=threshold,
-                        show_ranking_score=True,
-                    )
-                    
-                    docs_used: list[Doc] = [Doc.from_hit(hit) for hit in res_used.hits]
-                    
-                    for i, hit in enumerate(res_used.hits):
-                        score = hit.get("_rankingScore", "N/A")
-                        doc_id = hit.get("id", "unknown")
-                        logging.info(f"Vector {idx + 1} used hit {i + 1}: id={doc_id}, ranking_score={score}")
-                    
-                    docs.extend(docs_used)
-                    logging.info(
-                        f"Added {len(docs_used)} used chunks, total: {len(docs)}"
-                    )
-
-                for doc in docs[:dto.limit]:
+                hit_ids = [hit.get("id", "") for hit in res.hits]
+                counts = await self._usage_counts(dto.user_id, hit_ids)
+                docs = rank_by_coverage(
+                    res.hits, counts, settings.coverage_usage_penalty, dto.limit
+                )
+                logging.info(
+                    f"Vector {idx + 1}: threshold {threshold}, {len(res.hits)} candidates, "
+                    f"{sum(1 for d in docs if counts.get(d.id))} of {len(docs)} used before"
+                )
+
+                for doc in docs:
                     chunk = doc.to_chunk()
                     if chunk.id not in seen_chunk_ids:
                         seen_chunk_ids.add(chunk.id)
                         all_chunks.append(chunk)
-                        logging.info(f"Vector {idx + 1}: Added chunk {chunk.id}")
 
             except Exception as e:
                 logging.error(f"Error searching for vector {idx + 1}: {e}")
@@ -130,3 +131,15 @@ class MeiliGeneratorVectorSearcher(Searcher):
 
         logging.info(f"Vector search complete: {len(all_chunks)} total unique chunks from {len(dto.vectors)} vectors")
         return all_chunks
+
+    async def _usage_counts(self, user_id: str, chunk_ids: list[str]) -> dict[str, int]:
+        try:
+            counts = await self._coverage.counts(user_id, chunk_ids)
+        except Exception as e:
+            # Falls back to the `used` flag of the hits
+            logging.warning(f"Coverage lookup failed for {user_id}: {e}")
+            counts = {}
+        if self._usage_writer is not None:
+            for chunk_id in self._usage_writer.pending_ids().intersection(chunk_ids):
+                counts[chunk_id] = max(counts.get(chunk_id, 0), 1)
+        return counts
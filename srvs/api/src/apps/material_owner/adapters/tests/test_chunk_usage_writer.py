@@ -0,0 +1,73 @@
+import asyncio
+from types import SimpleNamespace
+
+from src.apps.material_owner.adapters.out.indexers.chunk_usage_writer import (
+    MeiliChunkUsageWriter,
+)
+from src.lib.meili_tasks import MeiliTaskTracker
+
+
+class FakeIndex:
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    async def update_documents(self, docs, primary_key=None):
+        self.calls.append(sorted(d["id"] for d in docs))
+        return SimpleNamespace(task_uid=len(self.calls))
+
+
+class FakeMeili:
+    """Tasks stay enqueued until `done` is set; then take `statuses` in order."""
+
+    def __init__(self, statuses: list[str] | None = None):
+        self.statuses = statuses or []
+        self.done = asyncio.Event()
+        self.finished: dict[int, str] = {}
+
+    async def get_tasks(self, uids, limit):
+        results = []
+        for uid in uids:
+            if self.done.is_set() and uid not in self.finished:
+                status = self.statuses.pop(0) if self.statuses else "succeeded"
+                self.finished[uid] = status
+            status = self.finished.get(uid, "enqueued")
+            results.append(SimpleNamespace(uid=uid, status=status, error=None))
+        return SimpleNamespace(results=results)
+
+
+def make_writer(meili: FakeMeili, **kwargs) -> tuple[MeiliChunkUsageWriter, FakeIndex]:
+    index = FakeIndex()
+    return MeiliChunkUsageWriter(MeiliTaskTracker(meili), index, **kwargs), index
+
+
+async def test_parallel_marks_become_one_task_without_blocking():
+    meili = FakeMeili()
+    writer, index = make_writer(meili, interval=0.02)
+
+    for i in range(20):
+        writer.mark([f"c{i}", "shared"])  # returns before any write
+    assert index.calls == []
+    assert writer.is_pending("c7")
+
+    await asyncio.sleep(0.05)
+    assert len(index.calls) == 1 and len(index.calls[0]) == 21
+    # Sent but unconfirmed marks still count as used
+    assert writer.pending_ids() >= {"c0", "shared"}
+
+    meili.done.set()
+    await writer.flush()
+    assert writer.pending_ids() == set()
+
+
+async def test_size_threshold_flushes_early_and_failed_task_is_retried():
+    meili = FakeMeili(statuses=["failed"])
+    writer, index = make_writer(meili, interval=10, max_batch=3)
+
+    writer.mark(["a", "b", "c"])
+    await asyncio.sleep(0.01)
+    assert index.calls == [["a", "b", "c"]]
+
+    meili.done.set()
+    await writer.aclose()
+    assert index.calls == [["a", "b", "c"], ["a", "b", "c"]]
+    assert writer.pending_ids() == set()
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from src.apps.material_owner.adapters.out.chunk_vector_store import (
+    NpyChunkVectorStore,
+)
+from src.apps.material_owner.domain.models import MaterialChunk
+
+
+def chunk(i: int, content: str = "text") -> MaterialChunk:
+    return MaterialChunk(
+        id=f"m1-{i}",
+        idx=i,
+        material_id="m1",
+        title="t",
+        content=content,
+        vector=[float(i), 1.0],
+        pages=[i],
+    )
+
+
+async def test_vectors_are_memory_mapped_and_deleted_with_material(tmp_path):
+    store = NpyChunkVectorStore(tmp_path)
+    await store.write("u1", "m1", [chunk(0), chunk(1, content=" "), chunk(2)])
+
+    stored = await store.read("m1", "u1")
+    assert stored.ids == ["m1-0", "m1-2"]
+    assert isinstance(stored.vectors, np.memmap)
+    assert stored.vectors.dtype == np.float32
+    assert stored.vectors.tolist() == [[0.0, 1.0], [2.0, 1.0]]
+    assert await store.read("m1", "u2") is None
+
+    await store.delete(["m1"])
+    assert await store.read("m1") is None
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_material_id_cannot_escape_the_directory(tmp_path):
+    store = NpyChunkVectorStore(tmp_path / "vectors")
+    with pytest.raises(ValueError):
+        await store.write("u1", "../m1", [chunk(0)])
@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.apps.material_owner.adapters.out.indexers.meili_material_indexer import (
+    EMBEDDER_NAME,
+    fetch_chunk_vectors,
+)
+
+
+class FakeIndex:
+    """Documents route: pages of `limit` starting at `offset`."""
+
+    def __init__(self, docs: list[dict]):
+        self.docs = docs
+        self.requests: list[tuple[int, int]] = []
+
+    async def get_documents(self, filter, fields, retrieve_vectors, offset, limit):
+        assert retrieve_vectors and "_vectors" in fields
+        self.requests.append((offset, limit))
+        return SimpleNamespace(
+            results=self.docs[offset : offset + limit],
+            total=len(self.docs),
+        )
+
+
+def doc(i: int, content: str = "text") -> dict:
+    return {
+        "id": f"c{i}",
+        "content": content,
+        "_vectors": {EMBEDDER_NAME: {"embeddings": [[float(i), 1.0]]}},
+    }
+
+
+async def test_reads_every_page_into_one_matrix():
+    docs = [doc(i) for i in range(25)]
+    docs[3]["content"] = "  "
+    docs[7]["_vectors"] = {}
+    index = FakeIndex(docs)
+
+    result = await fetch_chunk_vectors(index, "u1", ["m1"], page_size=10)
+
+    assert index.requests == [(0, 10), (10, 10), (20, 10)]
+    assert result.vectors.dtype == np.float32
+    assert result.vectors.shape == (23, 2)
+    assert result.ids[:4] == ["c0", "c1", "c2", "c4"]
+    assert result.vectors[3].tolist() == [4.0, 1.0]
+
+
+async def test_grows_when_chunks_are_added_while_paging():
+    index = FakeIndex([doc(i) for i in range(5)])
+    get_documents = index.get_documents
+
+    async def growing(**kwargs):
+        page = await get_documents(**kwargs)
+        if len(index.requests) == 1:
+            index.docs.extend(doc(5 + i) for i in range(5))
+        return page
+
+    index.get_documents = growing
+    result = await fetch_chunk_vectors(index, "u1", [], page_size=3)
+
+    assert len(result.ids) == len(result.vectors) == 10
+    assert result.vectors[:, 0].tolist() == list(range(len(result.ids)))
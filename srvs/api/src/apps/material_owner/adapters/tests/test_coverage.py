@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+import fakeredis
+
+from src.apps.material_owner.adapters.out.coverage_index import (
+    RedisCoverageIndex,
+)
+from src.apps.material_owner.adapters.out.searchers.meili_generator_vector_searcher import (
+    MeiliGeneratorVectorSearcher,
+    rank_by_coverage,
+)
+from src.apps.material_owner.domain.out import SearchDto
+
+
+def hit(id: str, score: float, used: bool = False) -> dict:
+    return {"id": id, "materialId": "m1", "used": used, "_rankingScore": score}
+
+
+def test_rank_penalises_each_use():
+    hits = [hit("a", 0.90), hit("b", 0.85), hit("c", 0.84), hit("d", 0.60, used=True)]
+
+    docs = rank_by_coverage(hits, {"a": 1, "b": 3}, penalty=0.1, limit=3)
+
+    # a: 0.80, b: 0.55, c: 0.84, d: 0.50 (flagged used, never counted)
+    assert [d.id for d in docs] == ["c", "a", "b"]
+
+
+async def test_redis_counters_accumulate_per_user():
+    coverage = RedisCoverageIndex(fakeredis.FakeAsyncRedis(), ttl=60)
+
+    await coverage.record("u1", ["a", "b"])
+    await coverage.record("u1", ["a"])
+    await coverage.record("u2", ["a"])
+
+    assert await coverage.counts("u1", ["a", "b", "c"]) == {"a": 2, "b": 1}
+    assert await coverage.counts("u2", ["a", "b"]) == {"a": 1}
+
+
+class FakeIndex:
+    def __init__(self, hits: list[dict]):
+        self.hits = hits
+        self.searches: list[dict] = []
+
+    async def search(self, **kwargs):
+        self.searches.append(kwargs)
+        return SimpleNamespace(hits=self.hits[: kwargs["limit"]])
+
+
+async def test_one_search_per_vector_prefers_unused_chunks():
+    coverage = RedisCoverageIndex(fakeredis.FakeAsyncRedis(), ttl=60)
+    await coverage.record("u1", ["a", "b"])
+    index = FakeIndex([hit("a", 0.9), hit("b", 0.88), hit("c", 0.8), hit("d", 0.5)])
+    meili = SimpleNamespace(index=lambda name: index)
+    searcher = MeiliGeneratorVectorSearcher(None, None, meili, coverage=coverage)
+
+    chunks = await searcher.search(
+        SearchDto(user_id="u1", material_ids=["m1"], limit=2, vectors=[[0.1, 0.2]])
+    )
+
+    assert [c.id for c in chunks] == ["a", "c"]
+    assert len(index.searches) == 1
+    assert "used" not in index.searches[0]["filter"]
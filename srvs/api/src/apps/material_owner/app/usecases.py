@@ -3,11 +3,15 @@ import json
 import logging
 from typing import Any
 
+from src.lib.cluster_cache import ClusterCache
+from src.lib.progress_bus import ProgressBus, ProgressKind, publish_progress
 from src.lib.settings import settings
+from src.lib.utils import replace_markers
 
 from src.apps.document_parser.domain import DocumentParseCmd
 
 from ..domain.models import (
+    ChunkVectors,
     Material,
     MaterialFile,
     MaterialKind,
@@ -16,6 +20,7 @@ from ..domain.models import (
     SearchType,
 )
 from ..domain.out import (
+    CoverageIndex,
     MaterialIndexer,
     MaterialRepository,
     SearchDto,
@@ -39,12 +44,18 @@ class MaterialAppImpl(MaterialApp):
         llm_tools: LLMTools,
         indexer: MaterialIndexer,
         searcher_provider: SearcherProvider,
+        progress_bus: ProgressBus | None = None,
+        coverage_index: CoverageIndex | None = None,
+        cluster_cache: ClusterCache | None = None,
     ):
         self._document_parser = document_parser
         self._material_repository = material_repository
         self._llm_tools = llm_tools
         self._indexer = indexer
         self._searcher_provider = searcher_provider
+        self._progress_bus = progress_bus
+        self._coverage_index = coverage_index
+        self._cluster_cache = cluster_cache
 
     async def get_material(self, material_id: str) -> Material | None:
         return await self._material_repository.get(material_id)
@@ -70,6 +81,7 @@ class MaterialAppImpl(MaterialApp):
             )
             material.to_big()
             await self._material_repository.create(material)
+            await self._report_progress(material, cmd.quiz_id)
             raise TooLargeFileError(file_size_mb)
 
         # material = await self._deduplicate_material(cmd)
@@ -142,12 +154,12 @@ class MaterialAppImpl(MaterialApp):
                         if marker and i < len(material.images):
                             image_file_name = material.images[i].file_name
                             image_url = f"{settings.pb_url}api/files/materials/{material.id}/{image_file_name}"
-                            marker_to_url[marker] = image_url
+                            marker_to_url[marker] = (
+                                f"\n{{quizbee_unique_image_url:{image_url}}}\n"
+                            )
 
-                    for marker, url in marker_to_url.items():
-                        text = text.replace(
-                            marker, f"\n{{quizbee_unique_image_url:{url}}}\n"
-                        )
+                    # Один проход по тексту вместо replace на каждое изображение
+                    text = replace_markers(text, marker_to_url)
             except Exception as e:
                 logger.warning(f"Error parsing PDF: {e}")
         else:
@@ -166,18 +178,22 @@ class MaterialAppImpl(MaterialApp):
 
             if cmd.quiz_id:
                 await self._material_repository.attach_to_quiz(material, cmd.quiz_id)
+            await self._report_progress(material, cmd.quiz_id)
             return material
 
         material.status = MaterialStatus.INDEXING
         await self._material_repository.update(material)
+        await self._report_progress(material, cmd.quiz_id)
 
         # Индексируем материал
         try:
             num_chunks = await self._indexer.index(material)
             material.num_chunks = num_chunks
+            await self._invalidate_clusters(material.id)
         except TooManyTextTokensError as e:
             material.status = MaterialStatus.TOO_BIG
             await self._material_repository.update(material)
+            await self._report_progress(material, cmd.quiz_id)
             raise e
 
         material.status = MaterialStatus.INDEXED
@@ -186,9 +202,33 @@ class MaterialAppImpl(MaterialApp):
             await self._material_repository.attach_to_quiz(material, cmd.quiz_id)
 
         await self._material_repository.update(material)
+        await self._report_progress(material, cmd.quiz_id)
 
         return material
 
+    async def _invalidate_clusters(self, material_id: str) -> None:
+        """Cached quiz clusters built on the old chunks must not be reused."""
+        if self._cluster_cache is None:
+            return
+        try:
+            await self._cluster_cache.invalidate(material_id)
+        except Exception as e:
+            logger.error(f"Cluster cache of material {material_id} not invalidated: {e}")
+
+    async def _report_progress(self, material: Material, quiz_id: str | None) -> None:
+        await publish_progress(
+            self._progress_bus,
+            material.user_id,
+            ProgressKind.MATERIAL_PROGRESS,
+            {
+                "id": material.id,
+                "quiz": quiz_id or "",
+                "status": material.status,
+                "tokens": material.tokens,
+                "numChunks": material.num_chunks,
+            },
+        )
+
     async def search(self, cmd: SearchCmd) -> list[MaterialChunk]:
         logger.info("MaterialAppImpl.search")
 
@@ -242,18 +282,30 @@ class MaterialAppImpl(MaterialApp):
 
         if material.status == MaterialStatus.INDEXED:
             await self._indexer.delete([cmd.material_id])
+            await self._invalidate_clusters(cmd.material_id)
 
         await self._material_repository.delete(cmd.material_id)
 
-    async def mark_chunks_as_used(self, chunk_ids: list[str]) -> None:
+    async def mark_chunks_as_used(
+        self, chunk_ids: list[str], user_id: str | None = None
+    ) -> None:
         """
         Отмечает чанки как использованные.
 
         Args:
             chunk_ids: Список ID чанков для пометки
+            user_id: Владелец материалов; с ним считается и покрытие
         """
         logger.info(f"MaterialAppImpl.mark_chunks_as_used: {len(chunk_ids)} chunks")
         await self._indexer.mark_chunks_as_used(chunk_ids)
+        if user_id and self._coverage_index is not None:
+            try:
+                await self._coverage_index.record(user_id, chunk_ids)
+            except Exception as e:
+                logger.warning(f"Coverage of {user_id} not recorded: {e}")
+
+    async def aclose(self) -> None:
+        await self._indexer.aclose()
 
     async def get_chunks_info(self, chunk_ids: list[str]) -> list[dict[str, Any]]:
         """
@@ -269,6 +321,18 @@ class MaterialAppImpl(MaterialApp):
         chunks_info = await self._indexer.get_chunks_info(chunk_ids)
         return chunks_info
 
+    async def get_chunks(
+        self, chunk_ids: list[str], with_vectors: bool = False
+    ) -> list[MaterialChunk]:
+        logger.info(f"MaterialAppImpl.get_chunks: {len(chunk_ids)} chunks")
+        return await self._indexer.get_chunks(chunk_ids, with_vectors=with_vectors)
+
+    async def get_chunk_vectors(
+        self, user_id: str, material_ids: list[str]
+    ) -> ChunkVectors:
+        logger.info(f"MaterialAppImpl.get_chunk_vectors: {len(material_ids)} materials")
+        return await self._indexer.get_chunk_vectors(user_id, material_ids)
+
     async def _deduplicate_material(self, cmd: AddMaterialCmd) -> Material | None:
         material = await self._material_repository.get(cmd.material_id)
         if material is not None:
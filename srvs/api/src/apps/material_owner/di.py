@@ -3,12 +3,17 @@ from langfuse import Langfuse
 from meilisearch_python_sdk import AsyncClient
 
 from pocketbase import PocketBase
+import redis.asyncio as redis
 
 from src.apps.document_parser.domain._in import DocumentParserApp
 from src.apps.llm_tools.domain._in import LLMToolsApp
 from src.apps.material_owner.domain._in import MaterialApp
+from src.lib.cluster_cache import ClusterCache
+from src.lib.meili_tasks import MeiliTaskTracker
+from src.lib.progress_bus import ProgressBus
 
 from .domain.out import (
+    CoverageIndex,
     LLMTools,
     MaterialRepository,
     MaterialIndexer,
@@ -23,6 +28,8 @@ from .adapters.out import (
     MeiliMaterialDistributionSearcher,
     DocumentParserAdapter,
     LLMToolsAdapter,
+    init_coverage_index,
+    init_chunk_vector_store,
     MeiliMaterialAllSearcher,
     MeiliMaterialVectorSearcher,
     MeiliGeneratorVectorSearcher,
@@ -36,14 +43,29 @@ async def init_material_deps(
     meili: AsyncClient,
     llm_tools: LLMToolsApp,
     document_parser_app: DocumentParserApp,
+    redis_client: redis.Redis,
+    meili_tasks: MeiliTaskTracker | None = None,
 ) -> tuple[
-    MaterialRepository, DocumentParser, MaterialIndexer, SearcherProvider, LLMTools
+    MaterialRepository,
+    DocumentParser,
+    MaterialIndexer,
+    SearcherProvider,
+    LLMTools,
+    CoverageIndex,
 ]:
     # INTERNAL HEX DOMAIN ADAPTERS
     material_repository = PBMaterialRepository(admin_pb)
     material_indexer = await MeiliMaterialIndexer.ainit(
-        lf=lf, llm_tools=llm_tools, meili=meili
+        lf=lf,
+        llm_tools=llm_tools,
+        meili=meili,
+        redis_client=redis_client,
+        tasks=meili_tasks,
+        vector_store=init_chunk_vector_store(),
     )
+    # Shares the pending chunk marks of the indexer
+    usage_writer = material_indexer.usage_writer
+    coverage_index = init_coverage_index(redis_client)
     searcher_provider = MaterialSearcherProvider(
         query_searcher=MeiliMaterialQuerySearcher(
             lf=lf, llm_tools=llm_tools, meili=meili
@@ -54,7 +76,11 @@ async def init_material_deps(
         all_searcher=MeiliMaterialAllSearcher(lf=lf, llm_tools=llm_tools, meili=meili),
         vector_searcher=MeiliMaterialVectorSearcher(meili=meili, llm_tools=llm_tools),
         generator_vector_searcher=MeiliGeneratorVectorSearcher(
-            lf=lf, llm_tools=llm_tools, meili=meili
+            lf=lf,
+            llm_tools=llm_tools,
+            meili=meili,
+            usage_writer=usage_writer,
+            coverage=coverage_index,
         ),
     )
 
@@ -69,6 +95,7 @@ async def init_material_deps(
         material_indexer,
         searcher_provider,
         llm_tools_adapter,
+        coverage_index,
     )
 
 
@@ -78,6 +105,9 @@ def init_material_app(
     indexer: MaterialIndexer,
     material_repository: MaterialRepository,
     searcher_provider: SearcherProvider,
+    progress_bus: ProgressBus | None = None,
+    coverage_index: CoverageIndex | None = None,
+    cluster_cache: ClusterCache | None = None,
 ) -> MaterialApp:
     return MaterialAppImpl(
         document_parser=document_parser_adapter,
@@ -85,4 +115,7 @@ def init_material_app(
         llm_tools=llm_tools_adapter,
         indexer=indexer,
         searcher_provider=searcher_provider,
+        progress_bus=progress_bus,
+        coverage_index=coverage_index,
+        cluster_cache=cluster_cache,
     )
@@ -4,7 +4,7 @@ from typing import Any, Protocol
 
 from src.apps.user_owner.domain._in import Principal
 
-from .models import Material, MaterialFile, MaterialChunk, SearchType
+from .models import ChunkVectors, Material, MaterialFile, MaterialChunk, SearchType
 
 
 @dataclass
@@ -52,6 +52,18 @@ class MaterialApp(Protocol):
 
     async def remove_material(self, cmd: RemoveMaterialCmd) -> None: ...
 
-    async def mark_chunks_as_used(self, chunk_ids: list[str]) -> None: ...
+    async def mark_chunks_as_used(
+        self, chunk_ids: list[str], user_id: str | None = None
+    ) -> None: ...
 
     async def get_chunks_info(self, chunk_ids: list[str]) -> list[dict[str, Any]]: ...
+
+    async def get_chunks(
+        self, chunk_ids: list[str], with_vectors: bool = False
+    ) -> list[MaterialChunk]: ...
+
+    async def get_chunk_vectors(
+        self, user_id: str, material_ids: list[str]
+    ) -> ChunkVectors: ...
+
+    async def aclose(self) -> None: ...
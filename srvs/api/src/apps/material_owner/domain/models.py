@@ -1,6 +1,8 @@
 from dataclasses import dataclass, field
 from enum import StrEnum
 
+import numpy as np
+
 from src.lib.utils import genID
 
 
@@ -76,6 +78,14 @@ class MaterialChunk:
     pages: list[int] = field(default_factory=list)
 
 
+@dataclass(slots=True, kw_only=True)
+class ChunkVectors:
+    """Vectors of chunks with content, row i belongs to ids[i]."""
+
+    ids: list[str]
+    vectors: np.ndarray  # (n, d) float32
+
+
 @dataclass(slots=True, kw_only=True)
 class Material:
     user_id: str
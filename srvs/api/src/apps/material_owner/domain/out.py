@@ -5,7 +5,14 @@ from src.lib.config.llms import LLMS
 from src.apps.document_parser.domain import DocumentParseCmd
 from src.apps.llm_tools.domain.out import ChunkWithPages
 
-from .models import Material, MaterialFile, MaterialChunk, ParsedDocument, SearchType
+from .models import (
+    ChunkVectors,
+    Material,
+    MaterialFile,
+    MaterialChunk,
+    ParsedDocument,
+    SearchType,
+)
 
 
 # ======ADAPTERS INTERFACES======
@@ -94,6 +101,34 @@ class MaterialIndexer(Protocol):
     async def delete(self, material_ids: list[str]) -> None: ...
     async def mark_chunks_as_used(self, chunk_ids: list[str]) -> None: ...
     async def get_chunks_info(self, chunk_ids: list[str]) -> list[dict[str, Any]]: ...
+    async def get_chunks(
+        self, chunk_ids: list[str], with_vectors: bool = False
+    ) -> list[MaterialChunk]: ...
+    async def get_chunk_vectors(
+        self, user_id: str, material_ids: list[str]
+    ) -> ChunkVectors: ...
+    async def aclose(self) -> None: ...
+
+
+# Chunk vectors
+class ChunkVectorStore(Protocol):
+    """Per-material chunk vectors kept next to the index."""
+
+    async def write(
+        self, user_id: str, material_id: str, chunks: list[MaterialChunk]
+    ) -> None: ...
+    async def read(
+        self, material_id: str, user_id: str | None = None
+    ) -> ChunkVectors | None: ...
+    async def delete(self, material_ids: list[str]) -> None: ...
+
+
+# Coverage
+class CoverageIndex(Protocol):
+    """How many times each chunk was used for questions, per user."""
+
+    async def record(self, user_id: str, chunk_ids: list[str]) -> None: ...
+    async def counts(self, user_id: str, chunk_ids: list[str]) -> dict[str, int]: ...
 
 
 # Searcher
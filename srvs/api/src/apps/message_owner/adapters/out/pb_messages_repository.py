@@ -5,6 +5,9 @@ import asyncio
 from pocketbase import PocketBase
 from pocketbase.models.dtos import Record
 
+from src.lib.pb_batch import BatchRequest, PBBatchWriter
+from src.lib.utils import PB_ID
+
 from ...domain.out import MessageRepository
 from ...domain.models import Message, MessageMetadata
 
@@ -12,40 +15,78 @@ from ...domain.models import Message, MessageMetadata
 class PBMessageRepository(MessageRepository):
     def __init__(self, pb: PocketBase):
         self.pb = pb
+        self._writer = PBBatchWriter(pb)
 
     async def get(self, id: str) -> Message:
         rec = await self.pb.collection("messages").get_one(id)
         return self._to_message(rec)
 
-    async def get_attempt(self, attempt_id: str, limit: int = 100) -> list[Message]:
-        recs = await self.pb.collection("messages").get_full_list(
+    async def get_attempt(
+        self,
+        attempt_id: str,
+        limit: int = 100,
+        item_id: str | None = None,
+        page: int = 1,
+    ) -> list[Message]:
+        """
+        One page of history, newest page first, messages in chronological
+        order. Sort and limit are applied by PocketBase.
+        """
+        # Both ids go into the filter string, so only plain record ids pass
+        for value in (attempt_id, item_id):
+            if value and not PB_ID.match(value):
+                raise ValueError(f"Invalid record id: {value!r}")
+
+        filter = f"quizAttempt = '{attempt_id}'"
+        if item_id:
+            # Served by idx_messages_attempt_item (quizAttempt, metadata.item_id)
+            filter += f" && metadata.item_id = '{item_id}'"
+
+        res = await self.pb.collection("messages").get_list(
+            page,
+            limit,
             options={
                 "params": {
-                    "filter": f"quizAttempt = '{attempt_id}'",
+                    "filter": filter,
                     "sort": "-created",
-                    "limit": limit,
+                    "skipTotal": 1,
                 }
             },
         )
+        recs = res["items"]
         recs.reverse()
 
         return [self._to_message(rec) for rec in recs]
 
     async def create(self, messages: list[Message]) -> None:
-        for message in messages:
-            try:
-                dto = self._to_record(message)
-                await self.pb.collection("messages").create(dto)
-            except Exception as e:
-                raise
+        if len(messages) == 1:
+            await self.pb.collection("messages").create(self._to_record(messages[0]))
+            return
+        await self._writer.write(
+            [
+                BatchRequest(
+                    method="POST", collection="messages", body=self._to_record(m)
+                )
+                for m in messages
+            ]
+        )
 
     async def update(self, messages: list[Message]) -> None:
-        for message in messages:
-            try:
-                dto = self._to_record(message)
-                await self.pb.collection("messages").update(message.id, dto)
-            except Exception as e:
-                raise
+        if len(messages) == 1:
+            m = messages[0]
+            await self.pb.collection("messages").update(m.id, self._to_record(m))
+            return
+        await self._writer.write(
+            [
+                BatchRequest(
+                    method="PATCH",
+                    collection="messages",
+                    record_id=m.id,
+                    body=self._to_record(m),
+                )
+                for m in messages
+            ]
+        )
 
     def _to_record(self, message: Message) -> dict[str, Any]:
         return {
@@ -0,0 +1,65 @@
+import json
+
+import httpx
+import pytest
+
+from src.apps.message_owner.adapters.out import PBMessageRepository
+from src.apps.message_owner.app.usecases import MessageOwnerAppImpl
+from src.apps.message_owner.domain._in import StartMessageCmd
+from src.lib.http_pool import PooledPocketBase
+
+
+class FakeCollection:
+    def __init__(self, params: list[dict]):
+        self.params = params
+
+    async def get_list(self, page: int, limit: int, options=None):
+        self.params.append(options["params"])
+        return {"items": []}
+
+
+class FakePB:
+    def __init__(self):
+        self.params: list[dict] = []
+
+    def collection(self, name: str):
+        return FakeCollection(self.params)
+
+
+async def test_history_filter_only_takes_record_ids():
+    pb = FakePB()
+    repository = PBMessageRepository(pb)
+
+    await repository.get_attempt("a" * 15, item_id="b" * 15)
+    assert pb.params[0]["filter"] == (
+        f"quizAttempt = '{'a' * 15}' && metadata.item_id = '{'b' * 15}'"
+    )
+
+    with pytest.raises(ValueError):
+        await repository.get_attempt("a" * 15, item_id="x' || quizAttempt != '")
+    with pytest.raises(ValueError):
+        await repository.get_attempt("a1' || 1=1 || '")
+    assert len(pb.params) == 1
+
+
+async def test_turn_is_written_in_one_batch():
+    batches: list[list[dict]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/api/batch"
+        batches.append(json.loads(request.content)["requests"])
+        return httpx.Response(200, json=[])
+
+    client = httpx.AsyncClient(
+        base_url="http://pb.test", transport=httpx.MockTransport(handler)
+    )
+    app = MessageOwnerAppImpl(PBMessageRepository(PooledPocketBase(client)))
+
+    ai = await app.start_message(
+        StartMessageCmd(attempt_id="a1", item_id="i1", query="Why?")
+    )
+
+    (batch,) = batches
+    assert [r["body"]["role"] for r in batch] == ["user", "ai"]
+    assert batch[0]["body"]["content"] == "Why?"
+    assert batch[1]["body"]["id"] == ai.id
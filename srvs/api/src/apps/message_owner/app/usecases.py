@@ -18,13 +18,20 @@ class MessageOwnerAppImpl(MessageOwnerApp):
 
     async def get_attempt_history(self, cmd: GetAttemptHistoryCmd) -> list[Message]:
         logger.info(f"Getting attempt history for attempt {cmd.attempt_id}")
-        return await self.message_repository.get_attempt(cmd.attempt_id, cmd.limit)
+        return await self.message_repository.get_attempt(
+            cmd.attempt_id, cmd.limit, item_id=cmd.item_id, page=cmd.page
+        )
 
     async def start_message(self, cmd: StartMessageCmd) -> Message:
         logger.info(f"Starting message for attempt {cmd.attempt_id}")
         message = Message.create(cmd.attempt_id, MessageRole.AI, cmd.item_id)
         message.to_streaming()
-        await self.message_repository.create([message])
+        messages = [message]
+        if cmd.query:
+            # One batch write for both sides of the turn
+            user = Message.create_user(cmd.attempt_id, cmd.item_id, cmd.query)
+            messages.insert(0, user)
+        await self.message_repository.create(messages)
         return message
 
     async def finalize_message(self, cmd: FinalizeMessageCmd):
@@ -8,12 +8,17 @@ from ..domain.models import Message, MessageMetadata
 class GetAttemptHistoryCmd:
     attempt_id: str
     limit: int = 100
+    item_id: str | None = None
+    # 1 = most recent `limit` messages, 2 = the `limit` before them, ...
+    page: int = 1
 
 
 @dataclass(slots=True, kw_only=True)
 class StartMessageCmd:
     attempt_id: str
     item_id: str
+    # The user's turn; stored in the same batch as the AI message
+    query: str = ""
 
 
 @dataclass(slots=True, kw_only=True)
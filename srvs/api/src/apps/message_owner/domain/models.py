@@ -45,6 +45,16 @@ class Message:
             metadata=MessageMetadata(item_id=item_id),
         )
 
+    @classmethod
+    def create_user(cls, attempt_id: str, item_id: str, content: str):
+        return cls(
+            attempt_id=attempt_id,
+            content=content,
+            role=MessageRole.USER,
+            status=MessageStatus.FINAL,
+            metadata=MessageMetadata(item_id=item_id),
+        )
+
     def to_streaming(self):
         if self.status != MessageStatus.INITIAL:
             raise ValueError(f"Message {self.id} is not initial")
@@ -3,3 +3,4 @@ from .ai_attempt_finalizer import (
     AIAttemptFinalizer,
 )
 from .explainers.ai_grok_explainer import AIGrokExplainer
+from .retrieval_cache import MemoryRetrievalCache, RedisRetrievalCache
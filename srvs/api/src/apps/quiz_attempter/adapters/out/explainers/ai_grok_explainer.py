@@ -1,6 +1,8 @@
 import asyncio
 import contextlib
 import logging
+
+import numpy as np
 from dataclasses import dataclass
 from typing import Any, Literal, AsyncIterable
 
@@ -32,6 +34,7 @@ from src.lib.utils import update_span_with_result
 from ....domain.models import (
     Attempt,
     QuizRef,
+    RetrievalKey,
 )
 from ....domain.refs import (
     MessageRef,
@@ -40,11 +43,14 @@ from ....domain.refs import (
     MessageStatusRef,
     MessageMetadataRef,
 )
-from ....domain.out import Explainer
+from ....domain.out import Explainer, RetrievalCache
 
 EXPLAINER_LLM = LLMS.GROK_4_1_FAST
 RETRIES = 5
 RERANK_QUERY_PREFIX = "Find educational content that thoroughly can explain:"
+# Follow-up questions this close to a chunk of the item's context bundle are
+# answered from the bundle; anything further away goes to vector search
+BUNDLE_MIN_SIMILARITY = 0.5
 
 
 @dataclass
@@ -58,10 +64,17 @@ logger = logging.getLogger(__name__)
 
 
 class AIGrokExplainer(Explainer):
-    def __init__(self, lf: Langfuse, material_app: MaterialApp, llm_tools: LLMToolsApp):
+    def __init__(
+        self,
+        lf: Langfuse,
+        material_app: MaterialApp,
+        llm_tools: LLMToolsApp,
+        retrieval_cache: RetrievalCache | None = None,
+    ):
         self._lf = lf
         self._material_app = material_app
         self._llm_tools = llm_tools
+        self._retrieval_cache = retrieval_cache
         self._ai = Agent(
             history_processors=[self._inject_system_prompt],
             deps_type=AIGrokExplainerDeps,
@@ -79,19 +92,18 @@ class AIGrokExplainer(Explainer):
         cache_key: str,
         material_ids: list[str],
         user: Any,
+        chunks: list[MaterialChunk] | None = None,
     ) -> AsyncIterable[MessageRef]:
-        search_query = self._build_search_query(query, item)
-        logger.info(f"Explainer search_query: '{search_query[:200]}...'")
-
-        chunks = await self._search_chunks(search_query, material_ids, user)
-        logger.info(f"Explainer found {len(chunks)} chunks")
+        if chunks is None:
+            chunks = await self.retrieve(query, item, material_ids, user)
 
-        queue: asyncio.Queue[MessageRef | None] = asyncio.Queue()
+        # Deltas as plain strings; the final message as a MessageRef; None ends
+        queue: asyncio.Queue[str | MessageRef | None] = asyncio.Queue()
         deps = AIGrokExplainerDeps(quiz=attempt.quiz, current_item=item, chunks=chunks)
 
         async def producer():
             with self._lf.start_as_current_span(name="explainer-agent") as span:
-                content = ""
+                parts: list[str] = []
                 run = None
                 try:
                     async with self._ai.run_stream(
@@ -102,28 +114,20 @@ class AIGrokExplainer(Explainer):
                         model_settings={},
                     ) as r:
                         run = r
-                        async for output in run.stream_output():
-                            delta = output[len(content) :]
-                            content += delta
-
-                            await queue.put(
-                                MessageRef(
-                                    id=ai_msg.id,
-                                    attempt_id=attempt.id,
-                                    item_id=item.id,
-                                    content=delta,
-                                    role=MessageRoleRef.AI,
-                                    status=MessageStatusRef.STREAMING,
-                                    metadata=MessageMetadataRef(),
-                                )
-                            )
-
-                    await queue.put(
+                        # Only the new text; grouping into frames is done below
+                        async for delta in run.stream_text(
+                            delta=True, debounce_by=None
+                        ):
+                            if delta:
+                                parts.append(delta)
+                                queue.put_nowait(delta)
+
+                    queue.put_nowait(
                         MessageRef(
                             id=ai_msg.id,
                             attempt_id=attempt.id,
                             item_id=item.id,
-                            content=content,
+                            content="".join(parts),
                             role=MessageRoleRef.AI,
                             status=MessageStatusRef.FINAL,
                             metadata=MessageMetadataRef(),
@@ -140,20 +144,138 @@ class AIGrokExplainer(Explainer):
                             cache_key,
                             EXPLAINER_LLM,
                         )
-                    await queue.put(None)
+                    queue.put_nowait(None)
 
         producer_task = asyncio.create_task(producer())
+        metadata = MessageMetadataRef()
+        window = settings.explainer_stream_window
+        max_chars = settings.explainer_stream_max_chars
+        loop = asyncio.get_running_loop()
+        sent_at = float("-inf")
         try:
-            while True:
+            done = False
+            while not done:
                 message = await queue.get()
                 if message is None:
                     break
-                yield message
+                if isinstance(message, MessageRef):
+                    yield message
+                    continue
+
+                # The first delta goes out at once, later ones at most once
+                # per window: everything that arrived meanwhile is one frame
+                wait = sent_at + window - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                text = [message]
+                size = len(message)
+                tail: MessageRef | None = None
+                while size < max_chars and not queue.empty():
+                    nxt = queue.get_nowait()
+                    if nxt is None:
+                        done = True
+                        break
+                    if isinstance(nxt, MessageRef):
+                        tail = nxt
+                        break
+                    text.append(nxt)
+                    size += len(nxt)
+
+                sent_at = loop.time()
+                yield MessageRef(
+                    id=ai_msg.id,
+                    attempt_id=attempt.id,
+                    item_id=item.id,
+                    content="".join(text),
+                    role=MessageRoleRef.AI,
+                    status=MessageStatusRef.STREAMING,
+                    metadata=metadata,
+                )
+                if tail is not None:
+                    yield tail
         finally:
             producer_task.cancel()
             with contextlib.suppress(asyncio.CancelledError):
                 await producer_task
 
+    async def retrieve(
+        self,
+        query: str,
+        item: QuizItemRef,
+        material_ids: list[str],
+        user: Any,
+        follow_up: bool = False,
+    ) -> list[MaterialChunk]:
+        key = RetrievalKey.create(user.id, item.id, material_ids, query)
+        cache = self._retrieval_cache
+
+        # Same question again: no embedding, no search, no rerank
+        if cache is not None:
+            chunks = await self._cached_chunks(await cache.get(key))
+            if chunks is not None:
+                logger.info(f"Explainer retrieval cache hit: {len(chunks)} chunks")
+                return chunks
+
+        # First message about the item: the chunks it was generated from
+        if item.context_chunk_ids and not follow_up:
+            chunks = await self._material_app.get_chunks(item.context_chunk_ids)
+            if chunks:
+                logger.info(f"Explainer context bundle: {len(chunks)} chunks")
+                return chunks
+
+        search_query = self._build_search_query(query, item)
+        logger.info(f"Explainer search_query: '{search_query[:200]}...'")
+        # The cache compares the user's query alone: the question and answers
+        # in search_query are shared by every follow-up and would dominate
+        # the similarity
+        texts = [search_query] if cache is None else [search_query, key.query]
+        vectors = await self._llm_tools.vectorize(texts)
+        q_vec = vectors[0].tolist()
+        key_vec = vectors[-1].tolist()
+
+        if item.context_chunk_ids and follow_up:
+            chunks = await self._bundle_if_relevant(item.context_chunk_ids, q_vec)
+            if chunks is not None:
+                logger.info(f"Explainer follow-up within bundle: {len(chunks)} chunks")
+                return chunks
+
+        # Paraphrase of an earlier question: reuse its reranked chunks
+        if cache is not None:
+            chunks = await self._cached_chunks(await cache.get_similar(key, key_vec))
+            if chunks is not None:
+                logger.info(f"Explainer retrieval semantic hit: {len(chunks)} chunks")
+                return chunks
+
+        chunks = await self._search_chunks(search_query, q_vec, material_ids, user)
+        logger.info(f"Explainer found {len(chunks)} chunks")
+        if cache is not None and chunks:
+            await cache.set(key, key_vec, [c.id for c in chunks])
+        return chunks
+
+    async def _bundle_if_relevant(
+        self, chunk_ids: list[str], q_vec: list[float]
+    ) -> list[MaterialChunk] | None:
+        chunks = await self._material_app.get_chunks(chunk_ids, with_vectors=True)
+        vectors = [c.vector for c in chunks if c.vector]
+        if not vectors:
+            return None
+
+        matrix = np.asarray(vectors, dtype=np.float32)
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-12
+        q = np.asarray(q_vec, dtype=np.float32)
+        best = float((matrix @ (q / (np.linalg.norm(q) + 1e-12))).max())
+        logger.info(f"Explainer follow-up similarity to bundle: {best:.3f}")
+        return chunks if best >= BUNDLE_MIN_SIMILARITY else None
+
+    async def _cached_chunks(
+        self, chunk_ids: list[str] | None
+    ) -> list[MaterialChunk] | None:
+        if not chunk_ids:
+            return None
+        chunks = await self._material_app.get_chunks(chunk_ids)
+        # A material was removed since: treat as a miss
+        return chunks if len(chunks) == len(chunk_ids) else None
+
     async def _inject_system_prompt(
         self, ctx: RunContext[AIGrokExplainerDeps], messages: list[ModelMessage]
     ) -> list[ModelMessage]:
@@ -256,10 +378,8 @@ class AIGrokExplainer(Explainer):
         return f"{item.question} {answers_text} {query}"
 
     async def _search_chunks(
-        self, search_query: str, material_ids: list[str], user: Any
+        self, search_query: str, q_vec: list[float], material_ids: list[str], user: Any
     ) -> list[MaterialChunk]:
-        q_vec = (await self._llm_tools.vectorize([search_query]))[0].tolist()
-
         chunks = await self._material_app.search(
             SearchCmd(
                 limit_tokens=RAG_CHUNK_TOKEN_LIMIT,
@@ -1,3 +1,4 @@
+import asyncio
 import json
 from dataclasses import asdict
 import logging
@@ -12,6 +13,13 @@ from ...domain.models import Attempt, Feedback
 from ...domain.refs import Choice, QuizItemRef, QuizRef
 from ...domain.out import AttemptRepository
 
+# Projections for the explainer: only what a single chat turn needs
+ATTEMPT_FIELDS = (
+    "id,user,choices,feedback,"
+    "expand.quiz.id,expand.quiz.query,expand.quiz.materials"
+)
+ITEM_FIELDS = "id,quiz,order,question,answers,usedChunks"
+
 
 class PBAttemptRepository(AttemptRepository):
     def __init__(self, admin_pb: PocketBase, http: httpx.AsyncClient):
@@ -24,6 +32,31 @@ class PBAttemptRepository(AttemptRepository):
         )
         return await self._rec_to_attempt(rec)
 
+    async def get_for_item(self, id: str, item_id: str) -> Attempt:
+        """
+        Attempt with only `item_id` in quiz.items.
+
+        No quizItems_via_quiz expand and no materialsContext download: two
+        small projected reads, issued concurrently.
+        """
+        rec, item_rec = await asyncio.gather(
+            self.admin_pb.collection("quizAttempts").get_one(
+                id, options={"params": {"expand": "quiz", "fields": ATTEMPT_FIELDS}}
+            ),
+            self.admin_pb.collection("quizItems").get_one(
+                item_id, options={"params": {"fields": ITEM_FIELDS}}
+            ),
+        )
+        attempt = await self._rec_to_attempt(rec)
+        if item_rec.get("quiz") != attempt.quiz.id:
+            raise ValueError(f"Item {item_id} not found")
+
+        # Decisions are stored by item order
+        order = item_rec.get("order", 0)
+        choice = attempt.choices[order] if order < len(attempt.choices) else None
+        attempt.quiz.items = [self._rec_to_item(item_rec, choice)]
+        return attempt
+
     async def create(self, attempt: Attempt) -> None:
         try:
             dto = self._attempt_to_rec(attempt)
@@ -103,23 +136,12 @@ class PBAttemptRepository(AttemptRepository):
             for item, choice in zip(items_recs, padded_choices)
         ]
 
-        fname = rec.get("materialsContext")
-        material_content = ""
-        if fname:
-            total_content = await self._load_file_text(
-                "quizes", rec.get("id", ""), fname
-            )
-            cluster_vectors = json.loads(total_content)
-        else:
-            cluster_vectors = []
-
         return QuizRef(
             id=rec.get("id", ""),
             items=items,
             query=rec.get("query", ""),
             material_content="",
             material_ids=rec.get("materials", []),
-            cluster_vectors=cluster_vectors,
         )
 
     def _rec_to_choice(self, rec: Record):
@@ -140,11 +162,15 @@ class PBAttemptRepository(AttemptRepository):
             f"Answer {i+1} {a.get('correct', False)}: {a.get('content', '')}\n\nExplanation: {a.get('explanation', '')}\n\n"
             for i, a in enumerate(answers_recs)
         ]
+        used_chunks = rec.get("usedChunks") or []
+        if isinstance(used_chunks, str):
+            used_chunks = json.loads(used_chunks)
         return QuizItemRef(
             id=rec.get("id", ""),
             question=rec.get("question", ""),
             answers=answers,
             choice=choice,
+            context_chunk_ids=[c["id"] for c in used_chunks if c.get("id")],
         )
 
     def _file_url(self, col: str, id: str, file: str) -> str:
@@ -0,0 +1,214 @@
+import base64
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+
+import numpy as np
+import redis.asyncio as redis
+
+from ...domain.models import RetrievalKey
+from ...domain.out import RetrievalCache
+
+logger = logging.getLogger(__name__)
+
+RETRIEVAL_KEY = "quizbee:explainer:retrieval:{scope}"
+
+
+@dataclass(slots=True)
+class _Entry:
+    expires: float  # unix time
+    vector: np.ndarray  # unit-length float32
+    chunk_ids: list[str]
+
+
+def _unit(vector: list[float] | np.ndarray) -> np.ndarray:
+    v = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(v))
+    return v / norm if norm > 0 else v
+
+
+class MemoryRetrievalCache(RetrievalCache):
+    """
+    In-process cache of explainer retrievals.
+
+    Entries are grouped by RetrievalKey.scope (user, item, materials); a
+    scope keeps at most `per_scope` queries, the cache at most `maxsize`
+    scopes (LRU).
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        similarity: float = 0.95,
+        maxsize: int = 2_000,
+        per_scope: int = 16,
+    ):
+        self.ttl = ttl
+        self.similarity = similarity
+        self.maxsize = maxsize
+        self.per_scope = per_scope
+        self._scopes: OrderedDict[str, OrderedDict[str, _Entry]] = OrderedDict()
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    async def get(self, key: RetrievalKey) -> list[str] | None:
+        entry = self._live(key.scope).get(key.query)
+        if entry is None:
+            return None
+        self.hits += 1
+        return entry.chunk_ids
+
+    async def get_similar(
+        self, key: RetrievalKey, vector: list[float]
+    ) -> list[str] | None:
+        entries = list(self._live(key.scope).values())
+        if not entries:
+            self.misses += 1
+            return None
+
+        scores = np.stack([e.vector for e in entries]) @ _unit(vector)
+        best = int(np.argmax(scores))
+        if scores[best] < self.similarity:
+            self.misses += 1
+            return None
+        self.semantic_hits += 1
+        return entries[best].chunk_ids
+
+    async def set(
+        self, key: RetrievalKey, vector: list[float], chunk_ids: list[str]
+    ) -> None:
+        self.put(key, _Entry(time.time() + self.ttl, _unit(vector), chunk_ids))
+
+    def put(self, key: RetrievalKey, entry: _Entry) -> None:
+        scope = self._scopes.setdefault(key.scope, OrderedDict())
+        self._scopes.move_to_end(key.scope)
+        scope[key.query] = entry
+        scope.move_to_end(key.query)
+        while len(scope) > self.per_scope:
+            scope.popitem(last=False)
+        while len(self._scopes) > self.maxsize:
+            self._scopes.popitem(last=False)
+
+    def _live(self, scope_id: str) -> OrderedDict[str, _Entry]:
+        scope = self._scopes.get(scope_id)
+        if scope is None:
+            return OrderedDict()
+
+        now = time.time()
+        for query in [q for q, e in scope.items() if e.expires < now]:
+            del scope[query]
+        if not scope:
+            del self._scopes[scope_id]
+            return scope
+        self._scopes.move_to_end(scope_id)
+        return scope
+
+    def stats(self) -> dict[str, float]:
+        hits = self.hits + self.semantic_hits
+        total = hits + self.misses
+        return {
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": hits / total if total else 0.0,
+            "scopes": len(self._scopes),
+        }
+
+
+class RedisRetrievalCache(RetrievalCache):
+    """
+    Two-tier retrieval cache: in-process first, then a Redis hash per scope
+    (field = normalised query) shared by all API processes. The hash is
+    trimmed to the local `per_scope` limit on write.
+    """
+
+    def __init__(self, redis_client: redis.Redis, local: MemoryRetrievalCache):
+        self.redis = redis_client
+        self.local = local
+
+    async def get(self, key: RetrievalKey) -> list[str] | None:
+        chunk_ids = await self.local.get(key)
+        if chunk_ids is not None:
+            return chunk_ids
+
+        try:
+            raw = await self.redis.hget(RETRIEVAL_KEY.format(scope=key.scope), key.query)
+        except Exception as e:
+            logger.warning(f"Retrieval cache read failed: {e}")
+            return None
+
+        entry = self._decode(raw) if raw is not None else None
+        if entry is None:
+            return None
+        self.local.put(key, entry)
+        return await self.local.get(key)
+
+    async def get_similar(
+        self, key: RetrievalKey, vector: list[float]
+    ) -> list[str] | None:
+        redis_key = RETRIEVAL_KEY.format(scope=key.scope)
+        try:
+            fields = await self.redis.hgetall(redis_key)
+        except Exception as e:
+            logger.warning(f"Retrieval cache read failed: {e}")
+            return await self.local.get_similar(key, vector)
+
+        expired = []
+        for query, raw in fields.items():
+            query = query.decode() if isinstance(query, bytes) else query
+            entry = self._decode(raw)
+            if entry is None:
+                expired.append(query)
+            else:
+                self.local.put(replace(key, query=query), entry)
+        if expired:
+            await self.redis.hdel(redis_key, *expired)
+
+        return await self.local.get_similar(key, vector)
+
+    async def set(
+        self, key: RetrievalKey, vector: list[float], chunk_ids: list[str]
+    ) -> None:
+        await self.local.set(key, vector, chunk_ids)
+
+        unit = _unit(vector)
+        payload = json.dumps(
+            {
+                "exp": time.time() + self.local.ttl,
+                "vec": base64.b64encode(unit.tobytes()).decode(),
+                "ids": chunk_ids,
+            }
+        )
+        redis_key = RETRIEVAL_KEY.format(scope=key.scope)
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.hset(redis_key, key.query, payload)
+                pipe.expire(redis_key, int(max(1, self.local.ttl)))
+                pipe.hlen(redis_key)
+                *_, size = await pipe.execute()
+            if size > self.local.per_scope:
+                await self._trim(redis_key)
+        except Exception as e:
+            logger.warning(f"Retrieval cache write failed: {e}")
+
+    async def _trim(self, redis_key: str) -> None:
+        """Keeps the `per_scope` most recent queries of a scope, like the local tier."""
+        fields = await self.redis.hgetall(redis_key)
+        by_age = sorted(fields, key=lambda q: json.loads(fields[q])["exp"])
+        stale = by_age[: len(by_age) - self.local.per_scope]
+        if stale:
+            await self.redis.hdel(redis_key, *stale)
+
+    def _decode(self, raw: bytes | str) -> _Entry | None:
+        data = json.loads(raw)
+        if data["exp"] < time.time():
+            return None
+        vector = np.frombuffer(base64.b64decode(data["vec"]), dtype=np.float32)
+        return _Entry(data["exp"], vector, data["ids"])
+
+    def stats(self) -> dict[str, float]:
+        return self.local.stats()
+
@@ -0,0 +1,104 @@
+import json
+
+import pytest
+
+from src.apps.quiz_attempter.adapters.out import PBAttemptRepository
+
+QUIZ = {
+    "id": "q1",
+    "query": "Photosynthesis",
+    "materials": ["m1", "m2"],
+    "materialsContext": "clusters.json",
+}
+ITEMS = [
+    {
+        "id": f"i{n}",
+        "quiz": "q1",
+        "order": n,
+        "question": f"Question {n}",
+        "answers": [{"content": "A", "correct": True, "explanation": "because"}],
+    }
+    for n in range(3)
+]
+ATTEMPT = {
+    "id": "a1",
+    "user": "u1",
+    "choices": [
+        {"answerIndex": 0, "correct": True},
+        {"answerIndex": 2, "correct": False},
+    ],
+    "feedback": None,
+}
+
+
+class FakeCollection:
+    def __init__(self, name: str, calls: list):
+        self.name = name
+        self.calls = calls
+
+    async def get_one(self, id: str, options: dict | None = None):
+        params = (options or {}).get("params", {})
+        self.calls.append((self.name, id, params))
+        if self.name == "quizItems":
+            return next(i for i in ITEMS if i["id"] == id)
+
+        quiz = dict(QUIZ)
+        if "quizItems_via_quiz" in params.get("expand", ""):
+            quiz["expand"] = {"quizItems_via_quiz": ITEMS}
+        return {**ATTEMPT, "expand": {"quiz": quiz}}
+
+
+class FakePB:
+    def __init__(self):
+        self.calls = []
+
+    def collection(self, name: str):
+        return FakeCollection(name, self.calls)
+
+
+class FakeResponse:
+    text = json.dumps({"vectors": [[1.0, 0.0]], "thresholds": [0.5]})
+
+
+class FakeHttp:
+    def __init__(self):
+        self.urls = []
+
+    async def get(self, url: str):
+        self.urls.append(url)
+        return FakeResponse()
+
+
+@pytest.fixture
+def repo() -> tuple[PBAttemptRepository, FakePB, FakeHttp]:
+    pb, http = FakePB(), FakeHttp()
+    return PBAttemptRepository(pb, http=http), pb, http
+
+
+async def test_get_for_item_loads_one_item_without_cluster_file(repo):
+    repository, pb, http = repo
+
+    attempt = await repository.get_for_item("a1", "i1")
+
+    assert [item.id for item in attempt.quiz.items] == ["i1"]
+    item = attempt.get_item("i1")
+    assert item.choice is not None and item.choice.idx == 2
+    assert attempt.quiz.material_ids == ["m1", "m2"]
+    assert http.urls == []
+    assert all("quizItems_via_quiz" not in c[2].get("expand", "") for c in pb.calls)
+    assert all("fields" in c[2] for c in pb.calls)
+
+
+async def test_item_without_decision_and_foreign_item(repo):
+    repository, _, _ = repo
+
+    attempt = await repository.get_for_item("a1", "i2")
+    assert attempt.get_item("i2").choice is None
+
+    ITEMS.append({**ITEMS[0], "id": "other", "quiz": "q2"})
+    try:
+        with pytest.raises(ValueError):
+            await repository.get_for_item("a1", "other")
+    finally:
+        ITEMS.pop()
+
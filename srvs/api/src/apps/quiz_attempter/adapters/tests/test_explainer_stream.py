@@ -0,0 +1,94 @@
+import asyncio
+import contextlib
+
+import pytest
+from pydantic_ai import Agent
+from pydantic_ai.models.function import FunctionModel
+
+from src.apps.quiz_attempter.adapters.out import AIGrokExplainer
+from src.apps.quiz_attempter.adapters.out.explainers import ai_grok_explainer
+from src.apps.quiz_attempter.domain.models import Attempt
+from src.apps.quiz_attempter.domain.refs import (
+    MessageMetadataRef,
+    MessageRef,
+    MessageRoleRef,
+    MessageStatusRef,
+    QuizItemRef,
+    QuizRef,
+)
+
+ITEM = QuizItemRef(id="i1", question="What is ATP?", answers=["Energy carrier"])
+TOKENS = [f"tok{n} " for n in range(40)]
+
+
+class StubLangfuse:
+    @contextlib.contextmanager
+    def start_as_current_span(self, name: str):
+        yield None
+
+
+async def stream_tokens(messages, info):
+    for token in TOKENS:
+        await asyncio.sleep(0.002)
+        yield token
+
+
+@pytest.fixture
+def explainer(monkeypatch):
+    monkeypatch.setattr(ai_grok_explainer.settings, "explainer_stream_window", 0.02)
+    explainer = AIGrokExplainer.__new__(AIGrokExplainer)
+    explainer._lf = StubLangfuse()
+    explainer._ai = Agent(output_type=str)
+    with explainer._ai.override(model=FunctionModel(stream_function=stream_tokens)):
+        yield explainer
+
+
+async def collect(explainer: AIGrokExplainer, delay: float = 0) -> list[MessageRef]:
+    attempt = Attempt.__new__(Attempt)
+    attempt.id, attempt.user_id, attempt.message_history = "a1", "u1", []
+    attempt.quiz = QuizRef(
+        id="q1", items=[ITEM], query="", material_ids=[], material_content=""
+    )
+    ai_msg = MessageRef(
+        id="m1",
+        attempt_id="a1",
+        item_id="i1",
+        content="",
+        role=MessageRoleRef.AI,
+        status=MessageStatusRef.STREAMING,
+        metadata=MessageMetadataRef(),
+    )
+    messages = []
+    async for m in explainer.explain(
+        "Why?", attempt, ITEM, ai_msg, "k", [], None, chunks=[]
+    ):
+        messages.append(m)
+        await asyncio.sleep(delay)  # a slow client
+    return messages
+
+
+async def test_deltas_are_coalesced_and_final_has_full_text(explainer):
+    messages = await collect(explainer)
+    # The first token is not held back by the window
+    assert messages[0].content == TOKENS[0]
+
+    *chunks, final = messages
+    assert final.status == MessageStatusRef.FINAL
+    assert final.content == "".join(TOKENS)
+    # Each chunk is new text only, several tokens per frame
+    assert "".join(c.content for c in chunks) == final.content
+    assert all(c.status == MessageStatusRef.STREAMING for c in chunks)
+    assert 1 <= len(chunks) < len(TOKENS) / 2
+
+
+async def test_backlog_is_capped_per_frame(explainer, monkeypatch):
+    monkeypatch.setattr(ai_grok_explainer.settings, "explainer_stream_window", 0)
+    monkeypatch.setattr(ai_grok_explainer.settings, "explainer_stream_max_chars", 12)
+
+    *chunks, final = await collect(explainer, delay=0.01)
+
+    assert final.content == "".join(TOKENS)
+    assert "".join(c.content for c in chunks) == final.content
+    # Piled-up deltas are merged, but a frame stops growing past the cap
+    assert max(len(c.content) for c in chunks) > len(TOKENS[-1])
+    assert all(len(c.content) < 12 + len(TOKENS[-1]) for c in chunks)
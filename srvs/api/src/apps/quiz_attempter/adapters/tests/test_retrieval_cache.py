@@ -0,0 +1,170 @@
+import fakeredis
+import numpy as np
+import pytest
+
+from src.apps.material_owner.domain.models import MaterialChunk
+from src.apps.quiz_attempter.adapters.out import AIGrokExplainer, MemoryRetrievalCache
+from src.apps.quiz_attempter.adapters.out.retrieval_cache import (
+    RETRIEVAL_KEY,
+    RedisRetrievalCache,
+)
+from src.apps.quiz_attempter.domain.models import RetrievalKey
+from src.apps.quiz_attempter.domain.refs import QuizItemRef
+from src.apps.user_owner.domain._in import Principal
+from src.apps.user_owner.domain.models import Tariff
+
+USER = Principal(
+    id="u1",
+    remaining=10,
+    used=0,
+    limit=10,
+    storage_usage=0,
+    storage_limit=0,
+    tariff=Tariff.PLUS,
+)
+ITEM = QuizItemRef(id="i1", question="What is ATP?", answers=["Energy carrier"])
+BUNDLED_ITEM = QuizItemRef(
+    id="i2", question="What is ATP?", answers=["Energy carrier"], context_chunk_ids=["c0"]
+)
+
+
+class FakeLLMTools:
+    def __init__(self):
+        self.vectorized = []
+        self.calls = 0
+
+    async def vectorize(self, texts: list[str]):
+        self.calls += 1
+        self.vectorized.extend(texts)
+        # Paraphrases that mention "energy" land next to each other
+        return [
+            np.array(
+                [1.0, 0.0, 0.0] if "energy" in t else [0.0, 1.0, 0.0],
+                dtype=np.float32,
+            )
+            for t in texts
+        ]
+
+
+class FakeMaterialApp:
+    def __init__(self):
+        self.searches = 0
+        self.fetched_vectors = 0
+        # c0 is about "energy", the others are not
+        self.chunks = {
+            f"c{n}": MaterialChunk(
+                id=f"c{n}",
+                idx=n,
+                material_id="m1",
+                title="t",
+                content=f"chunk {n}",
+                vector=[1.0, 0.0, 0.0] if n == 0 else [0.0, 0.0, 1.0],
+            )
+            for n in range(3)
+        }
+
+    async def search(self, cmd) -> list[MaterialChunk]:
+        self.searches += 1  # embedding search + rerank
+        return [self.chunks[i] for i in ("c2", "c0") if i in self.chunks]
+
+    async def get_chunks(
+        self, chunk_ids: list[str], with_vectors: bool = False
+    ) -> list[MaterialChunk]:
+        self.fetched_vectors += with_vectors
+        return [self.chunks[i] for i in chunk_ids if i in self.chunks]
+
+
+@pytest.fixture
+def explainer():
+    llm_tools, material_app = FakeLLMTools(), FakeMaterialApp()
+    cache = MemoryRetrievalCache(ttl=60, similarity=0.95)
+    # retrieve() does not touch the LLM agent; skip building it
+    explainer = AIGrokExplainer.__new__(AIGrokExplainer)
+    explainer._material_app = material_app
+    explainer._llm_tools = llm_tools
+    explainer._retrieval_cache = cache
+    return explainer, llm_tools, material_app, cache
+
+
+async def test_repeated_question_skips_embedding_and_rerank(explainer):
+    explainer, llm_tools, material_app, cache = explainer
+
+    first = await explainer.retrieve("Why energy?", ITEM, ["m2", "m1"], USER)
+    again = await explainer.retrieve("  why ENERGY ", ITEM, ["m1", "m2"], USER)
+
+    assert [c.id for c in again] == [c.id for c in first] == ["c2", "c0"]
+    assert llm_tools.calls == 1
+    assert material_app.searches == 1
+    assert cache.stats()["hits"] == 1
+
+
+async def test_paraphrase_reuses_chunks_after_embedding(explainer):
+    explainer, llm_tools, material_app, cache = explainer
+
+    await explainer.retrieve("Why energy?", ITEM, ["m1"], USER)
+    await explainer.retrieve("explain the energy part", ITEM, ["m1"], USER)
+    await explainer.retrieve("something else", ITEM, ["m1"], USER)
+
+    assert llm_tools.calls == 3
+    assert material_app.searches == 2
+    assert cache.stats()["semantic_hits"] == 1
+    # The cache side embeds the normalised query alone
+    assert "explain the energy part" in llm_tools.vectorized
+
+
+async def test_removed_chunks_and_expiry_are_misses(explainer, monkeypatch):
+    explainer, _, material_app, cache = explainer
+
+    await explainer.retrieve("Why energy?", ITEM, ["m1"], USER)
+    del material_app.chunks["c2"]
+    await explainer.retrieve("Why energy?", ITEM, ["m1"], USER)
+    assert material_app.searches == 2
+
+    key = RetrievalKey.create("u1", "i1", ["m1"], "why energy")
+    now = [1e10]
+    monkeypatch.setattr(
+        "src.apps.quiz_attempter.adapters.out.retrieval_cache.time.time",
+        lambda: now[0],
+    )
+    assert await cache.get(key) is None
+
+
+async def test_first_message_is_served_from_context_bundle(explainer):
+    explainer, llm_tools, material_app, _ = explainer
+
+    chunks = await explainer.retrieve("Explain this question", BUNDLED_ITEM, ["m1"], USER)
+
+    assert [c.id for c in chunks] == ["c0"]
+    assert llm_tools.vectorized == []
+    assert material_app.searches == 0
+
+
+async def test_follow_up_searches_only_outside_the_bundle(explainer):
+    explainer, llm_tools, material_app, _ = explainer
+
+    inside = await explainer.retrieve(
+        "more about energy", BUNDLED_ITEM, ["m1"], USER, follow_up=True
+    )
+    assert [c.id for c in inside] == ["c0"]
+    assert material_app.searches == 0
+
+    outside = await explainer.retrieve(
+        "what about enzymes", BUNDLED_ITEM, ["m1"], USER, follow_up=True
+    )
+    assert [c.id for c in outside] == ["c2", "c0"]
+    assert material_app.searches == 1
+    assert llm_tools.calls == 2
+
+
+async def test_redis_scope_is_trimmed_to_per_scope():
+    redis_client = fakeredis.FakeAsyncRedis()
+    cache = RedisRetrievalCache(
+        redis_client, MemoryRetrievalCache(ttl=60, per_scope=3)
+    )
+
+    for n in range(5):
+        key = RetrievalKey.create("u1", "i1", ["m1"], f"question {n}")
+        await cache.set(key, [1.0, float(n), 0.0], [f"c{n}"])
+
+    fields = await redis_client.hkeys(RETRIEVAL_KEY.format(scope=key.scope))
+    assert sorted(fields) == [b"question 2", b"question 3", b"question 4"]
@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+
+from src.apps.message_owner.domain.models import Message, MessageRole
+from src.apps.quiz_attempter.app.usecases import QuizAttempterAppImpl
+from src.apps.quiz_attempter.domain._in import AskExplainerCmd
+from src.apps.quiz_attempter.domain.errors import NotAttemptOwnerError
+from src.apps.quiz_attempter.domain.models import Attempt
+from src.apps.quiz_attempter.domain.refs import (
+    MessageMetadataRef,
+    MessageRef,
+    MessageRoleRef,
+    MessageStatusRef,
+    QuizItemRef,
+    QuizRef,
+)
+from src.apps.user_owner.domain._in import Principal
+from src.apps.user_owner.domain.models import Tariff
+
+USER = Principal(
+    id="u1",
+    remaining=10,
+    used=0,
+    limit=10,
+    storage_usage=0,
+    storage_limit=0,
+    tariff=Tariff.PLUS,
+)
+
+
+class Attempts:
+    def __init__(self, owner: str):
+        self.owner = owner
+
+    async def get_for_item(self, id: str, item_id: str) -> Attempt:
+        item = QuizItemRef(id=item_id, question="Q?", answers=["A"])
+        quiz = QuizRef(
+            id="q1", items=[item], query="", material_ids=["m1"], material_content=""
+        )
+        return Attempt(id=id, user_id=self.owner, quiz=quiz)
+
+
+class Messages:
+    def __init__(self, both_started: asyncio.Event):
+        self.both_started = both_started
+        self.history_cmds = []
+        self.started = []
+
+    async def start_message(self, cmd) -> Message:
+        self.started.append(cmd)
+        # Completes only if retrieval runs at the same time
+        await asyncio.wait_for(self.both_started.wait(), 1)
+        return Message.create(cmd.attempt_id, MessageRole.AI, cmd.item_id)
+
+    async def get_attempt_history(self, cmd) -> list[Message]:
+        self.history_cmds.append(cmd)
+        return [Message.create(cmd.attempt_id, MessageRole.USER, cmd.item_id)]
+
+    async def finalize_message(self, cmd) -> None: ...
+
+
+class Explainer:
+    def __init__(self, both_started: asyncio.Event):
+        self.both_started = both_started
+        self.chunks = None
+
+    async def retrieve(self, query, item, material_ids, user, follow_up=False):
+        self.both_started.set()
+        return ["chunk"]
+
+    async def explain(self, query, attempt, item, ai_msg, cache_key, material_ids, user, chunks=None):
+        self.chunks = chunks
+        yield MessageRef(
+            id=ai_msg.id,
+            attempt_id=attempt.id,
+            item_id=item.id,
+            content="hi",
+            role=MessageRoleRef.AI,
+            status=MessageStatusRef.STREAMING,
+            metadata=MessageMetadataRef(),
+        )
+
+
+def make_app(owner: str = "u1"):
+    both_started = asyncio.Event()
+    messages, explainer = Messages(both_started), Explainer(both_started)
+    app = QuizAttempterAppImpl(
+        attempt_repository=Attempts(owner),
+        explainer=explainer,
+        message_owner=messages,
+        llm_tools=None,
+        finalizer=None,
+        material_app=None,
+    )
+    return app, messages, explainer
+
+
+CMD = AskExplainerCmd(cache_key="k", query="why?", item_id="i1", attempt_id="a1", user=USER)
+
+
+async def test_pre_stream_steps_run_concurrently():
+    app, messages, explainer = make_app()
+
+    results = [r async for r in app.ask_explainer(CMD)]
+
+    assert [r.text for r in results] == ["hi"]
+    assert explainer.chunks == ["chunk"]
+    assert messages.history_cmds[0].item_id == "i1"
+
+
+async def test_foreign_attempt_creates_no_message():
+    app, messages, _ = make_app(owner="someone-else")
+
+    with pytest.raises(NotAttemptOwnerError):
+        async for _ in app.ask_explainer(CMD):
+            pass
+
+    assert messages.started == []
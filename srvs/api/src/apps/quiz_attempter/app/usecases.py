@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import AsyncGenerator
 
@@ -68,24 +69,39 @@ class QuizAttempterAppImpl(QuizAttempterApp):
         self, cmd: AskExplainerCmd
     ) -> AsyncGenerator[AskExplainerResult, None]:
         logger.info(f"Ask explainer: {cmd.attempt_id}")
-        attempt = await self.attempt_repository.get(cmd.attempt_id)
-        await self.validate_attempt(attempt, cmd.user, with_feedback=False)
+        # History is a read keyed by the command only: start it right away,
+        # it is discarded if the attempt turns out not to be the user's.
+        history_task = asyncio.create_task(self._load_history(cmd))
+        try:
+            attempt = await self.attempt_repository.get_for_item(
+                cmd.attempt_id, cmd.item_id
+            )
+            await self.validate_attempt(attempt, cmd.user, with_feedback=False)
+            item = attempt.get_item(cmd.item_id)
+            material_ids = attempt.quiz.material_ids
+
+            # Usually done by now: it ran alongside the attempt load
+            history = await history_task
+            follow_up = any(
+                m.role == MessageRoleRef.AI and m.content.strip() for m in history
+            )
 
-        ai_message = await self.message_owner.start_message(
-            StartMessageCmd(attempt_id=attempt.id, item_id=cmd.item_id)
-        )
-        ai_message_ref = self._to_message_ref(ai_message)
+            ai_message, chunks = await asyncio.gather(
+                self.message_owner.start_message(
+                    StartMessageCmd(
+                        attempt_id=attempt.id, item_id=cmd.item_id, query=cmd.query
+                    )
+                ),
+                self.explainer.retrieve(
+                    cmd.query, item, material_ids, cmd.user, follow_up=follow_up
+                ),
+            )
+        finally:
+            history_task.cancel()
 
-        history = await self.message_owner.get_attempt_history(
-            GetAttemptHistoryCmd(attempt_id=attempt.id, limit=100)
-        )
-        history = [self._to_message_ref(msg) for msg in history]
-        history = self._trim_history(history, cmd.item_id)
+        ai_message_ref = self._to_message_ref(ai_message)
         attempt.set_history(history)
 
-        item = attempt.get_item(cmd.item_id)
-        material_ids = attempt.quiz.material_ids
-
         logger.info(f"Explain attempt: {attempt.id} with {len(material_ids)} materials")
         async for chunk in self.explainer.explain(
             cmd.query,
@@ -95,6 +111,7 @@ class QuizAttempterAppImpl(QuizAttempterApp):
             cmd.cache_key,
             material_ids,
             cmd.user,
+            chunks=chunks,
         ):
             logger.debug(f"Message: {len(chunk.content)} chars, id: {chunk.id}")
             status = "chunk" if chunk.status == "streaming" else "done"
@@ -124,10 +141,13 @@ class QuizAttempterAppImpl(QuizAttempterApp):
                 attempt_id=attempt.id, user_id=user.id, quiz_id=attempt.quiz.id
             )
 
-    def _trim_history(
-        self, history: list[MessageRef], item_id: str
-    ) -> list[MessageRef]:
-        return [msg for msg in history if msg.item_id == item_id]
+    async def _load_history(self, cmd: AskExplainerCmd) -> list[MessageRef]:
+        history = await self.message_owner.get_attempt_history(
+            GetAttemptHistoryCmd(
+                attempt_id=cmd.attempt_id, item_id=cmd.item_id, limit=100
+            )
+        )
+        return [self._to_message_ref(msg) for msg in history]
 
     def _to_message_ref(self, message: Message) -> MessageRef:
         return MessageRef(
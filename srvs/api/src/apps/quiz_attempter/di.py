@@ -1,17 +1,22 @@
 from langfuse import Langfuse
 from pocketbase import PocketBase
 import httpx
+import redis.asyncio as redis
 
 from src.apps.material_owner.domain._in import MaterialApp
 from src.apps.message_owner.domain._in import MessageOwnerApp
 from src.apps.llm_tools.domain._in import LLMToolsApp
 
+from src.lib.settings import settings
+
 from .adapters.out import (
     PBAttemptRepository,
     AIGrokExplainer,
     AIAttemptFinalizer,
+    MemoryRetrievalCache,
+    RedisRetrievalCache,
 )
-from .domain.out import AttemptRepository, Explainer, AttemptFinalizer
+from .domain.out import AttemptRepository, Explainer, AttemptFinalizer, RetrievalCache
 from .app.usecases import QuizAttempterAppImpl
 
 
@@ -21,9 +26,23 @@ def init_quiz_attempter_deps(
     http: httpx.AsyncClient,
     material_app: MaterialApp,
     llm_tools: LLMToolsApp,
+    redis_client: redis.Redis | None = None,
 ) -> tuple[AttemptRepository, Explainer, AttemptFinalizer]:
     attempt_repository = PBAttemptRepository(admin_pb, http=http)
-    explainer = AIGrokExplainer(lf=lf, material_app=material_app, llm_tools=llm_tools)
+
+    retrieval_cache: RetrievalCache = MemoryRetrievalCache(
+        ttl=settings.explainer_retrieval_cache_ttl,
+        similarity=settings.explainer_retrieval_similarity,
+    )
+    if redis_client is not None:
+        retrieval_cache = RedisRetrievalCache(redis_client, local=retrieval_cache)
+
+    explainer = AIGrokExplainer(
+        lf=lf,
+        material_app=material_app,
+        llm_tools=llm_tools,
+        retrieval_cache=retrieval_cache,
+    )
     finalizer = AIAttemptFinalizer(lf=lf, attempt_repository=attempt_repository)
     return attempt_repository, explainer, finalizer
 
@@ -1,3 +1,5 @@
+import hashlib
+import re
 from dataclasses import dataclass, field
 
 from src.lib.utils import genID
@@ -12,6 +14,36 @@ class Feedback:
     uncovered_topics: list[str] = field(default_factory=list)
 
 
+@dataclass(frozen=True, slots=True, kw_only=True)
+class RetrievalKey:
+    """What explainer retrieval depends on: who asks, about what, over which materials."""
+
+    user_id: str
+    item_id: str
+    material_ids: tuple[str, ...]
+    query: str
+
+    @classmethod
+    def create(cls, user_id: str, item_id: str, material_ids: list[str], query: str):
+        return cls(
+            user_id=user_id,
+            item_id=item_id,
+            material_ids=tuple(sorted(material_ids)),
+            query=normalize_query(query),
+        )
+
+    @property
+    def scope(self) -> str:
+        """Queries in the same scope may share results (semantic match)."""
+        raw = "|".join([self.user_id, self.item_id, *self.material_ids])
+        return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def normalize_query(query: str) -> str:
+    """Case, whitespace and trailing punctuation do not change retrieval."""
+    return re.sub(r"\s+", " ", query).strip().strip("?!.,;: ").lower()
+
+
 @dataclass(slots=True, kw_only=True)
 class Attempt:
     id: str = field(default_factory=genID)
@@ -3,12 +3,13 @@ from typing import Any, AsyncIterable, Protocol
 from src.apps.material_owner.domain.models import MaterialChunk
 from src.apps.user_owner.domain._in import Principal
 
-from .models import Attempt
+from .models import Attempt, RetrievalKey
 from .refs import MessageRef, QuizItemRef
 
 
 class AttemptRepository(Protocol):
     async def get(self, id: str) -> Attempt: ...
+    async def get_for_item(self, id: str, item_id: str) -> Attempt: ...
     async def create(self, attempt: Attempt) -> None: ...
     async def update(self, attempt: Attempt) -> None: ...
 
@@ -17,7 +18,32 @@ class AttemptFinalizer(Protocol):
     async def finalize(self, attempt: Attempt, cache_key: str) -> None: ...
 
 
+class RetrievalCache(Protocol):
+    """
+    Reranked chunk ids of past explainer retrievals. `vector` is the
+    embedding of the normalised user query (RetrievalKey.query).
+    """
+
+    async def get(self, key: RetrievalKey) -> list[str] | None: ...
+    async def get_similar(
+        self, key: RetrievalKey, vector: list[float]
+    ) -> list[str] | None: ...
+    async def set(
+        self, key: RetrievalKey, vector: list[float], chunk_ids: list[str]
+    ) -> None: ...
+    def stats(self) -> dict[str, float]: ...
+
+
 class Explainer(Protocol):
+    async def retrieve(
+        self,
+        query: str,
+        item: QuizItemRef,
+        material_ids: list[str],
+        user: Principal,
+        follow_up: bool = False,
+    ) -> list[MaterialChunk]: ...
+
     def explain(
         self,
         query: str,
@@ -27,4 +53,5 @@ class Explainer(Protocol):
         cache_key: str,
         material_ids: list[str],
         user: Principal,
+        chunks: list[MaterialChunk] | None = None,
     ) -> AsyncIterable[MessageRef]: ...
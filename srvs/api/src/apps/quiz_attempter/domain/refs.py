@@ -41,6 +41,8 @@ class QuizItemRef:
     question: str
     answers: list[str]
     choice: Choice | None = None
+    # Chunks the item was generated from (QuizItem.used_chunks)
+    context_chunk_ids: list[str] = field(default_factory=list)
 
 
 @dataclass(slots=True, kw_only=True)
@@ -50,4 +52,3 @@ class QuizRef:
     query: str
     material_ids: list[str]
     material_content: str
-    cluster_vectors: list[list[float]] = field(default_factory=list)
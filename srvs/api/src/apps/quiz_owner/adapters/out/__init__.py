@@ -1,3 +1,5 @@
+import importlib
+
 from .pb_quiz_repository import PBQuizRepository
 from .ai_quiz_finalizer import (
     AIQuizFinalizer,
@@ -6,9 +8,25 @@ from .ai_quiz_finalizer import (
     QUIZ_FINALIZER_LLM,
 )
 from .meili_quiz_indexer import MeiliQuizIndexer
-from .bertopic_quiz_clusterer import BertopicQuizClusterer
-from .kmeans_quiz_clusterer import KMeansQuizClusterer
 
 from .quiz_generators.ai_grok_generator import (
     AIGrokGenerator,
 )
+
+
+# Clusterers pull in sklearn / bertopic / umap / hdbscan (and through them
+# torch). The API process never clusters, so they are resolved on first access.
+_LAZY_EXPORTS = {
+    "KMeansQuizClusterer": ".kmeans_quiz_clusterer",
+    "BertopicQuizClusterer": ".bertopic_quiz_clusterer",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -5,17 +5,31 @@ from sklearn.feature_extraction.text import CountVectorizer
 from hdbscan import HDBSCAN
 from umap import UMAP
 from bertopic import BERTopic
+from bertopic.backend import BaseEmbedder
 from bertopic.vectorizers import ClassTfidfTransformer
 
 from src.apps.llm_tools.domain._in import LLMToolsApp
+from src.apps.llm_tools.domain.out import Vectorizer
 from src.apps.material_owner.domain._in import MaterialApp, SearchCmd
 from src.apps.user_owner.domain._in import Principal
 
 from ...domain.models import Quiz
+from .cluster_model import cluster_stats
 
 logger = logging.getLogger(__name__)
 
 
+class VectorizerBackend(BaseEmbedder):
+    """Adapts a domain Vectorizer to BERTopic's embedding backend interface."""
+
+    def __init__(self, vectorizer: Vectorizer):
+        super().__init__()
+        self._vectorizer = vectorizer
+
+    def embed(self, documents: list[str], verbose: bool = False) -> np.ndarray:
+        return self._vectorizer.embed(documents)
+
+
 class BertopicQuizClusterer:
     def __init__(
         self,
@@ -116,7 +130,7 @@ class BertopicQuizClusterer:
 
         logger.info(f"Initializing BERTopic for quiz {quiz_id}")
         topic_model = BERTopic(
-            embedding_model=self._llm_tools.vectorizer,
+            embedding_model=VectorizerBackend(self._llm_tools.vectorizer),
             umap_model=umap_model,
             hdbscan_model=hdbscan_model,
             vectorizer_model=None,
@@ -151,26 +165,17 @@ class BertopicQuizClusterer:
                         f"  Topic {topic_id} ({topic_count} docs): {top_5_words}"
                     )
 
-            centers = []
-            thresholds = []
-            unique_topics = [t for t in np.unique(topics) if t != -1]
-
-            for topic_id in unique_topics:
-                topic_mask = topics == topic_id
-                topic_embeddings = embeddings[topic_mask]
-                center = np.mean(topic_embeddings, axis=0)
-                center_normalized = center / np.linalg.norm(center)
-                
-                cosine_similarities = np.dot(topic_embeddings, center_normalized)
-                min_similarity = float(np.min(cosine_similarities))
-                
-                centers.append(center.tolist())
-                thresholds.append(min_similarity)
-                
+            # Outlier topic -1 belongs to no cluster
+            unique_topics, center_matrix, counts, min_similarity = cluster_stats(
+                embeddings, np.asarray(topics)
+            )
+            for topic_id, count, threshold in zip(unique_topics, counts, min_similarity):
                 logger.info(
-                    f"Topic {topic_id}: {np.sum(topic_mask)} docs, threshold={min_similarity:.4f}"
+                    f"Topic {topic_id}: {int(count)} docs, threshold={threshold:.4f}"
                 )
-            
+            centers = center_matrix.tolist()
+            thresholds = min_similarity.tolist()
+
             logger.info(
                 f"Final cluster vectors: {len(centers)} vectors, thresholds: {[f'{t:.4f}' for t in thresholds]} for quiz {quiz_id}"
             )
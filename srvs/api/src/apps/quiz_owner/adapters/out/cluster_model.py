@@ -0,0 +1,41 @@
+"""Per-cluster centers and thresholds shared by the quiz clusterers."""
+
+import numpy as np
+
+# Threshold = lowest member similarity to the center minus this
+THRESHOLD_MARGIN = 0.1
+
+
+def cluster_stats(
+    embeddings: np.ndarray, labels: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Per cluster, in label order: label, member-mean center, member count and
+    lowest cosine similarity of a member to its center. Negative labels
+    (outliers) belong to no cluster.
+
+    Members are grouped by one stable argsort instead of a boolean mask over
+    all embeddings per cluster. Each group is gathered once and reduced while
+    it is in cache: sum, squared row norms and one matvec against the center,
+    so member vectors are never normalised. A one-hot matmul or
+    `np.add.reduceat` over the sorted matrix streams all n x d values from
+    memory per step and measured slower (benchmarks/bench_cluster_stats.py).
+    """
+    labels = np.asarray(labels)
+    members = np.flatnonzero(labels >= 0)
+    clusters, inverse, counts = np.unique(
+        labels[members], return_inverse=True, return_counts=True
+    )
+    order = members[np.argsort(inverse, kind="stable")]
+    bounds = np.concatenate(([0], np.cumsum(counts)))
+
+    centers = np.empty((len(clusters), embeddings.shape[1]), dtype=np.float32)
+    min_similarity = np.empty(len(clusters), dtype=np.float32)
+    for c in range(len(clusters)):
+        block = embeddings[order[bounds[c] : bounds[c + 1]]]
+        center = block.sum(axis=0) / counts[c]
+        norms = np.sqrt(np.einsum("ij,ij->i", block, block))
+        similarity = (block @ center) / np.maximum(norms, 1e-12)
+        min_similarity[c] = similarity.min() / max(np.linalg.norm(center), 1e-12)
+        centers[c] = center
+    return clusters, centers, counts.astype(np.float32), min_similarity
@@ -1,76 +1,155 @@
 import asyncio
 import logging
 import numpy as np
-from sklearn.cluster import MiniBatchKMeans
-from sklearn.decomposition import PCA
-from sklearn.metrics.pairwise import cosine_distances
 
-from src.apps.material_owner.domain._in import MaterialApp, SearchCmd
+from src.apps.material_owner.domain._in import MaterialApp
+from src.apps.material_owner.domain.models import ChunkVectors
 from src.apps.user_owner.domain._in import Principal
+from src.lib.cluster_cache import ClusterCache, cluster_key
+from src.lib.settings import settings
 
 from ...domain.models import Quiz
+from .cluster_model import THRESHOLD_MARGIN, cluster_stats
 
 logger = logging.getLogger(__name__)
 
+# Rows per PCA transform + KMeans predict when assigning a sampled fit
+ASSIGN_BATCH = 4096
+
+
+def stratified_sample(ids: list[str], size: int) -> np.ndarray:
+    """
+    Row indices of about `size` chunks, spread over materials in proportion
+    to their chunk counts and evenly over each material's chunk order (which
+    follows its pages). Chunk ids are `<material_id>-<idx>`.
+    """
+    strata: dict[str, list[tuple[int, int]]] = {}
+    for row, chunk_id in enumerate(ids):
+        material_id, _, idx = chunk_id.rpartition("-")
+        strata.setdefault(material_id, []).append((int(idx) if idx.isdigit() else 0, row))
+
+    picked = []
+    for chunks in strata.values():
+        rows = np.array([row for _, row in sorted(chunks)])
+        take = max(1, round(size * len(rows) / len(ids)))
+        picked.append(rows[np.linspace(0, len(rows) - 1, min(take, len(rows))).astype(int)])
+    return np.sort(np.concatenate(picked))
+
+
+def farthest_point_order(vectors: np.ndarray) -> np.ndarray:
+    """
+    Greedy farthest-point traversal by cosine distance, starting at 0: each
+    next vector is the one farthest from all vectors already placed, so any
+    prefix of the order spreads over the material.
+
+    Keeps the running max similarity to the placed set instead of rescanning
+    it; O(n^2) in NumPy, with one n x n float32 similarity matrix.
+    """
+    n = len(vectors)
+    if n < 2:
+        return np.arange(n)
+
+    vecs = np.asarray(vectors, dtype=np.float32)
+    vecs = vecs / np.maximum(np.linalg.norm(vecs, axis=1, keepdims=True), 1e-12)
+    sims = vecs @ vecs.T
+
+    order = np.empty(n, dtype=np.intp)
+    order[0] = 0
+    # Max similarity = min cosine distance to the placed set; +inf once placed
+    nearest = sims[0].copy()
+    nearest[0] = np.inf
+    for step in range(1, n):
+        nxt = int(np.argmin(nearest))
+        order[step] = nxt
+        np.maximum(nearest, sims[nxt], out=nearest)
+        nearest[nxt] = np.inf
+    return order
+
 
 class KMeansQuizClusterer:
     def __init__(
         self,
         material_app: MaterialApp,
+        cluster_cache: ClusterCache | None = None,
     ):
         self._material_app = material_app
+        self._cluster_cache = cluster_cache
 
     async def cluster(
         self, quiz: Quiz, user: Principal, chunks_per_question: int
     ) -> tuple[list[list[float]], list[float]]:
-        chunks = await self._material_app.search(
-            SearchCmd(
-                user=user,
-                material_ids=[m.id for m in quiz.materials],
-                all_chunks=True,
-            )
-        )
-        logger.info(f"Found {len(chunks)} chunks for quiz {quiz.id}")
+        material_ids = [m.id for m in quiz.materials]
+        if self._cluster_cache is None:
+            return await self._cluster(quiz, user, material_ids)
 
-        chunks_with_vectors = [
-            c
-            for c in chunks
-            if c.vector is not None and c.content and c.content.strip()
-        ]
-        logger.info(
-            f"Found {len(chunks_with_vectors)} chunks with vectors and content for quiz {quiz.id}"
-        )
-
-        if not chunks_with_vectors:
+        key = None
+        try:
+            generations = await self._cluster_cache.generations(material_ids)
+            key = cluster_key(material_ids, generations, quiz.length)
+            cached = await self._cluster_cache.get(key)
+        except Exception as e:
+            logger.warning(f"Cluster cache lookup failed for quiz {quiz.id}: {e}")
+            cached = None
+        if cached is not None:
+            logger.info(f"Reusing {len(cached[0])} cached clusters for quiz {quiz.id}")
+            return cached
+
+        centers, thresholds = await self._cluster(quiz, user, material_ids)
+        # No thresholds: clustering failed and fell back, worth retrying
+        if key is not None and centers and thresholds:
+            try:
+                await self._cluster_cache.set(key, centers, thresholds)
+            except Exception as e:
+                logger.warning(f"Clusters of quiz {quiz.id} not cached: {e}")
+        return centers, thresholds
+
+    async def _cluster(
+        self, quiz: Quiz, user: Principal, material_ids: list[str]
+    ) -> tuple[list[list[float]], list[float]]:
+        chunk_vectors = await self._fetch_vectors(quiz, user, material_ids)
+        embeddings = chunk_vectors.vectors
+        if not len(embeddings):
             logger.warning(
                 f"No valid chunks found for quiz {quiz.id}, returning empty cluster vectors"
             )
             return [], []
 
-        embeddings = np.array([c.vector for c in chunks_with_vectors], dtype=np.float32)
-        n_samples = len(chunks_with_vectors)
-
-        
-
+        n_samples = len(embeddings)
         if n_samples < quiz.length:
             logger.warning(
                 f"Not enough chunks for quiz {quiz.id}: found {n_samples} chunks, "
                 f"but quiz length is {quiz.length}. Using all available vectors."
             )
-            centers = embeddings.tolist()
-            thresholds = [1.0] * n_samples
-            return self._reorder_clusters(centers, thresholds)
+            order = await asyncio.to_thread(farthest_point_order, embeddings)
+            return embeddings[order].tolist(), [1.0] * n_samples
 
         return await asyncio.to_thread(
-            self._run_clustering, quiz.id, quiz.length, embeddings
+            self._run_clustering, quiz.id, quiz.length, embeddings, chunk_vectors.ids
         )
 
+    async def _fetch_vectors(
+        self, quiz: Quiz, user: Principal, material_ids: list[str]
+    ) -> ChunkVectors:
+        chunk_vectors = await self._material_app.get_chunk_vectors(
+            user.id, material_ids
+        )
+        logger.info(
+            f"Found {len(chunk_vectors.ids)} chunks with vectors and content for quiz {quiz.id}"
+        )
+        return chunk_vectors
+
     def _run_clustering(
         self,
         quiz_id: str,
         quiz_length: int,
         embeddings: np.ndarray,
+        ids: list[str] | None = None,
     ) -> tuple[list[list[float]], list[float]]:
+        # sklearn is heavy and only needed here; import lazily so the API
+        # process (which never clusters) does not pay for it at startup.
+        from sklearn.cluster import MiniBatchKMeans
+        from sklearn.decomposition import PCA
+
         n_samples = embeddings.shape[0]
         n_features = embeddings.shape[1]
         n_clusters = min(quiz_length, n_samples)
@@ -79,15 +158,29 @@ class KMeansQuizClusterer:
             f"Starting PCA+KMeans for quiz {quiz_id}: {n_samples} documents, {n_features} embedding dimensions"
         )
 
-        pca_components = min(50, n_samples - 1, n_features)
+        # Large inputs: fit on a stratified sample, then assign every chunk
+        sample = None
+        if ids is not None and n_samples > settings.cluster_sample_threshold:
+            sample = stratified_sample(ids, settings.cluster_sample_size)
+            logger.info(
+                f"Fitting on a stratified sample of {len(sample)}/{n_samples} chunks"
+            )
+        fit_embeddings = embeddings if sample is None else embeddings[sample]
+        n_fit = len(fit_embeddings)
+
+        pca_components = min(50, n_fit - 1, n_features)
         logger.info(f"Configuring PCA: {n_features} → {pca_components} dimensions")
 
-        pca = PCA(n_components=pca_components, random_state=505)
-        reduced_embeddings = pca.fit_transform(embeddings)
+        pca = PCA(
+            n_components=pca_components,
+            random_state=505,
+            svd_solver="auto" if sample is None else "randomized",
+        )
+        reduced_embeddings = pca.fit_transform(fit_embeddings)
 
         logger.info(f"Configuring KMeans: n_clusters={n_clusters}")
 
-        if n_samples > 1000:
+        if n_fit > 1000:
             reassignment_ratio = 0.0
         elif n_samples < 50:
             reassignment_ratio = 0.07
@@ -98,45 +191,35 @@ class KMeansQuizClusterer:
             n_clusters=n_clusters,
             reassignment_ratio=reassignment_ratio,
             random_state=505,
-            batch_size=min(256, n_samples),
+            batch_size=min(256, n_fit),
             n_init=3,
         )
 
         try:
             labels = kmeans.fit_predict(reduced_embeddings)
-
-            unique_clusters = np.unique(labels)
-            logger.info(f"KMeans found {len(unique_clusters)} clusters for quiz {quiz_id}")
-
-            logger.info(f"🔑 Cluster analysis for quiz {quiz_id}:")
-
-            centers = []
-            thresholds = []
-
-            for cluster_id in sorted(unique_clusters):
-                cluster_mask = labels == cluster_id
-                cluster_embeddings = embeddings[cluster_mask]
-                cluster_count = int(np.sum(cluster_mask))
-
-                center = np.mean(cluster_embeddings, axis=0)
-                center_normalized = center / np.linalg.norm(center)
-
-                embeddings_normalized = cluster_embeddings / np.linalg.norm(
-                    cluster_embeddings, axis=1, keepdims=True
+            if sample is not None:
+                labels = np.concatenate(
+                    [
+                        kmeans.predict(pca.transform(embeddings[i : i + ASSIGN_BATCH]))
+                        for i in range(0, n_samples, ASSIGN_BATCH)
+                    ]
                 )
-                cosine_similarities = np.dot(embeddings_normalized, center_normalized)
-
-                min_similarity = float(np.min(cosine_similarities))
-                margin = 0.1
-                threshold = min_similarity - margin
 
-                centers.append(center.tolist())
-                thresholds.append(threshold)
+            clusters, center_matrix, counts, min_similarity = cluster_stats(
+                embeddings, labels
+            )
+            logger.info(f"KMeans found {len(clusters)} clusters for quiz {quiz_id}")
 
+            logger.info(f"🔑 Cluster analysis for quiz {quiz_id}:")
+            for cluster_id, count, min_sim in zip(clusters, counts, min_similarity):
                 logger.info(
-                    f"  Cluster {cluster_id} ({cluster_count} docs): threshold={threshold:.4f} (min={min_similarity:.4f})"
+                    f"  Cluster {cluster_id} ({int(count)} docs): "
+                    f"threshold={min_sim - THRESHOLD_MARGIN:.4f} (min={min_sim:.4f})"
                 )
 
+            centers = center_matrix.tolist()
+            thresholds = (min_similarity - THRESHOLD_MARGIN).tolist()
+
             # Reorder to maximize distance between adjacent clusters
             if n_samples < quiz_length * 4:
                 centers, thresholds = self._reorder_clusters(centers, thresholds)
@@ -157,28 +240,14 @@ class KMeansQuizClusterer:
             return embeddings[:n_vectors].tolist(), []
 
     def _reorder_clusters(
-        self, centers: list[list[float]], thresholds: list[float]
+        self,
+        centers: list[list[float]],
+        thresholds: list[float],
     ) -> tuple[list[list[float]], list[float]]:
-        n = len(centers)
-        if n < 2:
+        if len(centers) < 2:
             return centers, thresholds
 
-        # Calculate distance matrix
-        dists = cosine_distances(np.array(centers))
-
-        # Greedy farthest traversal
-        path = [0]
-        visited = {0}
-
-        for _ in range(n - 1):
-            current = path[-1]
-            # Find unvisited node with max distance
-            candidates = [i for i in range(n) if i not in visited]
-            # dists[current, i] is the distance
-            next_idx = max(candidates, key=lambda i: dists[current, i])
-            path.append(next_idx)
-            visited.add(next_idx)
-
+        path = farthest_point_order(np.array(centers, dtype=np.float32)).tolist()
         logger.info(f"Reordered clusters for separation: {path}")
 
         return [centers[i] for i in path], [thresholds[i] for i in path]
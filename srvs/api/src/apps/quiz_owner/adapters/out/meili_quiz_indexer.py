@@ -6,9 +6,13 @@ from langfuse import Langfuse
 from meilisearch_python_sdk import AsyncClient
 from meilisearch_python_sdk.models.search import Hybrid
 from meilisearch_python_sdk.models.settings import Embedders, OpenAiEmbedder
+import redis.asyncio as redis
 
 from src.lib.config import LLMS
+from src.lib.index_settings import apply_index_settings
+from src.lib.meili_tasks import MeiliTaskTracker
 from src.lib.settings import settings
+from src.lib.utils import replace_markers
 
 from src.apps.llm_tools.domain._in import LLMToolsApp
 
@@ -96,12 +100,14 @@ class MeiliQuizIndexer(QuizIndexer):
         llm_tools: LLMToolsApp,
         meili: AsyncClient,
         quiz_repository: QuizRepository,
+        tasks: MeiliTaskTracker | None = None,
     ):
         self._lf = lf
         self.llm_tools = llm_tools
         self.meili = meili
         self.quiz_index = meili.index(EMBEDDER_NAME)
         self.quiz_repository = quiz_repository
+        self.tasks = tasks or MeiliTaskTracker(meili)
 
     @classmethod
     async def ainit(
@@ -110,14 +116,27 @@ class MeiliQuizIndexer(QuizIndexer):
         llm_tools: LLMToolsApp,
         meili: AsyncClient,
         quiz_repository: QuizRepository,
+        redis_client: redis.Redis | None = None,
+        tasks: MeiliTaskTracker | None = None,
     ) -> "MeiliQuizIndexer":
-        instance = cls(lf, llm_tools, meili, quiz_repository)
+        instance = cls(lf, llm_tools, meili, quiz_repository, tasks)
 
-        await instance.quiz_index.update_embedders(
-            Embedders(embedders=meiliEmbeddings)  # pyright: ignore[reportArgumentType]
-        )
-        await instance.quiz_index.update_filterable_attributes(
-            FILTERABLE_ATTRIBUTES  # pyright: ignore[reportArgumentType]
+        async def apply() -> None:
+            await instance.quiz_index.update_embedders(
+                Embedders(embedders=meiliEmbeddings)  # pyright: ignore[reportArgumentType]
+            )
+            await instance.quiz_index.update_filterable_attributes(
+                FILTERABLE_ATTRIBUTES  # pyright: ignore[reportArgumentType]
+            )
+
+        await apply_index_settings(
+            redis_client,
+            EMBEDDER_NAME,
+            {
+                "embedders": meiliEmbeddings,
+                "filterableAttributes": FILTERABLE_ATTRIBUTES,
+            },
+            apply,
         )
 
         return instance
@@ -139,11 +158,7 @@ class MeiliQuizIndexer(QuizIndexer):
         logging.info(f"Created task for document")
 
         # First: Wait for all tasks to complete and get updated task objects
-        task = await self.meili.wait_for_task(
-            task.task_uid,
-            timeout_in_ms=int(60 * 1000),  # 30 seconds
-            interval_in_ms=int(0.5 * 1000),  # 0.5 seconds
-        )
+        task = await self.tasks.wait(task.task_uid, timeout=60)
 
         logging.info(f"Processing task")
 
@@ -208,11 +223,7 @@ class MeiliQuizIndexer(QuizIndexer):
         task = await self.quiz_index.delete_documents_by_filter(
             f"materialId IN [{','.join(material_ids)}]"
         )
-        task = await self.meili.wait_for_task(
-            task.task_uid,
-            timeout_in_ms=int(30 * 1000),
-            interval_in_ms=int(0.5 * 1000),
-        )
+        task = await self.tasks.wait(task.task_uid, timeout=30)
         if task.status == "failed":
             logging.error(f"Failed to delete material: {task}")
             # raise ValueError(f"Failed to delete material: {task}")
@@ -247,11 +258,14 @@ class MeiliQuizIndexer(QuizIndexer):
         return camel_case
 
     def _fill_template(self, doc: Doc):
-        return (
-            EMBEDDER_TEMPLATE.replace("{{doc.title}}", doc.title)
-            .replace("{{doc.summary}}", doc.summary)
-            .replace("{{doc.tags}}", ", ".join(doc.tags))
-            .replace("{{doc.category}}", doc.category)
-            .replace("{{doc.difficulty}}", doc.difficulty)
-            .replace("{{doc.query}}", doc.query)
+        return replace_markers(
+            EMBEDDER_TEMPLATE,
+            {
+                "{{doc.title}}": doc.title,
+                "{{doc.summary}}": doc.summary,
+                "{{doc.tags}}": ", ".join(doc.tags),
+                "{{doc.category}}": doc.category,
+                "{{doc.difficulty}}": doc.difficulty,
+                "{{doc.query}}": doc.query,
+            },
         )
@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+
+import fakeredis
+import numpy as np
+
+from src.apps.material_owner.domain.models import ChunkVectors
+from src.apps.quiz_owner.adapters.out.kmeans_quiz_clusterer import (
+    KMeansQuizClusterer,
+)
+from src.apps.quiz_owner.domain.models import Quiz, QuizDifficulty
+from src.apps.quiz_owner.domain.refs import MaterialRef
+from src.lib.cluster_cache import RedisClusterCache
+
+
+class FakeMaterialApp:
+    def __init__(self):
+        self.searches = 0
+
+    async def get_chunk_vectors(self, user_id, material_ids):
+        self.searches += 1
+        return ChunkVectors(
+            ids=[f"c{i}" for i in range(4)], vectors=np.eye(4, dtype=np.float32)
+        )
+
+
+def quiz(length: int) -> Quiz:
+    return Quiz(
+        author_id="u1",
+        title="q",
+        query="",
+        length=length,
+        difficulty=QuizDifficulty.INTERMEDIATE,
+        materials=[MaterialRef(id="m1", text="", filename="f", is_book=False)],
+    )
+
+
+async def test_repeat_start_skips_clustering_until_material_changes():
+    material_app = FakeMaterialApp()
+    cache = RedisClusterCache(fakeredis.FakeAsyncRedis())
+    clusterer = KMeansQuizClusterer(material_app=material_app, cluster_cache=cache)
+    user = SimpleNamespace(id="u1")
+
+    first = await clusterer.cluster(quiz(10), user, 1)
+    again = await clusterer.cluster(quiz(10), user, 1)
+    assert again == first
+    assert material_app.searches == 1
+
+    await cache.invalidate("m1")
+    await clusterer.cluster(quiz(10), user, 1)
+    assert material_app.searches == 2
@@ -0,0 +1,32 @@
+import numpy as np
+
+from src.apps.quiz_owner.adapters.out.kmeans_quiz_clusterer import (
+    farthest_point_order,
+)
+
+
+def naive_order(vectors: np.ndarray) -> list[int]:
+    vecs = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    dist = 1.0 - vecs @ vecs.T
+    path = [0]
+    while len(path) < len(vecs):
+        rest = [i for i in range(len(vecs)) if i not in path]
+        path.append(max(rest, key=lambda i: min(dist[p, i] for p in path)))
+    return path
+
+
+def test_matches_naive_farthest_point_traversal():
+    vectors = np.random.default_rng(1).standard_normal((60, 16)).astype(np.float32)
+
+    assert farthest_point_order(vectors).tolist() == naive_order(vectors)
+
+
+def test_spreads_prefix_and_handles_tiny_inputs():
+    # Two tight groups: the second center must come from the other group
+    a = np.array([[1.0, 0.0], [0.99, 0.01], [0.98, 0.02]])
+    b = np.array([[0.0, 1.0], [0.01, 0.99]])
+    order = farthest_point_order(np.vstack([a, b]))
+    assert order[1] in (3, 4)
+
+    assert farthest_point_order(np.zeros((0, 4))).tolist() == []
+    assert farthest_point_order(np.ones((1, 4))).tolist() == [0]
@@ -0,0 +1,45 @@
+import numpy as np
+
+from src.apps.quiz_owner.adapters.out import kmeans_quiz_clusterer
+from src.apps.quiz_owner.adapters.out.cluster_model import cluster_stats
+from src.apps.quiz_owner.adapters.out.kmeans_quiz_clusterer import (
+    KMeansQuizClusterer,
+    stratified_sample,
+)
+from src.lib.settings import settings
+
+
+def test_sample_spreads_over_materials_and_chunk_order():
+    ids = [f"big-{i}" for i in range(300)] + [f"small-{i}" for i in range(100)]
+
+    sample = stratified_sample(ids, 40)
+
+    picked = [ids[i] for i in sample]
+    big = [int(i.split("-")[1]) for i in picked if i.startswith("big")]
+    assert len(big) == 30 and len(picked) - len(big) == 10
+    assert big[0] == 0 and big[-1] == 299
+
+
+def test_sampled_fit_assigns_every_chunk(monkeypatch):
+    monkeypatch.setattr(settings, "cluster_sample_threshold", 100)
+    monkeypatch.setattr(settings, "cluster_sample_size", 60)
+    rng = np.random.default_rng(0)
+    embeddings = (
+        np.repeat(np.eye(8)[:4], 100, axis=0) + rng.normal(scale=0.05, size=(400, 8))
+    ).astype(np.float32)
+    ids = [f"m1-{i}" for i in range(400)]
+
+    labelled = []
+
+    def spy_stats(vectors, labels):
+        labelled.append(len(labels))
+        return cluster_stats(vectors, labels)
+
+    monkeypatch.setattr(kmeans_quiz_clusterer, "cluster_stats", spy_stats)
+    centers, thresholds = KMeansQuizClusterer(
+        material_app=None
+    )._run_clustering("q1", 4, embeddings, ids)
+
+    assert len(centers) == len(thresholds) == 4
+    assert labelled == [400]
+    assert min(thresholds) > 0.5
@@ -0,0 +1,30 @@
+import numpy as np
+
+from src.apps.quiz_owner.adapters.out.cluster_model import cluster_stats
+
+
+def test_matches_per_cluster_loop_and_skips_outliers():
+    rng = np.random.default_rng(0)
+    embeddings = rng.standard_normal((200, 16)).astype(np.float32)
+    labels = rng.integers(-1, 5, 200)
+
+    clusters, centers, counts, min_similarity = cluster_stats(embeddings, labels)
+
+    assert clusters.tolist() == [0, 1, 2, 3, 4]
+    assert counts.sum() == (labels >= 0).sum()
+    for c in clusters:
+        members = embeddings[labels == c]
+        center = members.mean(axis=0)
+        cosine = members @ center / (
+            np.linalg.norm(members, axis=1) * np.linalg.norm(center)
+        )
+        assert np.allclose(centers[c], center, atol=1e-5)
+        assert np.isclose(min_similarity[c], cosine.min(), atol=1e-5)
+
+
+def test_no_clusters():
+    clusters, centers, counts, _ = cluster_stats(
+        np.ones((3, 4), dtype=np.float32), np.array([-1, -1, -1])
+    )
+    assert len(clusters) == len(counts) == 0
+    assert centers.shape == (0, 4)
@@ -0,0 +1,31 @@
+import subprocess
+import sys
+
+HEAVY = ("sklearn", "bertopic", "umap", "hdbscan", "torch")
+
+
+def _loaded_after(code: str) -> set[str]:
+    probe = f"{code}\nimport sys\nprint(','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    out = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+    )
+    return {m for m in out.stdout.strip().split(",") if m}
+
+
+def test_quiz_di_does_not_import_ml_stack():
+    assert _loaded_after("import src.apps.quiz_owner.di") == set()
+
+
+def test_llm_tools_di_does_not_import_bertopic():
+    assert _loaded_after("import src.apps.llm_tools.di") == set()
+
+
+def test_clusterers_resolve_lazily():
+    loaded = _loaded_after(
+        "from src.apps.quiz_owner.adapters.out import KMeansQuizClusterer"
+    )
+    assert loaded == set()
+
+    from src.apps.quiz_owner.adapters import out
+
+    assert out.KMeansQuizClusterer.__name__ == "KMeansQuizClusterer"
@@ -8,6 +8,7 @@ from src.apps.material_owner.domain._in import MaterialApp, SearchCmd
 from src.apps.material_owner.domain.models import MaterialChunk, SearchType
 from src.apps.user_owner.domain._in import Principal
 from src.lib.distributed_lock import DistributedLock
+from src.lib.progress_bus import ProgressBus, ProgressKind, publish_progress
 
 from ..domain._in import GenMode, GenerateCmd, QuizGenerator
 from ..domain.errors import NotQuizOwnerError
@@ -94,14 +95,17 @@ class QuizGeneratorImpl(QuizGenerator):
         material_app: MaterialApp,
         patch_generator: PatchGenerator,
         redis_client: redis.Redis,
+        progress_bus: ProgressBus | None = None,
     ):
         self._quiz_repository = quiz_repository
         self._quiz_indexer = quiz_indexer
         self._material_app = material_app
         self._patch_generator = patch_generator
-        self._lock = DistributedLock(redis_client, lock_timeout=300)  # 5 min timeout
+        self._progress_bus = progress_bus
+        # 30 s lease, renewed while the phase runs
+        self._lock = DistributedLock(redis_client, lock_timeout=30)
 
-    async def generate(self, cmd: GenerateCmd) -> None:
+    async def generate(self, cmd: GenerateCmd) -> int:
         ### эта функция отвечает за генерацию одного патча
         ### используется distributed lock чтобы предотвратить race conditions
         ### при параллельных Continue запросах
@@ -123,7 +127,9 @@ class QuizGeneratorImpl(QuizGenerator):
                 await self._quiz_repository.update(quiz)
 
             to_generate = (
-                PATCH_LIMIT + HOLDOUT if cmd.mode == GenMode.Start else PATCH_LIMIT
+                PATCH_LIMIT + HOLDOUT
+                if cmd.mode == GenMode.Start
+                else PATCH_LIMIT * max(1, cmd.patches)
             )
 
             items_to_generate = quiz.generate_patch(to_generate)
@@ -145,7 +151,7 @@ class QuizGeneratorImpl(QuizGenerator):
         generation_tasks = []
         for idx, item in enumerate(items_to_generate):
             generation_tasks.append(
-                self._run_generation_task(quiz, item, cmd.user, cmd.cache_key)
+                self._generate_item(quiz, item, cmd.user, cmd.cache_key)
             )
 
         results = await asyncio.gather(*generation_tasks)
@@ -247,6 +253,41 @@ class QuizGeneratorImpl(QuizGenerator):
 
             logger.info(f"Generation completed for quiz {cmd.quiz_id}")
 
+        return len(items_to_generate)
+
+    async def _generate_item(
+        self, quiz: Quiz, item: QuizItem, user: Principal, cache_key: str
+    ) -> tuple[
+        tuple[str, list[QuizItemVariant], str] | None,
+        tuple[list[dict], list[str]] | None,
+    ]:
+        result = await self._run_generation_task(quiz, item, user, cache_key)
+        # Pushed to the user's pages right away; the patch is saved to
+        # PocketBase once all of its items are done
+        if result[0] is not None:
+            await publish_progress(
+                self._progress_bus,
+                user.id,
+                ProgressKind.ITEM_READY,
+                {
+                    "id": item.id,
+                    "quiz": quiz.id,
+                    "order": item.order,
+                    "status": item.status,
+                    "question": item.question,
+                    "hint": item.hint,
+                    "answers": [
+                        {
+                            "content": v.content,
+                            "explanation": v.explanation,
+                            "correct": v.is_correct,
+                        }
+                        for v in item.variants
+                    ],
+                },
+            )
+        return result
+
     async def _run_generation_task(
         self, quiz: Quiz, item: QuizItem, user: Principal, cache_key: str
     ) -> tuple[
@@ -293,56 +334,57 @@ class QuizGeneratorImpl(QuizGenerator):
             ]
 
             if len(used_sub_chunks) > 0:
-                used_chunk_to_pages: dict[str, set[int]] = {}
-                for sc in used_sub_chunks:
-                    if sc.chunk_id not in used_chunk_to_pages:
-                        used_chunk_to_pages[sc.chunk_id] = set()
-                    used_chunk_to_pages[sc.chunk_id].add(sc.page)
-
-                used_chunk_ids = list(used_chunk_to_pages.keys())
-
-                chunks_info = await self._material_app.get_chunks_info(used_chunk_ids)
-
-                for info in chunks_info:
-                    chunk_id = info.get("id", "")
-                    if chunk_id in used_chunk_to_pages:
-                        info["pages"] = sorted(used_chunk_to_pages[chunk_id])
-
-                await self._material_app.mark_chunks_as_used(used_chunk_ids)
-                used_chunks_data = (chunks_info, used_chunk_ids)
+                used_chunks_data = self._context_bundle(used_sub_chunks)
+                await self._material_app.mark_chunks_as_used(
+                    used_chunks_data[1], user_id=user.id
+                )
                 logger.info(
-                    f"Marked {len(used_chunk_ids)} chunks as used "
+                    f"Marked {len(used_chunks_data[1])} chunks as used "
                     f"(LLM selected {len(used_sub_chunks)} sub-chunks from {len(sub_chunks)} total). "
-                    f"Chunks info: {chunks_info}"
+                    f"Chunks info: {used_chunks_data[0]}"
                 )
             else:
                 logger.warning(
                     f"LLM returned used_chunk_indices {dto.used_chunk_indices} but no valid sub-chunks found"
                 )
         elif len(sub_chunks) > 0:
-            chunk_to_pages: dict[str, set[int]] = {}
-            for sc in sub_chunks:
-                if sc.chunk_id not in chunk_to_pages:
-                    chunk_to_pages[sc.chunk_id] = set()
-                chunk_to_pages[sc.chunk_id].add(sc.page)
-
-            all_chunk_ids = list(chunk_to_pages.keys())
-            chunks_info = await self._material_app.get_chunks_info(all_chunk_ids)
-
-            for info in chunks_info:
-                chunk_id = info.get("id", "")
-                if chunk_id in chunk_to_pages:
-                    info["pages"] = sorted(chunk_to_pages[chunk_id])
-
-            await self._material_app.mark_chunks_as_used(all_chunk_ids)
-            used_chunks_data = (chunks_info, all_chunk_ids)
+            used_chunks_data = self._context_bundle(sub_chunks)
+            await self._material_app.mark_chunks_as_used(
+                used_chunks_data[1], user_id=user.id
+            )
             logger.warning(
-                f"LLM did not return used_chunk_indices, marking all {len(all_chunk_ids)} chunks as used. "
-                f"Chunks info: {chunks_info}"
+                f"LLM did not return used_chunk_indices, marking all {len(used_chunks_data[1])} chunks as used. "
+                f"Chunks info: {used_chunks_data[0]}"
             )
 
         return generated_data, used_chunks_data
 
+    def _context_bundle(
+        self, used_sub_chunks: list[SubChunk]
+    ) -> tuple[list[dict], list[str]]:
+        """
+        Explainer context for the item: the chunks the question was written
+        from, with only the pages actually used. Saved as QuizItem.used_chunks,
+        so the explainer can answer the first message without a search.
+        """
+        # Sub-chunks carry everything needed: no get_chunks_info round trip
+        bundle: dict[str, dict] = {}
+        for sc in used_sub_chunks:
+            info = bundle.setdefault(
+                sc.chunk_id,
+                {
+                    "id": sc.chunk_id,
+                    "materialId": sc.material_id,
+                    "title": sc.title,
+                    "pages": set(),
+                },
+            )
+            info["pages"].add(sc.page)
+
+        for info in bundle.values():
+            info["pages"] = sorted(info["pages"])
+        return list(bundle.values()), list(bundle)
+
     async def _relevant_chunks(
         self, quiz: Quiz, item: QuizItem, user: Principal
     ) -> list[MaterialChunk]:
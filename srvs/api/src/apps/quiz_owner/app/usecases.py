@@ -1,5 +1,7 @@
 import redis.asyncio as redis
 
+from src.lib.progress_bus import ProgressBus, ProgressKind, publish_progress
+
 from src.apps.llm_tools.domain._in import LLMToolsApp
 from src.apps.material_owner.domain._in import MaterialApp
 
@@ -34,11 +36,13 @@ class QuizAppImpl(QuizApp):
         quiz_preprocessor: QuizPreprocessor,
         quiz_clusterer: QuizClusterer,
         redis_client: redis.Redis,
+        progress_bus: ProgressBus | None = None,
     ):
         self._quiz_repository = quiz_repository
         self._quiz_indexer = quiz_indexer
         self._finalizer = finalizer
         self._material = material
+        self._progress_bus = progress_bus
 
         self._quiz_generator = QuizGeneratorImpl(
             quiz_repository=quiz_repository,
@@ -46,6 +50,7 @@ class QuizAppImpl(QuizApp):
             material_app=material,
             patch_generator=patch_generator,
             redis_client=redis_client,
+            progress_bus=progress_bus,
         )
         self._quiz_starter = QuizStarterImpl(
             quiz_repository=quiz_repository,
@@ -60,9 +65,9 @@ class QuizAppImpl(QuizApp):
         await self._quiz_starter.start(cmd)
         await self._quiz_generator.generate(cmd)
 
-    async def generate(self, cmd: GenerateCmd) -> None:
+    async def generate(self, cmd: GenerateCmd) -> int:
         try:
-            await self._quiz_generator.generate(cmd)
+            return await self._quiz_generator.generate(cmd)
         except NoItemsReadyForGenerationError:
             if cmd.mode == GenMode.Continue:
                 await self.finalize(
@@ -72,6 +77,7 @@ class QuizAppImpl(QuizApp):
                         user=cmd.user,
                     )
                 )
+            return 0
 
     async def finalize(self, cmd: FinalizeQuizCmd) -> None:
         quiz = await self._quiz_repository.get(cmd.quiz_id)
@@ -81,14 +87,23 @@ class QuizAppImpl(QuizApp):
         quiz.to_answered()
         await self._quiz_repository.update(quiz)
         await self._finalizer.finalize(quiz, cmd.cache_key)
+        await publish_progress(
+            self._progress_bus,
+            cmd.user.id,
+            ProgressKind.QUIZ_FINALIZED,
+            {"quiz": quiz.id, "status": quiz.status},
+        )
 
         await self._quiz_indexer.index(quiz)
 
-    async def mark_chunks_as_used(self, chunk_ids: list[str]) -> None:
+    async def mark_chunks_as_used(
+        self, chunk_ids: list[str], user_id: str | None = None
+    ) -> None:
         """
         Отмечает чанки материалов как использованные.
 
         Args:
             chunk_ids: Список ID чанков для пометки
+            user_id: Владелец материалов; без него покрытие не обновляется
         """
-        await self._material.mark_chunks_as_used(chunk_ids)
+        await self._material.mark_chunks_as_used(chunk_ids, user_id=user_id)
@@ -6,6 +6,10 @@ import httpx
 from pydantic_ai.providers.openai import OpenAIProvider
 import redis.asyncio as redis
 
+from src.lib.cluster_cache import ClusterCache
+from src.lib.meili_tasks import MeiliTaskTracker
+from src.lib.progress_bus import ProgressBus
+
 from src.apps.material_owner.domain._in import MaterialApp
 from src.apps.llm_tools.domain._in import LLMToolsApp
 
@@ -15,7 +19,6 @@ from .adapters.out import (
     AIQuizFinalizer,
     MeiliQuizIndexer,
     KMeansQuizClusterer,
-    BertopicQuizClusterer,
 )
 from .adapters.out.quiz_preprocesser import QuizPreprocessor
 from .domain.out import (
@@ -36,11 +39,16 @@ async def init_quiz_deps(
     llm_tools: LLMToolsApp,
     llm_provider: OpenAIProvider,
     material_app: MaterialApp,
+    redis_client: redis.Redis | None = None,
+    meili_tasks: MeiliTaskTracker | None = None,
+    cluster_cache: ClusterCache | None = None,
 ) -> tuple[QuizRepository, PatchGenerator, QuizFinalizer, QuizIndexer, QuizPreprocessor, QuizClusterer]:
     quiz_repository = PBQuizRepository(admin_pb, http=http)
     patch_generator = AIGrokGenerator(lf=lf, provider=llm_provider)
     quiz_preprocessor = QuizPreprocessor(lf=lf, provider=llm_provider)
-    quiz_clusterer = KMeansQuizClusterer( material_app=material_app)
+    quiz_clusterer = KMeansQuizClusterer(
+        material_app=material_app, cluster_cache=cluster_cache
+    )
     finalizer = AIQuizFinalizer(
         lf=lf,
         quiz_repository=quiz_repository,
@@ -50,6 +58,8 @@ async def init_quiz_deps(
         llm_tools=llm_tools,
         meili=meili,
         quiz_repository=quiz_repository,
+        redis_client=redis_client,
+        tasks=meili_tasks,
     )
     return quiz_repository, patch_generator, finalizer, quiz_indexer, quiz_preprocessor, quiz_clusterer
 
@@ -64,6 +74,7 @@ def init_quiz_app(
     quiz_preprocessor: QuizPreprocessor,
     quiz_clusterer: QuizClusterer,
     redis_client: redis.Redis,
+    progress_bus: ProgressBus | None = None,
 ) -> QuizAppImpl:
     return QuizAppImpl(
         quiz_repository=quiz_repository,
@@ -75,4 +86,5 @@ def init_quiz_app(
         quiz_preprocessor=quiz_preprocessor,
         quiz_clusterer=quiz_clusterer,
         redis_client=redis_client,
+        progress_bus=progress_bus,
     )
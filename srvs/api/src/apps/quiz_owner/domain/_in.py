@@ -24,6 +24,8 @@ class GenerateCmd:
     quiz_id: str
     mode: GenMode
     user: Principal
+    # Continue: number of patches requested at once (coalesced PATCHes)
+    patches: int = 1
 
 
 class QuizStarter(Protocol):
@@ -31,7 +33,8 @@ class QuizStarter(Protocol):
 
 
 class QuizGenerator(Protocol):
-    async def generate(self, cmd: GenerateCmd) -> None: ...
+    # Returns the number of items reserved for generation
+    async def generate(self, cmd: GenerateCmd) -> int: ...
 
 
 class QuizFinalizer(Protocol):
@@ -39,4 +42,6 @@ class QuizFinalizer(Protocol):
 
 
 class QuizApp(QuizStarter, QuizGenerator, QuizFinalizer):
-    async def mark_chunks_as_used(self, chunk_ids: list[str]) -> None: ...
+    async def mark_chunks_as_used(
+        self, chunk_ids: list[str], user_id: str | None = None
+    ) -> None: ...
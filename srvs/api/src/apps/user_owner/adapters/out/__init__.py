@@ -1,2 +1,4 @@
 from .pb_user_verifier import PBUserVerifier
 from .pb_user_repository import PBUserRepository
+from .principal_cache import MemoryPrincipalCache, RedisPrincipalCache
+from .usage_meter import RedisUsageMeter
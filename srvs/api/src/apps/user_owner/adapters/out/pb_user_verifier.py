@@ -1,6 +1,6 @@
-from pocketbase import PocketBase
+import httpx
 
-from src.lib.settings import settings
+from src.lib.http_pool import PooledPocketBase
 
 from ...domain.out import UserVerifier, UserRepository
 from ...domain.errors import NoTokenError, ForbiddenError
@@ -8,14 +8,16 @@ from ...domain.models import User
 
 
 class PBUserVerifier(UserVerifier):
-    def __init__(self, user_repository: UserRepository):
+    def __init__(self, user_repository: UserRepository, http: httpx.AsyncClient):
         self.user_repository = user_repository
+        # Shared pool for all user-token calls; auth state is per request
+        self.http = http
 
     async def verify(self, token: str | None = None, need_admin: bool = False) -> User:
         if not token:
             raise NoTokenError()
 
-        pb = PocketBase(settings.pb_url)
+        pb = PooledPocketBase(self.http)
         pb._inners.auth.set_user({"token": token, "record": {}})
 
         try:
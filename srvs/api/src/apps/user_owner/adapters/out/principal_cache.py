@@ -0,0 +1,206 @@
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+
+import redis.asyncio as redis
+
+from ...domain._in import Principal
+from ...domain.models import Tariff
+from ...domain.out import PrincipalCache
+
+logger = logging.getLogger(__name__)
+
+PRINCIPAL_KEY = "quizbee:principal:{token_hash}"
+USER_TOKENS_KEY = "quizbee:principal:user:{user_id}"
+# Invalidated user ids, so every process drops its local tier entries
+INVALIDATE_CHANNEL = "quizbee:principal:invalidate"
+
+
+def token_hash(token: str) -> str:
+    """Tokens are never stored or used as keys in clear text."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class MemoryPrincipalCache(PrincipalCache):
+    """In-process TTL + LRU cache of validated principals."""
+
+    def __init__(self, ttl: float, maxsize: int = 10_000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, tuple[float, Principal]] = OrderedDict()
+        self._by_user: dict[str, set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, token: str) -> Principal | None:
+        key = token_hash(token)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                self._drop(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    async def set(self, token: str, principal: Principal) -> None:
+        key = token_hash(token)
+        self._entries[key] = (time.monotonic() + self.ttl, principal)
+        self._entries.move_to_end(key)
+        self._by_user.setdefault(principal.id, set()).add(key)
+        while len(self._entries) > self.maxsize:
+            self._drop(next(iter(self._entries)))
+
+    async def invalidate(self, user_id: str) -> None:
+        for key in self._by_user.pop(user_id, set()):
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_user.clear()
+
+    async def aclose(self) -> None:
+        pass
+
+    def _drop(self, key: str) -> None:
+        _, principal = self._entries.pop(key)
+        keys = self._by_user.get(principal.id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[principal.id]
+
+    def stats(self) -> dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._entries),
+        }
+
+
+class RedisPrincipalCache(PrincipalCache):
+    """
+    Two-tier principal cache: in-process first, then Redis shared by all
+    API / worker processes. Invalidation clears Redis and is published on
+    INVALIDATE_CHANNEL; every process drops the user from its local tier.
+    """
+
+    def __init__(self, redis_client: redis.Redis, ttl: float, local: MemoryPrincipalCache):
+        self.redis = redis_client
+        self.ttl = ttl
+        self.local = local
+        self.redis_hits = 0
+        self.redis_misses = 0
+        self._listener: asyncio.Task | None = None
+
+    async def get(self, token: str) -> Principal | None:
+        self._listen_in_background()
+        principal = await self.local.get(token)
+        if principal is not None:
+            return principal
+
+        try:
+            raw = await self.redis.get(PRINCIPAL_KEY.format(token_hash=token_hash(token)))
+        except Exception as e:
+            logger.warning(f"Principal cache read failed: {e}")
+            return None
+
+        if raw is None:
+            self.redis_misses += 1
+            return None
+
+        self.redis_hits += 1
+        data = json.loads(raw)
+        principal = Principal(**{**data, "tariff": Tariff(data["tariff"])})
+        await self.local.set(token, principal)
+        return principal
+
+    async def set(self, token: str, principal: Principal) -> None:
+        self._listen_in_background()
+        await self.local.set(token, principal)
+
+        key_hash = token_hash(token)
+        user_key = USER_TOKENS_KEY.format(user_id=principal.id)
+        ttl = int(max(1, self.ttl))
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.set(
+                    PRINCIPAL_KEY.format(token_hash=key_hash),
+                    json.dumps(asdict(principal)),
+                    ex=ttl,
+                )
+                pipe.sadd(user_key, key_hash)
+                pipe.expire(user_key, ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Principal cache write failed: {e}")
+
+    async def invalidate(self, user_id: str) -> None:
+        await self.local.invalidate(user_id)
+
+        user_key = USER_TOKENS_KEY.format(user_id=user_id)
+        try:
+            hashes = await self.redis.smembers(user_key)
+            keys = [
+                PRINCIPAL_KEY.format(token_hash=h.decode() if isinstance(h, bytes) else h)
+                for h in hashes
+            ]
+            await self.redis.delete(user_key, *keys)
+            await self.redis.publish(INVALIDATE_CHANNEL, user_id)
+        except Exception as e:
+            logger.warning(f"Principal cache invalidation failed for {user_id}: {e}")
+
+    async def aclose(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+
+    def _listen_in_background(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(
+                self._listen(), name="principal-invalidations"
+            )
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(INVALIDATE_CHANNEL)
+                    # Invalidations may have been missed while unsubscribed
+                    self.local.clear()
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        user_id = message["data"]
+                        await self.local.invalidate(
+                            user_id.decode() if isinstance(user_id, bytes) else user_id
+                        )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Principal invalidation listener failed: {e}")
+            await asyncio.sleep(1.0)
+
+    def stats(self) -> dict[str, float]:
+        local = self.local.stats()
+        hits = local["hits"] + self.redis_hits
+        total = hits + self.redis_misses
+        return {
+            **{f"local_{k}": v for k, v in local.items()},
+            "redis_hits": self.redis_hits,
+            "redis_misses": self.redis_misses,
+            "hits": hits,
+            "misses": self.redis_misses,
+            "hit_rate": hits / total if total else 0.0,
+        }
@@ -0,0 +1,158 @@
+"""
+Write-behind usage counters.
+
+Every user has two counters: `pending` (charged, not yet picked up by a
+flush) and `inflight` (claimed by a flush that is writing it to PocketBase).
+Live usage is the stored subscription usage plus both of them, so a reader
+never undercounts while a flush is in progress.
+
+A claim belongs to one flusher (`owner`) for `lease` seconds. A flusher that
+dies between claim and commit leaves its inflight usage behind; once the
+lease is over, the next claim takes it over and writes it together with the
+pending usage. If the dead flusher had already written to PocketBase, that
+usage is counted twice: the safe direction for limits, and only on a crash
+inside the PocketBase write.
+"""
+
+import logging
+import time
+
+import redis.asyncio as redis
+
+from ...domain.models import UsageDelta
+from ...domain.out import UsageMeter
+
+logger = logging.getLogger(__name__)
+
+USAGE_KEY = "quizbee:usage:{user_id}"
+DIRTY_KEY = "quizbee:usage:dirty"
+IDEMPOTENCY_KEY = "quizbee:usage:idem:{key}"
+IDEMPOTENCY_TTL = 24 * 60 * 60  # seconds, longer than any ARQ retry window
+# Counters of a user nobody charges or flushes any more; far beyond any lease
+USAGE_TTL = 7 * 24 * 60 * 60
+
+
+# KEYS[1] usage hash, KEYS[2] dirty set, KEYS[3] idempotency key (or "")
+# ARGV: user_id, quiz_items, storage, idempotency ttl, usage ttl
+_ADD = """
+if KEYS[3] ~= '' then
+    if not redis.call('SET', KEYS[3], '1', 'NX', 'EX', ARGV[4]) then
+        return 0
+    end
+end
+redis.call('HINCRBY', KEYS[1], 'items', ARGV[2])
+redis.call('HINCRBY', KEYS[1], 'storage', ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+redis.call('SADD', KEYS[2], ARGV[1])
+return 1
+"""
+
+# Moves pending (plus the inflight usage of an expired claim) to inflight,
+# owned by ARGV[2] until ARGV[3] + ARGV[4] ms. Users stay in the dirty set
+# until their claim is committed, so an abandoned claim is found again.
+# KEYS[1] usage hash, KEYS[2] dirty set
+# ARGV: user_id, owner, now (ms), lease (ms), usage ttl
+_CLAIM = """
+local f = redis.call('HMGET', KEYS[1], 'items', 'storage',
+    'inflight_items', 'inflight_storage', 'owner', 'lease_until')
+local inflight_items = tonumber(f[3] or '0')
+local inflight_storage = tonumber(f[4] or '0')
+local claimed = inflight_items ~= 0 or inflight_storage ~= 0
+if claimed and f[5] ~= ARGV[2] and tonumber(f[6] or '0') > tonumber(ARGV[3]) then
+    return {0, 0}
+end
+local items = tonumber(f[1] or '0') + inflight_items
+local storage = tonumber(f[2] or '0') + inflight_storage
+if items == 0 and storage == 0 then
+    redis.call('DEL', KEYS[1])
+    redis.call('SREM', KEYS[2], ARGV[1])
+    return {0, 0}
+end
+redis.call('HSET', KEYS[1], 'items', 0, 'storage', 0,
+    'inflight_items', items, 'inflight_storage', storage,
+    'owner', ARGV[2], 'lease_until', tonumber(ARGV[3]) + tonumber(ARGV[4]))
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+return {items, storage}
+"""
+
+# Clears our claim; the user leaves the dirty set once nothing is pending.
+# KEYS[1] usage hash, KEYS[2] dirty set; ARGV: user_id, owner
+_COMMIT = """
+if redis.call('HGET', KEYS[1], 'owner') ~= ARGV[2] then
+    return 0
+end
+redis.call('HDEL', KEYS[1], 'inflight_items', 'inflight_storage', 'owner', 'lease_until')
+local f = redis.call('HMGET', KEYS[1], 'items', 'storage')
+if tonumber(f[1] or '0') == 0 and tonumber(f[2] or '0') == 0 then
+    redis.call('DEL', KEYS[1])
+    redis.call('SREM', KEYS[2], ARGV[1])
+end
+return 1
+"""
+
+# Puts our claimed usage back into pending. KEYS / ARGV as in _COMMIT
+_RESTORE = """
+if redis.call('HGET', KEYS[1], 'owner') ~= ARGV[2] then
+    return 0
+end
+local f = redis.call('HMGET', KEYS[1], 'inflight_items', 'inflight_storage')
+redis.call('HDEL', KEYS[1], 'inflight_items', 'inflight_storage', 'owner', 'lease_until')
+redis.call('HINCRBY', KEYS[1], 'items', tonumber(f[1] or '0'))
+redis.call('HINCRBY', KEYS[1], 'storage', tonumber(f[2] or '0'))
+redis.call('SADD', KEYS[2], ARGV[1])
+return 1
+"""
+
+
+class RedisUsageMeter(UsageMeter):
+    """Counters shared by all API / worker processes, updated atomically."""
+
+    def __init__(self, redis_client: redis.Redis):
+        self.redis = redis_client
+        self._add = redis_client.register_script(_ADD)
+        self._claim = redis_client.register_script(_CLAIM)
+        self._commit = redis_client.register_script(_COMMIT)
+        self._restore = redis_client.register_script(_RESTORE)
+
+    async def add(
+        self, user_id: str, delta: UsageDelta, idempotency_key: str | None = None
+    ) -> bool:
+        idem = IDEMPOTENCY_KEY.format(key=idempotency_key) if idempotency_key else ""
+        added = await self._add(
+            keys=[USAGE_KEY.format(user_id=user_id), DIRTY_KEY, idem],
+            args=[user_id, delta.quiz_items, delta.storage, IDEMPOTENCY_TTL, USAGE_TTL],
+        )
+        return bool(added)
+
+    async def pending(self, user_id: str) -> UsageDelta:
+        items, storage, inflight_items, inflight_storage = await self.redis.hmget(
+            USAGE_KEY.format(user_id=user_id),
+            ["items", "storage", "inflight_items", "inflight_storage"],
+        )
+        return UsageDelta(
+            quiz_items=int(items or 0) + int(inflight_items or 0),
+            storage=int(storage or 0) + int(inflight_storage or 0),
+        )
+
+    async def dirty_users(self) -> list[str]:
+        members = await self.redis.smembers(DIRTY_KEY)
+        return [m.decode() if isinstance(m, bytes) else m for m in members]
+
+    async def claim(self, user_id: str, owner: str, lease: float) -> UsageDelta:
+        # Wall clock: leases are compared across hosts
+        items, storage = await self._claim(
+            keys=[USAGE_KEY.format(user_id=user_id), DIRTY_KEY],
+            args=[user_id, owner, int(time.time() * 1000), int(lease * 1000), USAGE_TTL],
+        )
+        return UsageDelta(quiz_items=int(items), storage=int(storage))
+
+    async def commit(self, user_id: str, owner: str) -> None:
+        if not await self._commit(
+            keys=[USAGE_KEY.format(user_id=user_id), DIRTY_KEY], args=[user_id, owner]
+        ):
+            logger.warning(f"Usage claim of {user_id} was taken over before commit")
+
+    async def restore(self, user_id: str, owner: str) -> None:
+        await self._restore(
+            keys=[USAGE_KEY.format(user_id=user_id), DIRTY_KEY], args=[user_id, owner]
+        )
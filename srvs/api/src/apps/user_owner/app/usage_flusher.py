@@ -0,0 +1,89 @@
+import asyncio
+import logging
+import uuid
+
+from ..domain.models import UsageDelta
+from ..domain.out import PrincipalCache, UsageMeter, UserRepository
+
+logger = logging.getLogger(__name__)
+
+
+class UsageFlusher:
+    """
+    Writes metered usage deltas to PocketBase in the background.
+
+    One subscription update per dirty user per interval, instead of a
+    get + update round trip on every charge.
+    """
+
+    def __init__(
+        self,
+        usage_meter: UsageMeter,
+        user_repository: UserRepository,
+        principal_cache: PrincipalCache | None = None,
+        interval: float = 2.0,
+        claim_lease: float = 60.0,
+    ):
+        self.usage_meter = usage_meter
+        self.user_repository = user_repository
+        self.principal_cache = principal_cache
+        self.interval = interval
+        # Claims of a flusher that died are taken over after the lease
+        self.claim_lease = claim_lease
+        self.owner = uuid.uuid4().hex
+        self._task: asyncio.Task | None = None
+
+    async def flush(self) -> int:
+        """Flush all pending deltas. Returns the number of users written."""
+        flushed = 0
+        for user_id in await self.usage_meter.dirty_users():
+            delta = await self.usage_meter.claim(user_id, self.owner, self.claim_lease)
+            if not delta:
+                continue
+            try:
+                await self._write(user_id, delta)
+            except Exception as e:
+                logger.error(f"Usage flush failed for user {user_id}: {e}")
+                await self.usage_meter.restore(user_id, self.owner)
+                continue
+
+            # Cached principals carry the pre-flush usage from PocketBase.
+            # Drop them before clearing inflight: in between, readers
+            # over-count, never under-count.
+            if self.principal_cache is not None:
+                await self.principal_cache.invalidate(user_id)
+            await self.usage_meter.commit(user_id, self.owner)
+            flushed += 1
+
+        if flushed:
+            logger.info(f"Flushed usage for {flushed} users")
+        return flushed
+
+    async def _write(self, user_id: str, delta: UsageDelta) -> None:
+        user = await self.user_repository.get(user_id)
+        await self.user_repository.save(
+            user, cost=delta.quiz_items, storage_delta=delta.storage
+        )
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="usage-flusher")
+
+    async def stop(self) -> None:
+        """Stop the loop and flush whatever is left (called at shutdown)."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Usage flush loop error: {e}", exc_info=True)
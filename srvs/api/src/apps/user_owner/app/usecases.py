@@ -1,7 +1,8 @@
+from dataclasses import replace
 import logging
 
-from ..domain.models import User, Subscription
-from ..domain.out import UserVerifier, UserRepository
+from ..domain.models import User, Subscription, UsageDelta
+from ..domain.out import UserVerifier, UserRepository, PrincipalCache, UsageMeter
 
 from ..domain._in import AuthUserApp, Principal
 
@@ -9,14 +10,27 @@ logger = logging.getLogger(__name__)
 
 
 class AuthUserAppImpl(AuthUserApp):
-    def __init__(self, user_verifier: UserVerifier, user_repository: UserRepository):
+    def __init__(
+        self,
+        user_verifier: UserVerifier,
+        user_repository: UserRepository,
+        principal_cache: PrincipalCache | None = None,
+        usage_meter: UsageMeter | None = None,
+    ):
         self.user_verifier = user_verifier
         self.user_repository = user_repository
+        self.principal_cache = principal_cache
+        self.usage_meter = usage_meter
 
     async def validate(self, token: str | None = None) -> Principal:
         logger.info("AuthUserAppImpl.validate")
+        if token and self.principal_cache is not None:
+            cached = await self.principal_cache.get(token)
+            if cached is not None:
+                return await self._with_pending(cached)
+
         user = await self.user_verifier.verify(token)
-        return Principal(
+        principal = Principal(
             id=user.id,
             remaining=user.subscription.quiz_items_limit
             - user.subscription.quiz_items_usage,
@@ -28,12 +42,54 @@ class AuthUserAppImpl(AuthUserApp):
             tariff=user.subscription.tariff,
         )
 
-    async def charge(self, user_id: str, cost: int) -> None:
+        if token and self.principal_cache is not None:
+            await self.principal_cache.set(token, principal)
+        return await self._with_pending(principal)
+
+    async def charge(
+        self, user_id: str, cost: int, idempotency_key: str | None = None
+    ) -> None:
         logger.info("AuthUserAppImpl.charge")
+        if self.usage_meter is not None:
+            delta = UsageDelta(quiz_items=cost)
+            if not await self.usage_meter.add(user_id, delta, idempotency_key):
+                logger.info(f"Charge {idempotency_key} already metered for {user_id}")
+            return
+
         user = await self.user_repository.get(user_id)
         await self.user_repository.save(user, cost=cost)
+        await self._invalidate(user_id)
 
-    async def update_storage(self, user_id: str, delta: int) -> None:
+    async def update_storage(
+        self, user_id: str, delta: int, idempotency_key: str | None = None
+    ) -> None:
         logger.info("AuthUserAppImpl.update_storage")
+        if self.usage_meter is not None:
+            usage = UsageDelta(storage=delta)
+            if not await self.usage_meter.add(user_id, usage, idempotency_key):
+                logger.info(f"Storage {idempotency_key} already metered for {user_id}")
+            return
+
         user = await self.user_repository.get(user_id)
         await self.user_repository.save(user, storage_delta=delta)
+        await self._invalidate(user_id)
+
+    async def _with_pending(self, principal: Principal) -> Principal:
+        """Overlay usage metered but not yet flushed to PocketBase."""
+        if self.usage_meter is None:
+            return principal
+
+        pending = await self.usage_meter.pending(principal.id)
+        if not pending:
+            return principal
+        return replace(
+            principal,
+            remaining=principal.remaining - pending.quiz_items,
+            used=principal.used + pending.quiz_items,
+            storage_usage=principal.storage_usage + pending.storage,
+        )
+
+    async def _invalidate(self, user_id: str) -> None:
+        # Usage changed: cached `remaining` / `storage_usage` are stale now
+        if self.principal_cache is not None:
+            await self.principal_cache.invalidate(user_id)
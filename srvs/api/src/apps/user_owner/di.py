@@ -1,20 +1,63 @@
 from pocketbase import PocketBase
+import httpx
+import redis.asyncio as redis
 
-from .domain.out import UserVerifier, UserRepository
+from src.lib.settings import settings
+
+from .domain.out import UserVerifier, UserRepository, PrincipalCache, UsageMeter
 
 from .app.usecases import AuthUserAppImpl
-from .adapters.out import PBUserRepository, PBUserVerifier
+from .app.usage_flusher import UsageFlusher
+from .adapters.out import (
+    PBUserRepository,
+    PBUserVerifier,
+    MemoryPrincipalCache,
+    RedisPrincipalCache,
+    RedisUsageMeter,
+)
 
 
-def init_user_auth_deps(admin_pb: PocketBase):
+def init_user_auth_deps(
+    admin_pb: PocketBase,
+    user_pb_http: httpx.AsyncClient,
+    redis_client: redis.Redis,
+) -> tuple[UserVerifier, UserRepository, PrincipalCache, UsageMeter]:
     user_repository = PBUserRepository(admin_pb)
-    user_verifier = PBUserVerifier(user_repository=user_repository)
-    return user_verifier, user_repository
+    user_verifier = PBUserVerifier(user_repository=user_repository, http=user_pb_http)
+
+    principal_cache = RedisPrincipalCache(
+        redis_client,
+        ttl=settings.principal_cache_redis_ttl,
+        local=MemoryPrincipalCache(ttl=settings.principal_cache_ttl),
+    )
+    usage_meter = RedisUsageMeter(redis_client)
+    return user_verifier, user_repository, principal_cache, usage_meter
 
 
 def init_auth_user_app(
     user_verifier: UserVerifier,
     user_repository: UserRepository,
+    principal_cache: PrincipalCache | None = None,
+    usage_meter: UsageMeter | None = None,
 ) -> AuthUserAppImpl:
     """Factory for AuthUserApp - all dependencies explicit"""
-    return AuthUserAppImpl(user_verifier=user_verifier, user_repository=user_repository)
+    return AuthUserAppImpl(
+        user_verifier=user_verifier,
+        user_repository=user_repository,
+        principal_cache=principal_cache,
+        usage_meter=usage_meter,
+    )
+
+
+def init_usage_flusher(
+    usage_meter: UsageMeter,
+    user_repository: UserRepository,
+    principal_cache: PrincipalCache | None = None,
+) -> UsageFlusher:
+    return UsageFlusher(
+        usage_meter=usage_meter,
+        user_repository=user_repository,
+        principal_cache=principal_cache,
+        interval=settings.usage_flush_interval,
+        claim_lease=settings.usage_claim_lease,
+    )
@@ -18,6 +18,10 @@ class Principal:
 class AuthUserApp(Protocol):
     async def validate(self, token: str) -> Principal: ...
 
-    async def charge(self, user_id: str, cost: int) -> None: ...
+    async def charge(
+        self, user_id: str, cost: int, idempotency_key: str | None = None
+    ) -> None: ...
 
-    async def update_storage(self, user_id: str, delta: int) -> None: ...
+    async def update_storage(
+        self, user_id: str, delta: int, idempotency_key: str | None = None
+    ) -> None: ...
@@ -22,3 +22,14 @@ class Subscription:
 class User:
     id: str
     subscription: Subscription
+
+
+@dataclass(slots=True, kw_only=True)
+class UsageDelta:
+    """Usage not yet written to the subscription record."""
+
+    quiz_items: int = 0
+    storage: int = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.quiz_items or self.storage)
@@ -1,6 +1,7 @@
 from typing import Protocol
 
-from .models import User
+from ._in import Principal
+from .models import UsageDelta, User
 
 
 class UserVerifier(Protocol):
@@ -10,3 +11,22 @@ class UserVerifier(Protocol):
 class UserRepository(Protocol):
     async def get(self, user_id: str) -> User: ...
     async def save(self, user: User, cost: int = 0, storage_delta: int = 0) -> None: ...
+
+
+class PrincipalCache(Protocol):
+    async def get(self, token: str) -> Principal | None: ...
+    async def set(self, token: str, principal: Principal) -> None: ...
+    async def invalidate(self, user_id: str) -> None: ...
+    def stats(self) -> dict[str, float]: ...
+    async def aclose(self) -> None: ...
+
+
+class UsageMeter(Protocol):
+    async def add(
+        self, user_id: str, delta: UsageDelta, idempotency_key: str | None = None
+    ) -> bool: ...
+    async def pending(self, user_id: str) -> UsageDelta: ...
+    async def dirty_users(self) -> list[str]: ...
+    async def claim(self, user_id: str, owner: str, lease: float) -> UsageDelta: ...
+    async def commit(self, user_id: str, owner: str) -> None: ...
+    async def restore(self, user_id: str, owner: str) -> None: ...
@@ -0,0 +1,107 @@
+import pytest
+
+from src.apps.user_owner.adapters.out import MemoryPrincipalCache
+from src.apps.user_owner.app.usecases import AuthUserAppImpl
+from src.apps.user_owner.domain.models import Subscription, Tariff, User
+
+
+class CountingVerifier:
+    def __init__(self, user: User):
+        self.user = user
+        self.calls = 0
+
+    async def verify(self, token: str | None = None) -> User:
+        self.calls += 1
+        return self.user
+
+
+class MemoryUserRepository:
+    def __init__(self, user: User):
+        self.user = user
+
+    async def get(self, user_id: str) -> User:
+        return self.user
+
+    async def save(self, user: User, cost: int = 0, storage_delta: int = 0) -> None:
+        user.subscription.quiz_items_usage += cost
+        user.subscription.storage_usage += storage_delta
+
+
+@pytest.fixture
+def user() -> User:
+    return User(
+        id="u1",
+        subscription=Subscription(
+            id="s1",
+            quiz_items_limit=100,
+            quiz_items_usage=10,
+            storage_usage=0,
+            storage_limit=1000,
+            tariff=Tariff.PLUS,
+        ),
+    )
+
+
+@pytest.fixture
+def app(user: User) -> tuple[AuthUserAppImpl, CountingVerifier, MemoryPrincipalCache]:
+    verifier = CountingVerifier(user)
+    cache = MemoryPrincipalCache(ttl=60)
+    return (
+        AuthUserAppImpl(
+            user_verifier=verifier,
+            user_repository=MemoryUserRepository(user),
+            principal_cache=cache,
+        ),
+        verifier,
+        cache,
+    )
+
+
+async def test_validate_is_served_from_cache(app):
+    auth, verifier, cache = app
+
+    first = await auth.validate("token-a")
+    second = await auth.validate("token-a")
+
+    assert first == second
+    assert verifier.calls == 1
+    assert cache.stats()["hit_rate"] == 0.5
+
+
+async def test_charge_and_storage_invalidate_all_tokens_of_user(app):
+    auth, verifier, _ = app
+    await auth.validate("token-a")
+    await auth.validate("token-b")
+
+    await auth.charge("u1", 5)
+    principal = await auth.validate("token-a")
+    assert principal.remaining == 85
+    assert verifier.calls == 3
+
+    await auth.update_storage("u1", 100)
+    principal = await auth.validate("token-b")
+    assert principal.storage_usage == 100
+    assert verifier.calls == 4
+
+
+async def test_entries_expire_and_are_bounded(user: User, monkeypatch):
+    cache = MemoryPrincipalCache(ttl=10, maxsize=2)
+    auth = AuthUserAppImpl(
+        user_verifier=CountingVerifier(user),
+        user_repository=MemoryUserRepository(user),
+    )
+    principal = await auth.validate("t")
+
+    now = [1000.0]
+    monkeypatch.setattr(
+        "src.apps.user_owner.adapters.out.principal_cache.time.monotonic",
+        lambda: now[0],
+    )
+    await cache.set("t1", principal)
+    await cache.set("t2", principal)
+    await cache.set("t3", principal)
+    assert cache.stats()["size"] == 2
+    assert await cache.get("t1") is None
+
+    now[0] += 11
+    assert await cache.get("t3") is None
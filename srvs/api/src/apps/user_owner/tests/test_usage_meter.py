@@ -0,0 +1,160 @@
+import asyncio
+
+import fakeredis
+import pytest
+
+from src.apps.user_owner.adapters.out import (
+    MemoryPrincipalCache,
+    RedisPrincipalCache,
+    RedisUsageMeter,
+)
+from src.apps.user_owner.adapters.out.usage_meter import USAGE_KEY
+from src.apps.user_owner.app.usage_flusher import UsageFlusher
+from src.apps.user_owner.app.usecases import AuthUserAppImpl
+from src.apps.user_owner.domain.models import Subscription, Tariff, UsageDelta, User
+
+from .test_principal_cache import CountingVerifier
+
+
+class CountingUserRepository:
+    def __init__(self, user: User, fail: bool = False):
+        self.user = user
+        self.fail = fail
+        self.saves = 0
+
+    async def get(self, user_id: str) -> User:
+        return self.user
+
+    async def save(self, user: User, cost: int = 0, storage_delta: int = 0) -> None:
+        if self.fail:
+            raise RuntimeError("pocketbase is down")
+        self.saves += 1
+        user.subscription.quiz_items_usage += cost
+        user.subscription.storage_usage += storage_delta
+
+
+@pytest.fixture
+def user() -> User:
+    return User(
+        id="u1",
+        subscription=Subscription(
+            id="s1",
+            quiz_items_limit=100,
+            quiz_items_usage=10,
+            storage_usage=0,
+            storage_limit=1000,
+            tariff=Tariff.PLUS,
+        ),
+    )
+
+
+def make_app(user: User, repository: CountingUserRepository):
+    meter = RedisUsageMeter(fakeredis.FakeAsyncRedis())
+    cache = MemoryPrincipalCache(ttl=60)
+    verifier = CountingVerifier(user)
+    auth = AuthUserAppImpl(
+        user_verifier=verifier,
+        user_repository=repository,
+        principal_cache=cache,
+        usage_meter=meter,
+    )
+    flusher = UsageFlusher(meter, repository, principal_cache=cache)
+    return auth, verifier, meter, flusher
+
+
+async def test_retried_charge_is_metered_once():
+    meter = RedisUsageMeter(fakeredis.FakeAsyncRedis())
+
+    assert await meter.add("u1", UsageDelta(quiz_items=5), "start_quiz:job-1")
+    assert not await meter.add("u1", UsageDelta(quiz_items=5), "start_quiz:job-1")
+    assert await meter.add("u1", UsageDelta(quiz_items=5))
+
+    assert await meter.pending("u1") == UsageDelta(quiz_items=10)
+
+
+async def test_limits_read_live_counters_and_flush_batches(user: User):
+    repository = CountingUserRepository(user)
+    auth, verifier, _, flusher = make_app(user, repository)
+    await auth.validate("t")
+
+    for i in range(3):
+        await auth.charge("u1", 5, idempotency_key=f"generate:job-{i}")
+    await auth.update_storage("u1", 100)
+
+    # Cached principal + pending delta, without PocketBase round trips
+    principal = await auth.validate("t")
+    assert principal.remaining == 75
+    assert principal.storage_usage == 100
+    assert verifier.calls == 1
+    assert repository.saves == 0
+
+    assert await flusher.flush() == 1
+    assert repository.saves == 1
+    assert user.subscription.quiz_items_usage == 25
+
+    principal = await auth.validate("t")
+    assert principal.remaining == 75
+    assert principal.storage_usage == 100
+
+
+async def test_failed_flush_keeps_usage(user: User):
+    repository = CountingUserRepository(user, fail=True)
+    auth, _, meter, flusher = make_app(user, repository)
+
+    await auth.charge("u1", 5)
+    assert await flusher.flush() == 0
+    assert (await auth.validate("t")).remaining == 85
+
+    repository.fail = False
+    await auth.charge("u1", 5)
+    await flusher.stop()
+    assert user.subscription.quiz_items_usage == 20
+    assert await meter.pending("u1") == UsageDelta()
+
+
+async def test_abandoned_claim_is_taken_over_after_its_lease():
+    meter = RedisUsageMeter(fakeredis.FakeAsyncRedis())
+    await meter.add("u1", UsageDelta(quiz_items=5))
+
+    # A flusher claims and dies before commit
+    assert await meter.claim("u1", "dead", lease=60) == UsageDelta(quiz_items=5)
+    await meter.add("u1", UsageDelta(quiz_items=2))
+    assert await meter.claim("u1", "alive", lease=60) == UsageDelta()
+    assert await meter.dirty_users() == ["u1"]
+
+    # Lease over
+    await meter.redis.hset(USAGE_KEY.format(user_id="u1"), "lease_until", 0)
+    assert await meter.claim("u1", "alive", lease=60) == UsageDelta(quiz_items=7)
+
+    # The late commit of the dead flusher does not clear the new claim
+    await meter.commit("u1", "dead")
+    assert await meter.pending("u1") == UsageDelta(quiz_items=7)
+
+    await meter.commit("u1", "alive")
+    assert await meter.dirty_users() == []
+    assert not await meter.redis.exists(USAGE_KEY.format(user_id="u1"))
+
+
+async def test_invalidation_reaches_local_tier_of_other_processes(user: User):
+    client = fakeredis.FakeAsyncRedis()
+    caches = [
+        RedisPrincipalCache(client, ttl=60, local=MemoryPrincipalCache(ttl=60))
+        for _ in range(2)
+    ]
+    principal = await AuthUserAppImpl(
+        user_verifier=CountingVerifier(user),
+        user_repository=CountingUserRepository(user),
+    ).validate("t")
+    for cache in caches:
+        await cache.set("t", principal)
+    await asyncio.sleep(0.05)  # listeners subscribed
+
+    await caches[0].invalidate("u1")
+    for _ in range(50):
+        if await caches[1].local.get("t") is None:
+            break
+        await asyncio.sleep(0.01)
+    assert await caches[1].local.get("t") is None
+
+    for cache in caches:
+        await cache.aclose()
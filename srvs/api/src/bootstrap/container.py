@@ -0,0 +1,353 @@
+"""
+Shared composition root for the API lifespan and the ARQ worker.
+
+Every provider is lazy and memoised: it is built on first request, exactly
+once per process, and concurrent callers wait for the same instance.
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from typing import Any, Awaitable, Callable, TypeVar
+
+from arq import ArqRedis
+from arq.connections import RedisSettings, create_pool
+from langfuse import Langfuse
+from meilisearch_python_sdk import AsyncClient
+from pocketbase import PocketBase
+from pydantic_ai.providers.openai import OpenAIProvider
+import httpx
+import redis.asyncio as redis
+
+from src.apps.document_parser.di import (
+    init_document_parser_app,
+    init_document_parser_deps,
+)
+from src.apps.document_parser.domain._in import DocumentParserApp
+from src.apps.edge_api.di import init_edge_api_app
+from src.apps.edge_api.domain._in import EdgeAPIApp
+from src.apps.llm_tools.di import init_llm_tools_app, init_llm_tools_deps
+from src.apps.llm_tools.domain._in import LLMToolsApp
+from src.apps.material_owner.di import init_material_app, init_material_deps
+from src.apps.material_owner.domain._in import MaterialApp
+from src.apps.message_owner.di import init_message_owner_app, init_message_owner_deps
+from src.apps.message_owner.domain._in import MessageOwnerApp
+from src.apps.quiz_attempter.di import init_quiz_attempter_app, init_quiz_attempter_deps
+from src.apps.quiz_attempter.domain._in import QuizAttempterApp
+from src.apps.quiz_owner.di import init_quiz_app, init_quiz_deps
+from src.apps.quiz_owner.domain._in import QuizApp
+from src.apps.user_owner.app.usage_flusher import UsageFlusher
+from src.apps.user_owner.di import (
+    init_auth_user_app,
+    init_usage_flusher,
+    init_user_auth_deps,
+)
+from src.apps.user_owner.domain._in import AuthUserApp
+from src.apps.user_owner.domain.out import (
+    PrincipalCache,
+    UsageMeter,
+    UserRepository,
+    UserVerifier,
+)
+from src.lib.cluster_cache import ClusterCache, init_cluster_cache
+from src.lib.di import init_global_deps
+from src.lib.http_pool import create_http_client
+from src.lib.job_coalescer import JobCoalescer, init_job_coalescer
+from src.lib.meili_tasks import MeiliTaskTracker
+from src.lib.progress_bus import ProgressBus, ProgressHub, init_progress_bus
+from src.lib.settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def provider(
+    fn: Callable[["Container"], Awaitable[T]],
+) -> Callable[["Container"], Awaitable[T]]:
+    """Memoise an async provider per container instance."""
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    async def wrapper(self: "Container") -> T:
+        if name in self._instances:
+            return self._instances[name]
+
+        async with self._locks.setdefault(name, asyncio.Lock()):
+            if name not in self._instances:
+                started = time.perf_counter()
+                self._instances[name] = await fn(self)
+                logger.debug(
+                    f"Container built {name} in {(time.perf_counter() - started) * 1000:.1f} ms"
+                )
+        return self._instances[name]
+
+    return wrapper
+
+
+class Container:
+    def __init__(self):
+        self._instances: dict[str, Any] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    # GLOBAL
+    @provider
+    async def globals(
+        self,
+    ) -> tuple[PocketBase, Langfuse, AsyncClient, httpx.AsyncClient, OpenAIProvider]:
+        return init_global_deps()
+
+    async def admin_pb(self) -> PocketBase:
+        return (await self.globals())[0]
+
+    async def http(self) -> httpx.AsyncClient:
+        return (await self.globals())[3]
+
+    async def meili(self) -> AsyncClient:
+        return (await self.globals())[2]
+
+    @provider
+    async def meili_tasks(self) -> MeiliTaskTracker:
+        """One poller for the tasks of every Meilisearch writer."""
+        return MeiliTaskTracker(await self.meili())
+
+    @provider
+    async def user_pb_http(self) -> httpx.AsyncClient:
+        """One pool shared by all PocketBase calls made with user tokens."""
+        return create_http_client("pocketbase-user", base_url=settings.pb_url)
+
+    @provider
+    async def arq_pool(self) -> ArqRedis:
+        return await create_pool(RedisSettings.from_dsn(settings.redis_dsn))
+
+    @provider
+    async def redis_client(self) -> redis.Redis:
+        redis_settings = RedisSettings.from_dsn(settings.redis_dsn)
+        return redis.Redis(
+            host=redis_settings.host,  # type: ignore
+            port=redis_settings.port,
+            password=redis_settings.password,
+            db=redis_settings.database,
+            decode_responses=False,
+        )
+
+    @provider
+    async def job_coalescer(self) -> JobCoalescer:
+        return init_job_coalescer(await self.redis_client())
+
+    @provider
+    async def cluster_cache(self) -> ClusterCache:
+        return init_cluster_cache(await self.redis_client())
+
+    @provider
+    async def progress_bus(self) -> ProgressBus:
+        return init_progress_bus(await self.redis_client())
+
+    @provider
+    async def progress_hub(self) -> ProgressHub:
+        """Reads only while SSE clients are connected, so idle in the worker."""
+        return ProgressHub(await self.progress_bus())
+
+    # APPS
+    @provider
+    async def document_parser_app(self) -> DocumentParserApp:
+        _, lf, _, _, _ = await self.globals()
+        parser_provider = init_document_parser_deps(lf=lf)
+        return init_document_parser_app(parser_provider=parser_provider)
+
+    @provider
+    async def llm_tools(self) -> LLMToolsApp:
+        _, lf, _, _, _ = await self.globals()
+        text_tokenizer, image_tokenizer, chunker, vectorizer, reranker = (
+            init_llm_tools_deps(lf=lf)
+        )
+        return init_llm_tools_app(
+            text_tokenizer=text_tokenizer,
+            image_tokenizer=image_tokenizer,
+            chunker=chunker,
+            vectorizer=vectorizer,
+            reranker=reranker,
+        )
+
+    @provider
+    async def user_auth_deps(
+        self,
+    ) -> tuple[UserVerifier, UserRepository, PrincipalCache, UsageMeter]:
+        return init_user_auth_deps(
+            await self.admin_pb(),
+            await self.user_pb_http(),
+            redis_client=await self.redis_client(),
+        )
+
+    async def principal_cache(self) -> PrincipalCache:
+        return (await self.user_auth_deps())[2]
+
+    @provider
+    async def auth_user_app(self) -> AuthUserApp:
+        user_verifier, user_repository, principal_cache, usage_meter = (
+            await self.user_auth_deps()
+        )
+        return init_auth_user_app(
+            user_verifier=user_verifier,
+            user_repository=user_repository,
+            principal_cache=principal_cache,
+            usage_meter=usage_meter,
+        )
+
+    @provider
+    async def usage_flusher(self) -> UsageFlusher:
+        """Started on first use; stopped (with a final flush) in aclose()."""
+        _, user_repository, principal_cache, usage_meter = await self.user_auth_deps()
+        flusher = init_usage_flusher(
+            usage_meter=usage_meter,
+            user_repository=user_repository,
+            principal_cache=principal_cache,
+        )
+        flusher.start()
+        return flusher
+
+    @provider
+    async def message_owner_app(self) -> MessageOwnerApp:
+        message_repository = init_message_owner_deps(await self.admin_pb())
+        return init_message_owner_app(message_repository=message_repository)
+
+    @provider
+    async def material_app(self) -> MaterialApp:
+        admin_pb, lf, meili, _, _ = await self.globals()
+        (
+            material_repository,
+            document_parser_adapter,
+            material_indexer,
+            searcher_provider,
+            llm_tools_adapter,
+            coverage_index,
+        ) = await init_material_deps(
+            lf=lf,
+            admin_pb=admin_pb,
+            meili=meili,
+            llm_tools=await self.llm_tools(),
+            document_parser_app=await self.document_parser_app(),
+            redis_client=await self.redis_client(),
+            meili_tasks=await self.meili_tasks(),
+        )
+        return init_material_app(
+            document_parser_adapter=document_parser_adapter,
+            llm_tools_adapter=llm_tools_adapter,
+            indexer=material_indexer,
+            material_repository=material_repository,
+            searcher_provider=searcher_provider,
+            progress_bus=await self.progress_bus(),
+            coverage_index=coverage_index,
+            cluster_cache=await self.cluster_cache(),
+        )
+
+    @provider
+    async def quiz_app(self) -> QuizApp:
+        admin_pb, lf, meili, http, grok_provider = await self.globals()
+        llm_tools = await self.llm_tools()
+        material_app = await self.material_app()
+        redis_client = await self.redis_client()
+        (
+            quiz_repository,
+            patch_generator,
+            quiz_finalizer,
+            quiz_indexer,
+            quiz_preprocessor,
+            quiz_clusterer,
+        ) = await init_quiz_deps(
+            meili=meili,
+            lf=lf,
+            admin_pb=admin_pb,
+            http=http,
+            llm_tools=llm_tools,
+            llm_provider=grok_provider,
+            material_app=material_app,
+            redis_client=redis_client,
+            meili_tasks=await self.meili_tasks(),
+            cluster_cache=await self.cluster_cache(),
+        )
+        return init_quiz_app(
+            llm_tools=llm_tools,
+            material=material_app,
+            quiz_repository=quiz_repository,
+            quiz_indexer=quiz_indexer,
+            patch_generator=patch_generator,
+            finalizer=quiz_finalizer,
+            quiz_preprocessor=quiz_preprocessor,
+            quiz_clusterer=quiz_clusterer,
+            redis_client=redis_client,
+            progress_bus=await self.progress_bus(),
+        )
+
+    @provider
+    async def quiz_attempter_app(self) -> QuizAttempterApp:
+        admin_pb, lf, _, http, _ = await self.globals()
+        llm_tools = await self.llm_tools()
+        material_app = await self.material_app()
+        redis_client = await self.redis_client()
+        (
+            attempt_repository,
+            explainer,
+            attempt_finalizer,
+        ) = init_quiz_attempter_deps(
+            lf=lf,
+            admin_pb=admin_pb,
+            http=http,
+            material_app=material_app,
+            llm_tools=llm_tools,
+            redis_client=redis_client,
+        )
+        return init_quiz_attempter_app(
+            message_owner=await self.message_owner_app(),
+            llm_tools=llm_tools,
+            attempt_repository=attempt_repository,
+            explainer=explainer,
+            finalizer=attempt_finalizer,
+            material_app=material_app,
+        )
+
+    @provider
+    async def edge_api_app(self) -> EdgeAPIApp:
+        return init_edge_api_app(
+            auth_user_app=await self.auth_user_app(),
+            quiz_app=await self.quiz_app(),
+            quiz_attempter_app=await self.quiz_attempter_app(),
+            material_app=await self.material_app(),
+            progress_hub=await self.progress_hub(),
+        )
+
+    async def aclose(self) -> None:
+        """Close only the resources that were actually created."""
+        if "usage_flusher" in self._instances:
+            # Needs PocketBase and Redis, so it goes first
+            await self._instances["usage_flusher"].stop()
+        if "progress_hub" in self._instances:
+            await self._instances["progress_hub"].aclose()
+        if "user_auth_deps" in self._instances:
+            # Stops the principal invalidation listener before Redis closes
+            await self._instances["user_auth_deps"][2].aclose()
+        if "material_app" in self._instances:
+            # Writes buffered chunk marks, needs Meilisearch
+            await self._instances["material_app"].aclose()
+        if "meili_tasks" in self._instances:
+            await self._instances["meili_tasks"].aclose()
+        if "arq_pool" in self._instances:
+            await self._instances["arq_pool"].close()
+        if "redis_client" in self._instances:
+            await self._instances["redis_client"].aclose()
+        if "user_pb_http" in self._instances:
+            await self._instances["user_pb_http"].aclose()
+        if "globals" in self._instances:
+            admin_pb, _, meili, http, _ = self._instances["globals"]
+            await http.aclose()
+            await meili.aclose()
+            await admin_pb._inners.client.aclose()
+        self._instances.clear()
+        self._locks.clear()
+
+
+@functools.cache
+def get_container() -> Container:
+    """Process-wide container (one per gunicorn / ARQ worker process)."""
+    return Container()
@@ -5,6 +5,8 @@ from fastapi import APIRouter, Response, Request
 from fastapi.responses import JSONResponse
 
 from src.lib.health import HealthChecker
+from src.lib.http_pool import pool_stats
+from src.lib.latency import latency_stats
 from src.lib.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -63,3 +65,21 @@ async def readiness(request: Request):
                 "error": str(e),
             },
         )
+
+
+@health_router.get("/health/http-pools")
+async def http_pools():
+    """Outgoing connection pool metrics: in-use / idle connections and pool wait."""
+    return pool_stats()
+
+
+@health_router.get("/health/principal-cache")
+async def principal_cache(request: Request):
+    """Auth principal cache hit rate for this process."""
+    return request.app.state.principal_cache.stats()
+
+
+@health_router.get("/health/latency")
+async def latency():
+    """Endpoint latency percentiles, e.g. explainer time-to-first-token."""
+    return latency_stats()
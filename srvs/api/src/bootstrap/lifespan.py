@@ -2,35 +2,12 @@ import asyncio
 from fastapi import FastAPI
 import logging
 import contextlib
+import time
 from contextlib import asynccontextmanager
-from arq.connections import RedisSettings, create_pool
-import redis.asyncio as redis
 
 from quizbee_example_lib import greet
 
-from src.apps.edge_api.di import init_edge_api_app
-from src.apps.llm_tools.di import init_llm_tools_app, init_llm_tools_deps
-from src.apps.user_owner.di import init_auth_user_app, init_user_auth_deps
-from src.apps.message_owner.di import init_message_owner_app, init_message_owner_deps
-from src.apps.material_owner.di import (
-    init_material_app,
-    init_material_deps,
-)
-from src.apps.quiz_owner.di import init_quiz_app, init_quiz_deps
-from src.apps.quiz_attempter.di import init_quiz_attempter_app, init_quiz_attempter_deps
-
-from src.lib.di import init_global_deps
-from src.apps.message_owner.di import init_message_owner_app
-
-from src.apps.quiz_attempter.di import init_quiz_attempter_app
-
-from src.apps.document_parser.di import (
-    init_document_parser_app,
-    init_document_parser_deps,
-)
-
-from src.lib.settings import settings
-
+from .container import get_container
 from .mcp import mcp
 
 
@@ -42,138 +19,24 @@ async def lifespan(app: FastAPI):
     # INIT LOGIC
     logger.info("Starting Quizbee API server")
     logger.info(greet("World"))
+    started = time.perf_counter()
 
-    # GLOBAL
-    admin_pb, lf, meili, http, grok_provider = init_global_deps()
-
-    parser_provider = init_document_parser_deps(lf=lf)
-    document_parser_app = init_document_parser_app(parser_provider=parser_provider)
-
-    # V2 LLM TOOLS
-    text_tokenizer, image_tokenizer, chunker, vectorizer, reranker = (
-        init_llm_tools_deps(lf=lf)
-    )
-    llm_tools = init_llm_tools_app(
-        text_tokenizer=text_tokenizer,
-        image_tokenizer=image_tokenizer,
-        chunker=chunker,
-        vectorizer=vectorizer,
-        reranker=reranker,
-    )
-
-    # V2 USER AUTH
-    user_verifier, user_repository = init_user_auth_deps(admin_pb)
-    auth_user_app = init_auth_user_app(
-        user_verifier=user_verifier,
-        user_repository=user_repository,
-    )
-
-    # V2 MESSAGE OWNER
-    message_repository = init_message_owner_deps(admin_pb)
-    message_owner_app = init_message_owner_app(message_repository=message_repository)
+    container = get_container()
+    edge_api_app = await container.edge_api_app()
+    await container.usage_flusher()
 
-    # V2 MATERIAL SEARCH
-    (
-        material_repository,
-        document_parser_adapter,
-        material_indexer,
-        searcher_provider,
-        llm_tools_adapter,
-    ) = await init_material_deps(
-        lf=lf,
-        admin_pb=admin_pb,
-        meili=meili,
-        llm_tools=llm_tools,
-        document_parser_app=document_parser_app,
-    )
-    material_app = init_material_app(
-        document_parser_adapter=document_parser_adapter,
-        llm_tools_adapter=llm_tools_adapter,
-        indexer=material_indexer,
-        material_repository=material_repository,
-        searcher_provider=searcher_provider,
-    )
-
-    # V2 QUIZ GENERATOR (will be reinitialized with redis_client later)
-    (
-        quiz_repository,
-        patch_generator,
-        quiz_finalizer,
-        quiz_indexer,
-        quiz_preprocessor,
-        quiz_clusterer,
-    ) = await init_quiz_deps(
-        meili=meili,
-        lf=lf,
-        admin_pb=admin_pb,
-        http=http,
-        llm_tools=llm_tools,
-        llm_provider=grok_provider,
-        material_app=material_app,
-    )
-
-    # V2 QUIZ ATTEMPTER
-    (
-        attempt_repository,
-        explainer,
-        attempt_finalizer,
-    ) = init_quiz_attempter_deps(
-        lf=lf,
-        admin_pb=admin_pb,
-        http=http,
-        material_app=material_app,
-        llm_tools=llm_tools,
-    )
-    quiz_attempter_app = init_quiz_attempter_app(
-        message_owner=message_owner_app,
-        llm_tools=llm_tools,
-        attempt_repository=attempt_repository,
-        explainer=explainer,
-        finalizer=attempt_finalizer,
-        material_app=material_app,
-    )
-
-    # ARQ Redis pool для отправки задач
-    redis_settings = RedisSettings.from_dsn(settings.redis_dsn)
-    arq_pool = await create_pool(redis_settings)
-
-    # Create Redis client for distributed locks
-    redis_client = redis.Redis(
-        host=redis_settings.host,  # type: ignore
-        port=redis_settings.port,
-        password=redis_settings.password,
-        db=redis_settings.database,
-        decode_responses=False,
-    )
-
-    # Initialize quiz_app with redis_client
-    quiz_app = init_quiz_app(
-        llm_tools=llm_tools,
-        material=material_app,
-        quiz_repository=quiz_repository,
-        quiz_indexer=quiz_indexer,
-        patch_generator=patch_generator,
-        finalizer=quiz_finalizer,
-        quiz_preprocessor=quiz_preprocessor,
-        quiz_clusterer=quiz_clusterer,
-        redis_client=redis_client,
-    )
-
-    # V2 EDGE API
-    edge_api_app = init_edge_api_app(
-        auth_user_app=auth_user_app,
-        quiz_app=quiz_app,
-        quiz_attempter_app=quiz_attempter_app,
-        material_app=material_app,
-    )
-
-    app.state.arq_pool = arq_pool
-    app.state.redis_client = redis_client
+    app.state.arq_pool = await container.arq_pool()
+    app.state.redis_client = await container.redis_client()
+    app.state.job_coalescer = await container.job_coalescer()
     app.state.edge_api_app = edge_api_app
-    app.state.http = http
-    app.state.admin_pb = admin_pb
+    app.state.http = await container.http()
+    app.state.user_pb_http = await container.user_pb_http()
+    app.state.principal_cache = await container.principal_cache()
+    app.state.admin_pb = await container.admin_pb()
     app.state.admin_auth_lock = asyncio.Lock()
-    app.state.meili_client = meili
+    app.state.meili_client = await container.meili()
+
+    logger.info(f"API dependencies ready in {(time.perf_counter() - started) * 1000:.0f} ms")
 
     async with contextlib.AsyncExitStack() as stack:
         await stack.enter_async_context(mcp.session_manager.run())
@@ -181,7 +44,4 @@ async def lifespan(app: FastAPI):
 
     # CLEANUP LOGIC
     logger.info("Shutting down Quizbee API server")
-    await arq_pool.close()
-    await redis_client.aclose()
-    await http.aclose()
-    await meili.aclose()
+    await container.aclose()
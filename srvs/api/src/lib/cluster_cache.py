@@ -0,0 +1,105 @@
+"""
+Cache of quiz clustering results (cluster centers and thresholds).
+
+Clustering depends only on the chunks of the quiz materials and the quiz
+length (PCA and KMeans use a fixed random_state), so a quiz started again
+on the same materials reuses the centers instead of fetching every chunk
+vector and clustering. Each material has a generation token that is
+replaced when it is re-indexed or removed; entries are keyed by the tokens,
+so stale ones are never read and simply expire.
+"""
+
+import hashlib
+import json
+import struct
+import uuid
+from typing import Protocol
+
+import numpy as np
+import redis.asyncio as redis
+
+from .settings import settings
+
+CLUSTERS_KEY = "quizbee:clusters:{digest}"
+GENERATION_KEY = "quizbee:clusters:gen:{material_id}"
+# Entries are never refreshed, so a generation outliving them is enough
+GENERATION_TTL_MARGIN = 24 * 60 * 60
+
+# n centers, dim, n thresholds; then float32 centers and thresholds
+_HEADER = struct.Struct("<III")
+
+Clusters = tuple[list[list[float]], list[float]]
+
+
+def encode_clusters(centers: list[list[float]], thresholds: list[float]) -> bytes:
+    matrix = np.asarray(centers, dtype=np.float32).reshape(len(centers), -1)
+    header = _HEADER.pack(matrix.shape[0], matrix.shape[1], len(thresholds))
+    return header + matrix.tobytes() + np.asarray(thresholds, dtype=np.float32).tobytes()
+
+
+def decode_clusters(blob: bytes) -> Clusters:
+    n, dim, n_thresholds = _HEADER.unpack_from(blob)
+    values = np.frombuffer(blob, dtype=np.float32, offset=_HEADER.size)
+    centers = values[: n * dim].reshape(n, dim)
+    return centers.tolist(), values[n * dim : n * dim + n_thresholds].tolist()
+
+
+def cluster_key(
+    material_ids: list[str], generations: list[str], quiz_length: int
+) -> str:
+    raw = json.dumps([sorted(zip(material_ids, generations)), quiz_length])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class ClusterCache(Protocol):
+    async def generations(self, material_ids: list[str]) -> list[str]: ...
+    async def get(self, key: str) -> Clusters | None: ...
+    async def set(
+        self, key: str, centers: list[list[float]], thresholds: list[float]
+    ) -> None: ...
+    async def invalidate(self, material_id: str) -> None: ...
+
+
+class RedisClusterCache(ClusterCache):
+    """
+    Shared by the workers. Entries expire `ttl` seconds after they are
+    written; eviction under memory pressure is left to Redis.
+    """
+
+    def __init__(self, redis_client: redis.Redis, ttl: int = 7 * 24 * 60 * 60):
+        self.redis = redis_client
+        self.ttl = ttl
+
+    async def generations(self, material_ids: list[str]) -> list[str]:
+        if not material_ids:
+            return []
+        values = await self.redis.mget(
+            [GENERATION_KEY.format(material_id=m) for m in material_ids]
+        )
+        return [v.decode() if v else "0" for v in values]
+
+    async def get(self, key: str) -> Clusters | None:
+        blob = await self.redis.get(CLUSTERS_KEY.format(digest=key))
+        return decode_clusters(blob) if blob else None
+
+    async def set(
+        self, key: str, centers: list[list[float]], thresholds: list[float]
+    ) -> None:
+        await self.redis.set(
+            CLUSTERS_KEY.format(digest=key),
+            encode_clusters(centers, thresholds),
+            ex=self.ttl,
+        )
+
+    async def invalidate(self, material_id: str) -> None:
+        # A fresh random token, so an expired generation can never come back
+        # to a value that old entries were keyed with
+        await self.redis.set(
+            GENERATION_KEY.format(material_id=material_id),
+            uuid.uuid4().hex,
+            ex=self.ttl + GENERATION_TTL_MARGIN,
+        )
+
+
+def init_cluster_cache(redis_client: redis.Redis) -> ClusterCache:
+    return RedisClusterCache(redis_client, ttl=settings.cluster_cache_ttl)
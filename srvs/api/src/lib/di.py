@@ -6,6 +6,7 @@ from meilisearch_python_sdk import AsyncClient
 import httpx
 from pydantic_ai.providers.openai import OpenAIProvider
 
+from src.lib.http_pool import PooledPocketBase, create_http_client, create_meili_client
 from src.lib.settings import settings
 
 
@@ -14,15 +15,17 @@ def init_global_deps() -> (
 ):
     # Agent.instrument_all(settings.env == "local")
 
-    admin_pb = PocketBase(settings.pb_url)
+    admin_pb = PooledPocketBase(
+        create_http_client("pocketbase-admin", base_url=settings.pb_url)
+    )
     lf = Langfuse(
         public_key=settings.langfuse_public_key,
         secret_key=settings.langfuse_secret_key,
         host=settings.langfuse_host,
         environment=settings.env,
     )
-    meili = AsyncClient(settings.meili_url, settings.meili_master_key)
-    http = httpx.AsyncClient()
+    meili = create_meili_client(settings.meili_url, settings.meili_master_key)
+    http = create_http_client("default")
 
     grok_provider = OpenAIProvider(
         openai_client=AsyncOpenAI(
@@ -1,6 +1,7 @@
 """Distributed lock utilities using Redis."""
 
 import asyncio
+import contextlib
 import logging
 from contextlib import asynccontextmanager
 from typing import AsyncIterator
@@ -8,34 +9,74 @@ import uuid
 
 import redis.asyncio as redis
 
+from .latency import latency_recorder
+
 logger = logging.getLogger(__name__)
 
+# Release: delete the lock if we own it and hand it to one waiter.
+# KEYS[1] lock, KEYS[2] waiter count, KEYS[3] wake-up list
+# ARGV[1] token, ARGV[2] wake-up ttl (ms)
+_RELEASE = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+if tonumber(redis.call('GET', KEYS[2]) or '0') > 0 then
+    -- one pending wake-up is enough: it is consumed by the first waiter
+    redis.call('DEL', KEYS[3])
+    redis.call('RPUSH', KEYS[3], '1')
+    redis.call('PEXPIRE', KEYS[3], ARGV[2])
+end
+return 1
+"""
+
+# KEYS[1] lock; ARGV[1] token, ARGV[2] ttl (ms)
+_RENEW = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
 
-class DistributedLock:
-    """Distributed lock implementation using Redis."""
 
-    def __init__(self, redis_client: redis.Redis, lock_timeout: int = 300):
+class DistributedLock:
+    """
+    Distributed lock implementation using Redis.
+
+    Waiters block on a per-lock wake-up list (BLPOP) and are woken one at a
+    time by the release, instead of polling SET NX. The lock is a lease of
+    `lock_timeout` seconds that is renewed while the holder is alive, so a
+    crashed holder frees it quickly while long generation phases keep it.
+    Wait and hold times are recorded per key prefix (`lock_wait:<prefix>`,
+    `lock_hold:<prefix>` in latency_stats()).
+    """
+
+    def __init__(self, redis_client: redis.Redis, lock_timeout: int = 30):
         """
         Initialize distributed lock.
 
         Args:
             redis_client: Redis client instance
-            lock_timeout: Lock timeout in seconds (default 5 minutes)
+            lock_timeout: Lease in seconds, renewed every third of it while held
         """
         self.redis = redis_client
         self.lock_timeout = lock_timeout
+        # Sent as EVALSHA; the SDK falls back to EVAL after a script flush
+        self._release = redis_client.register_script(_RELEASE)
+        self._renew = redis_client.register_script(_RENEW)
 
     @asynccontextmanager
     async def lock(
-        self, key: str, wait_timeout: float = 60.0, retry_interval: float = 0.1
+        self, key: str, wait_timeout: float = 60.0, retry_interval: float = 1.0
     ) -> AsyncIterator[bool]:
         """
-        Acquire distributed lock with retries.
+        Acquire distributed lock, waiting for its release.
 
         Args:
             key: Lock key (e.g., "quiz:generate:quiz_id")
             wait_timeout: Maximum time to wait for lock acquisition in seconds
-            retry_interval: Time between retry attempts in seconds
+            retry_interval: Longest wait for a wake-up before trying again;
+                only matters when the holder died without releasing
 
         Yields:
             True if lock was acquired
@@ -47,43 +88,75 @@ class DistributedLock:
         lock_value = str(
             uuid.uuid4()
         )  # Unique token to prevent unlocking by other processes
+        prefix = key.rsplit(":", 1)[0]
+        ttl_ms = int(self.lock_timeout * 1000)
 
-        # Try to acquire lock with retries
-        start_time = asyncio.get_event_loop().time()
-        acquired = False
-
-        while not acquired:
-            # Try to set lock with NX (only if not exists) and EX (expiration)
-            acquired = await self.redis.set(
-                lock_key, lock_value, nx=True, ex=self.lock_timeout
-            )
-
-            if acquired:
-                logger.debug(f"Lock acquired: {lock_key}")
-                break
-
-            # Check timeout
-            elapsed = asyncio.get_event_loop().time() - start_time
-            if elapsed >= wait_timeout:
-                logger.warning(
-                    f"Failed to acquire lock {lock_key} within {wait_timeout}s"
-                )
-                raise TimeoutError(
-                    f"Could not acquire lock {key} within {wait_timeout} seconds"
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        try:
+            acquired = await self.redis.set(lock_key, lock_value, nx=True, px=ttl_ms)
+            if not acquired:
+                await self._wait(
+                    lock_key, lock_value, ttl_ms, start_time, wait_timeout, retry_interval
                 )
+        finally:
+            latency_recorder(f"lock_wait:{prefix}").observe(loop.time() - start_time)
+        logger.debug(f"Lock acquired: {lock_key}")
 
-            # Wait before retry
-            await asyncio.sleep(retry_interval)
-            logger.debug(
-                f"Waiting for lock {lock_key} (elapsed: {elapsed:.1f}s/{wait_timeout}s)"
-            )
-
+        held_at = loop.time()
+        keep_alive = asyncio.create_task(self._keep_alive(lock_key, lock_value, ttl_ms))
         try:
             yield True
         finally:
-            # Release lock only if we own it (check token)
-            if acquired:
-                await self._release_lock(lock_key, lock_value)
+            keep_alive.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await keep_alive
+            latency_recorder(f"lock_hold:{prefix}").observe(loop.time() - held_at)
+            await self._release_lock(lock_key, lock_value)
+
+    async def _wait(
+        self,
+        lock_key: str,
+        lock_value: str,
+        ttl_ms: int,
+        start_time: float,
+        wait_timeout: float,
+        retry_interval: float,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        waiters_key, wake_key = f"{lock_key}:waiters", f"{lock_key}:wake"
+        # Registered before the next attempt: a release after it always wakes us
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.incr(waiters_key)
+            pipe.expire(waiters_key, int(wait_timeout + self.lock_timeout) + 1)
+            await pipe.execute()
+        try:
+            while not await self.redis.set(lock_key, lock_value, nx=True, px=ttl_ms):
+                elapsed = loop.time() - start_time
+                if elapsed >= wait_timeout:
+                    logger.warning(
+                        f"Failed to acquire lock {lock_key} within {wait_timeout}s"
+                    )
+                    raise TimeoutError(
+                        f"Could not acquire lock {lock_key.removeprefix('lock:')} "
+                        f"within {wait_timeout} seconds"
+                    )
+                # timeout=0 would block forever
+                timeout = max(0.01, min(wait_timeout - elapsed, retry_interval))
+                await self.redis.blpop([wake_key], timeout=timeout)
+        finally:
+            with contextlib.suppress(Exception):
+                await self.redis.decr(waiters_key)
+
+    async def _keep_alive(self, lock_key: str, lock_value: str, ttl_ms: int) -> None:
+        while True:
+            await asyncio.sleep(self.lock_timeout / 3)
+            try:
+                if not await self._renew(keys=[lock_key], args=[lock_value, ttl_ms]):
+                    logger.error(f"Lock {lock_key} was lost while held")
+                    return
+            except Exception as e:
+                logger.warning(f"Failed to renew lock {lock_key}: {e}")
 
     async def _release_lock(self, lock_key: str, lock_value: str) -> None:
         """
@@ -93,17 +166,11 @@ class DistributedLock:
             lock_key: Redis key for the lock
             lock_value: Unique token that was used to acquire the lock
         """
-        # Lua script to atomically check token and delete if it matches
-        lua_script = """
-        if redis.call("get", KEYS[1]) == ARGV[1] then
-            return redis.call("del", KEYS[1])
-        else
-            return 0
-        end
-        """
-
         try:
-            result = await self.redis.eval(lua_script, 1, lock_key, lock_value)
+            result = await self._release(
+                keys=[lock_key, f"{lock_key}:waiters", f"{lock_key}:wake"],
+                args=[lock_value, int(self.lock_timeout * 1000)],
+            )
             if result:
                 logger.debug(f"Lock released: {lock_key}")
             else:
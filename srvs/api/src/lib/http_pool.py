@@ -0,0 +1,150 @@
+"""Centrally configured httpx transports with connection pool metrics."""
+
+import logging
+import time
+from typing import Any
+
+import httpx
+from meilisearch_python_sdk import AsyncClient as MeiliClient
+from meilisearch_python_sdk._http_requests import AsyncHttpRequests
+from pocketbase import PocketBase
+from pocketbase.client import PocketBaseInners
+from pocketbase.services.authorization import AuthStore
+
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+# name -> transport, for pool_stats(); one entry per configured pool
+_transports: dict[str, "InstrumentedTransport"] = {}
+
+
+def http_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry,
+    )
+
+
+def http_timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        settings.http_timeout,
+        connect=settings.http_connect_timeout,
+        pool=settings.http_pool_timeout,
+    )
+
+
+class InstrumentedTransport(httpx.AsyncHTTPTransport):
+    """
+    AsyncHTTPTransport that records how long requests wait for a connection.
+
+    Pool wait is measured from entering the pool until the first httpcore
+    trace event of the connection that serves the request (TCP connect for a
+    new connection, sending headers for a reused one).
+    """
+
+    def __init__(self, name: str, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.name = name
+        self.requests = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.new_connections = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        inner_trace = request.extensions.get("trace")
+        waited = False
+
+        async def trace(event_name: str, info: dict) -> None:
+            nonlocal waited
+            if not waited:
+                waited = True
+                wait = time.perf_counter() - started
+                self.wait_total += wait
+                self.wait_max = max(self.wait_max, wait)
+                if event_name.startswith("connection.connect_tcp"):
+                    self.new_connections += 1
+            if inner_trace is not None:
+                await inner_trace(event_name, info)
+
+        self.requests += 1
+        request.extensions = {**request.extensions, "trace": trace}
+        return await super().handle_async_request(request)
+
+    def stats(self) -> dict[str, Any]:
+        connections = list(self._pool.connections)
+        idle = sum(1 for c in connections if c.is_idle())
+        return {
+            "connections": len(connections),
+            "in_use": len(connections) - idle,
+            "idle": idle,
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "wait_avg_ms": (self.wait_total / self.requests * 1000) if self.requests else 0.0,
+            "wait_max_ms": self.wait_max * 1000,
+        }
+
+
+def create_http_client(
+    name: str,
+    base_url: str = "",
+    http2: bool | None = None,
+    **kwargs: Any,
+) -> httpx.AsyncClient:
+    """
+    Build an AsyncClient on a named, instrumented, pooled transport.
+
+    HTTP/2 is only negotiated over TLS (ALPN); plain http:// backends keep
+    using HTTP/1.1 keep-alive on the same pool.
+    """
+    transport = InstrumentedTransport(
+        name,
+        http2=settings.http2 if http2 is None else http2,
+        limits=http_limits(),
+    )
+    _transports[name] = transport
+    return httpx.AsyncClient(
+        base_url=base_url,
+        transport=transport,
+        timeout=http_timeout(),
+        **kwargs,
+    )
+
+
+def pool_stats() -> dict[str, dict[str, Any]]:
+    return {name: transport.stats() for name, transport in _transports.items()}
+
+
+class _SharedClientInners(PocketBaseInners):
+    def __init__(self, pocketbase: "PooledPocketBase", base_url: str) -> None:
+        self.auth = AuthStore(pocketbase, self)
+        self.client = pocketbase.shared_client
+
+
+class PooledPocketBase(PocketBase):
+    """
+    PocketBase whose requests go through a shared httpx client.
+
+    Auth state stays per instance, so a short-lived PooledPocketBase per user
+    token is cheap: it does not open its own connection pool.
+    """
+
+    _inner_cls_ = _SharedClientInners
+
+    def __init__(self, client: httpx.AsyncClient) -> None:
+        self.shared_client = client
+        super().__init__(str(client.base_url))
+
+
+def create_meili_client(url: str, api_key: str) -> MeiliClient:
+    meili = MeiliClient(url, api_key)
+    # The SDK builds its own default httpx client; swap in the pooled one
+    # keeping its auth / user-agent headers.
+    headers = dict(meili.http_client.headers)
+    meili.http_client = create_http_client("meilisearch", base_url=url, headers=headers)
+    meili._http_requests = AsyncHttpRequests(
+        meili.http_client, json_handler=meili.json_handler
+    )
+    return meili
@@ -0,0 +1,78 @@
+"""Apply Meilisearch index settings only when they actually change."""
+
+import hashlib
+import json
+import logging
+from typing import Any, Awaitable, Callable
+
+import redis.asyncio as redis
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+INDEX_SETTINGS_KEY = "quizbee:meili:settings:{index_uid}"
+# Stored hash expires so a wiped / restored Meili instance converges on its own
+INDEX_SETTINGS_TTL = 24 * 60 * 60  # seconds
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True, exclude_none=True)
+    raise TypeError(f"Cannot hash {type(value).__name__} in index settings")
+
+
+def settings_hash(payload: Any) -> str:
+    """Stable sha256 of the desired index settings."""
+    raw = json.dumps(payload, sort_keys=True, default=_to_json, separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+async def apply_index_settings(
+    redis_client: redis.Redis | None,
+    index_uid: str,
+    payload: Any,
+    apply: Callable[[], Awaitable[None]],
+) -> bool:
+    """
+    Run `apply` only if the hash of `payload` differs from the stored one.
+
+    Without a Redis client settings are applied unconditionally (old behaviour).
+    Redis failures never block startup: settings are applied and the hash is
+    simply not stored.
+
+    Args:
+        redis_client: Redis used as the settings hash store
+        index_uid: Meilisearch index uid
+        payload: JSON-serialisable description of the desired settings
+        apply: Coroutine factory pushing the settings to Meilisearch
+
+    Returns:
+        True if settings were pushed to Meilisearch, False if skipped
+    """
+    if redis_client is None:
+        await apply()
+        return True
+
+    key = INDEX_SETTINGS_KEY.format(index_uid=index_uid)
+    digest = settings_hash(payload)
+
+    try:
+        stored = await redis_client.get(key)
+    except Exception as e:
+        logger.warning(f"Could not read settings hash for index {index_uid}: {e}")
+        stored = None
+
+    if isinstance(stored, bytes):
+        stored = stored.decode()
+    if stored == digest:
+        logger.info(f"Index {index_uid} settings unchanged, skipping update")
+        return False
+
+    await apply()
+    logger.info(f"Index {index_uid} settings applied (hash {digest[:12]})")
+
+    try:
+        await redis_client.set(key, digest, ex=INDEX_SETTINGS_TTL)
+    except Exception as e:
+        logger.warning(f"Could not store settings hash for index {index_uid}: {e}")
+    return True
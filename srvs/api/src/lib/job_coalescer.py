@@ -0,0 +1,86 @@
+"""
+Coalescing of repeated requests for the same background work.
+
+Every request bumps a pending counter of its key and gets the job id of the
+key's current generation; requests that arrive before a job claims the
+counter share that job id, so ARQ keeps a single queued job for them. The
+job claims (and resets) the counter and does the combined amount of work;
+requests after the claim get the next job id.
+"""
+
+import logging
+from typing import Protocol
+
+import redis.asyncio as redis
+
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "quizbee:jobs:{key}:pending"
+SEQ_KEY = "quizbee:jobs:{key}:seq"
+CLAIMED_KEY = "quizbee:jobs:claimed:{job_id}"
+PENDING_TTL = 60 * 60
+# Outlives ARQ results of the key's jobs, so a job id is never reused
+SEQ_TTL = 7 * 24 * 60 * 60
+
+
+class JobCoalescer(Protocol):
+    async def request(self, key: str) -> str: ...
+    async def claim(self, key: str, job_id: str) -> int: ...
+
+
+# KEYS[1] pending, KEYS[2] seq; ARGV[1] pending ttl
+_REQUEST = """
+redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return tonumber(redis.call('GET', KEYS[2]) or '0')
+"""
+
+# KEYS[1] pending, KEYS[2] seq, KEYS[3] claimed; ARGV[1] seq ttl
+# A retried job gets the count of its first try instead of claiming again.
+# The marker has the seq's TTL, so it is gone by the time an expired seq
+# could hand its job id out again
+_CLAIM = """
+local claimed = redis.call('GET', KEYS[3])
+if claimed then
+    return tonumber(claimed)
+end
+local count = tonumber(redis.call('GET', KEYS[1]) or '0')
+redis.call('DEL', KEYS[1])
+redis.call('INCR', KEYS[2])
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+redis.call('SET', KEYS[3], count, 'EX', ARGV[1])
+return count
+"""
+
+
+class RedisJobCoalescer(JobCoalescer):
+    """Coalescer shared by the API (request) and the ARQ worker (claim)."""
+
+    def __init__(self, redis_client: redis.Redis):
+        self.redis = redis_client
+        self._request = redis_client.register_script(_REQUEST)
+        self._claim = redis_client.register_script(_CLAIM)
+
+    async def request(self, key: str) -> str:
+        seq = await self._request(
+            keys=[PENDING_KEY.format(key=key), SEQ_KEY.format(key=key)],
+            args=[PENDING_TTL],
+        )
+        return f"{settings.arq_job_prefix}{key}:{int(seq)}"
+
+    async def claim(self, key: str, job_id: str) -> int:
+        count = await self._claim(
+            keys=[
+                PENDING_KEY.format(key=key),
+                SEQ_KEY.format(key=key),
+                CLAIMED_KEY.format(job_id=job_id),
+            ],
+            args=[SEQ_TTL],
+        )
+        return int(count)
+
+
+def init_job_coalescer(redis_client: redis.Redis) -> JobCoalescer:
+    return RedisJobCoalescer(redis_client)
@@ -0,0 +1,55 @@
+"""In-process latency recorders for endpoint-level metrics (e.g. SSE TTFT)."""
+
+import time
+from collections import deque
+from typing import Any
+
+# name -> recorder, for latency_stats(); one entry per metric
+_recorders: dict[str, "LatencyRecorder"] = {}
+
+
+class LatencyRecorder:
+    """Keeps the last `window` samples and reports percentiles over them."""
+
+    def __init__(self, name: str, window: int = 1000):
+        self.name = name
+        self.count = 0
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self._samples.append(seconds)
+
+    def since(self, started: float) -> float:
+        """Record the time elapsed since `started` (a perf_counter value)."""
+        elapsed = time.perf_counter() - started
+        self.observe(elapsed)
+        return elapsed
+
+    def stats(self) -> dict[str, Any]:
+        ordered = sorted(self._samples)
+        if not ordered:
+            return {"count": self.count, "window": 0}
+
+        def pct(q: float) -> float:
+            return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+        return {
+            "count": self.count,
+            "window": len(ordered),
+            "mean_ms": sum(ordered) / len(ordered) * 1000,
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "p99_ms": pct(0.99),
+            "max_ms": ordered[-1] * 1000,
+        }
+
+
+def latency_recorder(name: str) -> LatencyRecorder:
+    if name not in _recorders:
+        _recorders[name] = LatencyRecorder(name)
+    return _recorders[name]
+
+
+def latency_stats() -> dict[str, dict[str, Any]]:
+    return {name: recorder.stats() for name, recorder in _recorders.items()}
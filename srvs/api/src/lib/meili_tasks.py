@@ -0,0 +1,161 @@
+"""
+Waiting for Meilisearch tasks without a fixed polling floor.
+
+`meili.wait_for_task` polls each task on its own every `interval_in_ms`,
+so a write that finishes in 20 ms still waits the full 0.5-1 s. The tracker
+polls all tasks of the process in one `GET /tasks?uids=...` request, starting
+a few milliseconds after a task is registered and backing off exponentially
+while nothing finishes.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Callable
+
+from meilisearch_python_sdk import AsyncClient
+from meilisearch_python_sdk.errors import MeilisearchTimeoutError
+from meilisearch_python_sdk.models.task import TaskResult
+
+logger = logging.getLogger(__name__)
+
+FINISHED = ("succeeded", "failed", "canceled")
+
+
+@dataclass(slots=True, kw_only=True)
+class _Pending:
+    future: asyncio.Future[TaskResult]
+    deadline: float
+
+
+class MeiliTaskTracker:
+    """
+    Shared by every writer of a Meilisearch client.
+
+    Coroutines waiting for the same task share one future; all tasks in
+    flight are polled together. `track` is the fire-and-forget variant for
+    writes whose result only matters to a callback.
+    """
+
+    def __init__(
+        self,
+        meili: AsyncClient,
+        min_interval: float = 0.005,
+        max_interval: float = 0.5,
+        backoff: float = 2.0,
+    ):
+        self.meili = meili
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self._pending: dict[int, _Pending] = {}
+        self._registered = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._callbacks: set[asyncio.Future] = set()
+
+    async def wait(self, task_uid: int, timeout: float = 30.0) -> TaskResult:
+        """
+        Same contract as `meili.wait_for_task`: the finished task, or
+        MeilisearchTimeoutError after `timeout` seconds.
+        """
+        # Cancelling one waiter must not cancel the others
+        return await asyncio.shield(self._register(task_uid, timeout))
+
+    def track(
+        self,
+        task_uid: int,
+        on_done: Callable[[TaskResult | None], None] | None = None,
+        timeout: float = 30.0,
+    ) -> None:
+        """
+        Follow the task in the background. `on_done` gets the finished task,
+        or None if it did not finish within `timeout` seconds.
+        """
+        future = self._register(task_uid, timeout)
+        self._callbacks.add(future)
+
+        def done(f: asyncio.Future[TaskResult]) -> None:
+            self._callbacks.discard(f)
+            task = None if f.cancelled() or f.exception() else f.result()
+            if task is None:
+                logger.warning(f"Meilisearch task {task_uid} was not confirmed")
+            elif task.status != "succeeded":
+                logger.error(f"Meilisearch task {task_uid} {task.status}: {task.error}")
+            if on_done is None:
+                return
+            try:
+                on_done(task)
+            except Exception as e:
+                logger.error(f"Callback of Meilisearch task {task_uid} failed: {e}")
+
+        future.add_done_callback(done)
+
+    def stats(self) -> dict[str, int]:
+        return {"pending": len(self._pending)}
+
+    async def aclose(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for pending in self._pending.values():
+            pending.future.cancel()
+        self._pending.clear()
+
+    def _register(self, task_uid: int, timeout: float) -> asyncio.Future[TaskResult]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        pending = self._pending.get(task_uid)
+        if pending is None:
+            future = loop.create_future()
+            # Nobody may be left to retrieve a timeout
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            pending = self._pending[task_uid] = _Pending(
+                future=future, deadline=deadline
+            )
+        else:
+            pending.deadline = max(pending.deadline, deadline)
+        self._registered.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="meili-task-tracker")
+        return pending.future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        interval = self.min_interval
+        while self._pending:
+            self._registered.clear()
+            try:
+                await asyncio.wait_for(self._registered.wait(), interval)
+                # New task: poll soon again, it may be a quick one
+                interval = self.min_interval
+                await asyncio.sleep(self.min_interval)
+            except TimeoutError:
+                interval = min(interval * self.backoff, self.max_interval)
+
+            uids = list(self._pending)
+            try:
+                tasks = await self.meili.get_tasks(uids=uids, limit=len(uids))
+            except Exception as e:
+                logger.warning(f"Polling {len(uids)} Meilisearch tasks failed: {e}")
+                tasks = None
+
+            for task in tasks.results if tasks is not None else ():
+                if task.status in FINISHED:
+                    pending = self._pending.pop(task.uid, None)
+                    if pending is not None and not pending.future.done():
+                        pending.future.set_result(task)
+
+            now = loop.time()
+            for uid, pending in list(self._pending.items()):
+                if now >= pending.deadline:
+                    del self._pending[uid]
+                    if not pending.future.done():
+                        pending.future.set_exception(
+                            MeilisearchTimeoutError(
+                                f"Meilisearch task {uid} did not finish in time"
+                            )
+                        )
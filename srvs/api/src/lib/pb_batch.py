@@ -0,0 +1,89 @@
+"""PocketBase batch API (`POST /api/batch`) with a bounded concurrent fallback."""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from pocketbase import PocketBase
+from pocketbase.models.errors import PocketBaseError
+from pocketbase.services.base import Service
+
+logger = logging.getLogger(__name__)
+
+# PocketBase default for Settings > Batch > max requests
+BATCH_MAX_REQUESTS = 50
+# Used when the batch API is disabled on the server
+FALLBACK_CONCURRENCY = 8
+
+
+@dataclass(slots=True, kw_only=True)
+class BatchRequest:
+    method: Literal["POST", "PATCH", "DELETE"]
+    collection: str
+    record_id: str = ""
+    body: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def url(self) -> str:
+        url = f"/api/collections/{self.collection}/records"
+        return f"{url}/{self.record_id}" if self.record_id else url
+
+
+class _BatchService(Service):
+    __base_sub_path__ = "/api/batch"
+
+    async def send(self, requests: list[BatchRequest]) -> Any:
+        body = {
+            "requests": [
+                {"method": r.method, "url": r.url, "body": r.body} for r in requests
+            ]
+        }
+        return await self._send("", {"method": "POST", "body": body})
+
+
+class PBBatchWriter:
+    """
+    Writes records in as few round trips as possible.
+
+    Each batch of up to BATCH_MAX_REQUESTS runs in one PocketBase
+    transaction. If the batch API is disabled (403), falls back to
+    concurrent single-record calls, at most FALLBACK_CONCURRENCY at a time,
+    for the requests not committed yet.
+    """
+
+    def __init__(self, pb: PocketBase):
+        self.pb = pb
+        self._batch_enabled = True
+
+    async def write(self, requests: list[BatchRequest]) -> None:
+        if len(requests) > 1 and self._batch_enabled:
+            service = _BatchService(self.pb, self.pb._inners)
+            sent = 0
+            try:
+                while sent < len(requests):
+                    chunk = requests[sent : sent + BATCH_MAX_REQUESTS]
+                    await service.send(chunk)
+                    sent += len(chunk)
+                return
+            except PocketBaseError as e:
+                if e.status != 403:
+                    raise
+                logger.warning("PocketBase batch API is disabled, writing one by one")
+                self._batch_enabled = False
+                # Earlier chunks are already committed
+                requests = requests[sent:]
+
+        semaphore = asyncio.Semaphore(FALLBACK_CONCURRENCY)
+
+        async def one(request: BatchRequest) -> None:
+            async with semaphore:
+                records = self.pb.collection(request.collection)
+                if request.method == "POST":
+                    await records.create(request.body)
+                elif request.method == "PATCH":
+                    await records.update(request.record_id, request.body)
+                else:
+                    await records.delete(request.record_id)
+
+        await asyncio.gather(*(one(r) for r in requests))
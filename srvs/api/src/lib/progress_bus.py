@@ -0,0 +1,245 @@
+"""
+Per-user progress events: generated quiz items, material indexing, quiz
+finalization.
+
+The ARQ worker publishes to one Redis Stream per user; an API process keeps
+a single `ProgressHub` reader for all of its SSE connections, so N open
+pages of a user cost one XREAD key, not N polling loops.
+"""
+
+import asyncio
+import json
+import logging
+import re
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Any, Protocol
+
+import redis.asyncio as redis
+
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_KEY = "quizbee:progress:{user_id}"
+ENTRY_ID = re.compile(r"^\d+-\d+$")
+
+
+class ProgressKind(StrEnum):
+    ITEM_READY = "item-ready"
+    MATERIAL_PROGRESS = "material-progress"
+    QUIZ_FINALIZED = "quiz-finalized"
+
+
+@dataclass(slots=True, kw_only=True)
+class ProgressEvent:
+    user_id: str
+    kind: ProgressKind
+    data: dict[str, Any] = field(default_factory=dict)
+    # Stream entry id ("<ms>-<seq>"); sent as the SSE id for Last-Event-ID
+    id: str = ""
+
+
+def _id_key(entry_id: str) -> tuple[int, int]:
+    ms, _, seq = entry_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+class ProgressBus(Protocol):
+    async def publish(
+        self, user_id: str, kind: ProgressKind, data: dict[str, Any]
+    ) -> None: ...
+    async def last_id(self, user_id: str) -> str: ...
+    async def read(
+        self, cursors: dict[str, str], block: float
+    ) -> list[ProgressEvent]: ...
+    async def replay(self, user_id: str, after: str) -> list[ProgressEvent]: ...
+
+
+class RedisProgressBus(ProgressBus):
+    """
+    One capped stream per user (XADD MAXLEN ~), expiring when the user has
+    been idle for `ttl` seconds.
+    """
+
+    def __init__(self, redis_client: redis.Redis, maxlen: int = 500, ttl: int = 3600):
+        self.redis = redis_client
+        self.maxlen = maxlen
+        self.ttl = ttl
+
+    async def publish(
+        self, user_id: str, kind: ProgressKind, data: dict[str, Any]
+    ) -> None:
+        key = PROGRESS_KEY.format(user_id=user_id)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.xadd(
+                key,
+                {"kind": str(kind), "data": json.dumps(data)},
+                maxlen=self.maxlen,
+                approximate=True,
+            )
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
+
+    async def last_id(self, user_id: str) -> str:
+        entries = await self.redis.xrevrange(
+            PROGRESS_KEY.format(user_id=user_id), count=1
+        )
+        return _decode(entries[0][0]) if entries else "0-0"
+
+    async def read(self, cursors: dict[str, str], block: float) -> list[ProgressEvent]:
+        streams = {PROGRESS_KEY.format(user_id=u): c for u, c in cursors.items()}
+        response = await self.redis.xread(
+            streams, count=100, block=max(1, int(block * 1000))
+        )
+        events = []
+        for key, entries in response or []:
+            user_id = _decode(key).rsplit(":", 1)[1]
+            events.extend(self._event(user_id, *entry) for entry in entries)
+        return events
+
+    async def replay(self, user_id: str, after: str) -> list[ProgressEvent]:
+        entries = await self.redis.xrange(
+            PROGRESS_KEY.format(user_id=user_id), min=f"({after}", count=self.maxlen
+        )
+        return [self._event(user_id, *entry) for entry in entries]
+
+    def _event(self, user_id: str, entry_id, fields: dict) -> ProgressEvent:
+        fields = {_decode(k): _decode(v) for k, v in fields.items()}
+        return ProgressEvent(
+            user_id=user_id,
+            kind=ProgressKind(fields["kind"]),
+            data=json.loads(fields["data"]),
+            id=_decode(entry_id),
+        )
+
+
+def _decode(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+async def publish_progress(
+    bus: ProgressBus | None, user_id: str, kind: ProgressKind, data: dict[str, Any]
+) -> None:
+    """Best effort: progress must never fail the job that reports it."""
+    if bus is None:
+        return
+    try:
+        await bus.publish(user_id, kind, data)
+    except Exception as e:
+        logger.warning(f"Progress event {kind} for {user_id} not published: {e}")
+
+
+class ProgressHub:
+    """
+    Fans the streams of all users connected to this process out to their
+    SSE connections using one reader task.
+
+    A user that connects while the reader is blocked is picked up within
+    `block` seconds; nothing is lost, its cursor is taken at subscribe time.
+    """
+
+    def __init__(self, bus: ProgressBus, block: float = 1.0, queue_size: int = 1000):
+        self.bus = bus
+        self.block = block
+        self.queue_size = queue_size
+        self._subscribers: dict[str, set[asyncio.Queue[ProgressEvent]]] = {}
+        self._cursors: dict[str, str] = {}
+        self._task: asyncio.Task | None = None
+
+    async def subscribe(
+        self,
+        user_id: str,
+        last_event_id: str | None = None,
+        heartbeat: float | None = None,
+    ) -> AsyncIterator[ProgressEvent | None]:
+        """
+        Events of the user from now on (or after `last_event_id`); None is
+        yielded after `heartbeat` idle seconds so the caller can ping.
+        """
+        if last_event_id and not ENTRY_ID.match(last_event_id):
+            last_event_id = None
+        queue: asyncio.Queue[ProgressEvent] = asyncio.Queue(self.queue_size)
+        tracked = user_id in self._cursors
+        if not tracked:
+            cursor = last_event_id or await self.bus.last_id(user_id)
+            self._cursors.setdefault(user_id, cursor)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        self._ensure_reader()
+        seen = "0-0"
+        try:
+            # The reader is already past the client's last event: replay the
+            # gap, anything also queued meanwhile is skipped below
+            if last_event_id and tracked:
+                for event in await self.bus.replay(user_id, last_event_id):
+                    seen = event.id
+                    yield event
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), heartbeat)
+                except TimeoutError:
+                    yield None
+                    continue
+                # Already sent as part of the replay
+                if _id_key(event.id) > _id_key(seen):
+                    yield event
+        finally:
+            queues = self._subscribers.get(user_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[user_id]
+                    self._cursors.pop(user_id, None)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "users": len(self._subscribers),
+            "connections": sum(len(q) for q in self._subscribers.values()),
+        }
+
+    async def aclose(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _ensure_reader(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while self._subscribers:
+            try:
+                events = await self.bus.read(dict(self._cursors), self.block)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Progress stream read failed: {e}")
+                await asyncio.sleep(self.block)
+                continue
+
+            for event in events:
+                if event.user_id not in self._cursors:
+                    continue  # everyone left while we were reading
+                self._cursors[event.user_id] = event.id
+                for queue in self._subscribers.get(event.user_id, ()):
+                    try:
+                        queue.put_nowait(event)
+                    except asyncio.QueueFull:
+                        logger.warning(
+                            f"Progress subscriber of {event.user_id} is too slow, "
+                            f"dropping {event.id}"
+                        )
+
+
+def init_progress_bus(redis_client: redis.Redis) -> ProgressBus:
+    return RedisProgressBus(
+        redis_client,
+        maxlen=settings.progress_stream_maxlen,
+        ttl=settings.progress_stream_ttl,
+    )
@@ -50,6 +50,66 @@ class Settings(BaseSettings):
     meili_url: str = Field(default="http://localhost:7700")
     meili_master_key: str = Field(default="key")
 
+    # Outgoing HTTP connection pools (PocketBase, Meilisearch, file downloads).
+    # Limits are per client / backend. httpcore pool scheduling costs
+    # O(queued requests x connections) per event, so small pools are faster.
+    http_max_connections: int = Field(default=16)
+    http_max_keepalive_connections: int = Field(default=16)
+    http_keepalive_expiry: float = Field(default=30.0)
+    http_timeout: float = Field(default=30.0)
+    http_connect_timeout: float = Field(default=5.0)
+    http_pool_timeout: float = Field(default=10.0)
+    http2: bool = Field(default=True)
+
+    # Validated principal cache (keyed by token hash), seconds
+    principal_cache_ttl: float = Field(default=5.0)
+    principal_cache_redis_ttl: float = Field(default=30.0)
+
+    # Write-behind usage metering: how often deltas are flushed to PocketBase,
+    # and how long a flush owns a user's claimed usage before another takes it
+    usage_flush_interval: float = Field(default=2.0)
+    usage_claim_lease: float = Field(default=60.0)
+
+    # Explainer retrieval cache: TTL (seconds) and the query-embedding cosine
+    # similarity above which an earlier retrieval is reused
+    explainer_retrieval_cache_ttl: float = Field(default=600.0)
+    explainer_retrieval_similarity: float = Field(default=0.95)
+
+    # Explainer SSE: at most one text frame per window (seconds), the first
+    # one is not delayed; a frame stops growing at max_chars
+    explainer_stream_window: float = Field(default=0.1)
+    explainer_stream_max_chars: int = Field(default=1024)
+
+    # Progress events (Redis Streams): entries kept per user, idle expiry
+    # (seconds) and the SSE keep-alive interval
+    progress_stream_maxlen: int = Field(default=500)
+    progress_stream_ttl: int = Field(default=3600)
+    progress_sse_heartbeat: float = Field(default=15.0)
+
+    # Generator chunk selection: ranking score minus penalty x uses of the
+    # chunk in the user's quizzes, over limit x overfetch candidates; usage
+    # counters expire after coverage_ttl idle seconds
+    coverage_usage_penalty: float = Field(default=0.1)
+    coverage_overfetch: int = Field(default=4)
+    coverage_ttl: int = Field(default=90 * 24 * 60 * 60)
+
+    # Quiz clustering results, reused by quizzes on the same materials and
+    # length: expiry (seconds) in Redis
+    cluster_cache_ttl: int = Field(default=7 * 24 * 60 * 60)
+
+    # Quizzes with more chunks than the threshold fit PCA+KMeans on a
+    # stratified sample of cluster_sample_size chunks and assign the rest
+    cluster_sample_threshold: int = Field(default=8000)
+    cluster_sample_size: int = Field(default=4000)
+
+    # Local float32 copy of chunk vectors per material, memory-mapped by
+    # clustering; the worker both indexes and clusters materials, so a
+    # worker-local directory is enough. Empty disables. The explainer reads
+    # it from the API only when vector_store_shared says both mount the same
+    # volume, otherwise it asks Meilisearch
+    vector_store_dir: str = Field(default="/tmp/quizbee/vectors")
+    vector_store_shared: bool = Field(default=False)
+
     # Langfuse configuration
     langfuse_public_key: str = Field(default="key")
     langfuse_secret_key: str = Field(default="key")
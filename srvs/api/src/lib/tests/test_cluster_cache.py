@@ -0,0 +1,38 @@
+import fakeredis
+import numpy as np
+
+from src.lib.cluster_cache import (
+    RedisClusterCache,
+    cluster_key,
+    decode_clusters,
+    encode_clusters,
+)
+
+CENTERS = [[0.25, -1.5, 3.0], [1.0, 0.0, 0.5]]
+THRESHOLDS = [0.7, 0.65]
+
+
+def test_compact_round_trip():
+    blob = encode_clusters(CENTERS, THRESHOLDS)
+
+    assert len(blob) == 12 + 4 * (6 + 2)
+    centers, thresholds = decode_clusters(blob)
+    assert centers == CENTERS
+    assert np.allclose(thresholds, THRESHOLDS)
+
+
+async def test_key_ignores_material_order_and_follows_invalidation():
+    cache = RedisClusterCache(fakeredis.FakeAsyncRedis(), ttl=60)
+
+    async def key(material_ids: list[str], length: int) -> str:
+        return cluster_key(material_ids, await cache.generations(material_ids), length)
+
+    first = await key(["m1", "m2"], 10)
+    assert first == await key(["m2", "m1"], 10)
+    assert first != await key(["m1", "m2"], 20)
+    await cache.set(first, CENTERS, THRESHOLDS)
+    assert (await cache.get(first))[0] == CENTERS
+
+    await cache.invalidate("m2")
+    assert await key(["m1", "m2"], 10) != first
+    assert await key(["m1"], 10) == await key(["m1"], 10)
@@ -0,0 +1,73 @@
+import asyncio
+
+import fakeredis
+import pytest
+
+from src.lib.distributed_lock import DistributedLock
+from src.lib.latency import latency_stats
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeAsyncRedis()
+
+
+async def test_release_wakes_waiter_without_polling(redis_client):
+    lock = DistributedLock(redis_client, lock_timeout=5)
+    loop = asyncio.get_running_loop()
+    released_at = 0.0
+
+    async def holder():
+        nonlocal released_at
+        async with lock.lock("quiz:generate:q1"):
+            await asyncio.sleep(0.05)
+            released_at = loop.time()
+
+    task = asyncio.create_task(holder())
+    await asyncio.sleep(0.01)
+    # A retry interval far longer than the hold: only the wake-up gets us in
+    async with lock.lock("quiz:generate:q1", retry_interval=5.0):
+        handoff = loop.time() - released_at
+    await task
+
+    assert handoff < 0.5
+    stats = latency_stats()
+    assert stats["lock_wait:quiz:generate"]["count"] >= 2
+    assert stats["lock_hold:quiz:generate"]["count"] >= 2
+
+
+async def test_mutual_exclusion(redis_client):
+    lock = DistributedLock(redis_client, lock_timeout=5)
+    inside = 0
+    peak = 0
+
+    async def worker():
+        nonlocal inside, peak
+        async with lock.lock("quiz:generate:q2", retry_interval=0.5):
+            inside += 1
+            peak = max(peak, inside)
+            await asyncio.sleep(0.01)
+            inside -= 1
+
+    await asyncio.wait_for(asyncio.gather(*(worker() for _ in range(10))), 5)
+    assert peak == 1
+    assert await redis_client.exists("lock:quiz:generate:q2") == 0
+
+
+async def test_lease_is_renewed_while_held(redis_client):
+    lock = DistributedLock(redis_client, lock_timeout=0.3)
+    async with lock.lock("quiz:generate:q3"):
+        await asyncio.sleep(0.5)
+        assert await redis_client.exists("lock:quiz:generate:q3") == 1
+
+    with pytest.raises(TimeoutError):
+        async with lock.lock("quiz:generate:q4"):
+            async with lock.lock("quiz:generate:q4", wait_timeout=0.1):
+                pass
+
+
+async def test_release_of_lost_lock_is_a_noop(redis_client):
+    lock = DistributedLock(redis_client, lock_timeout=5)
+    async with lock.lock("quiz:generate:q5"):
+        await redis_client.set("lock:quiz:generate:q5", "someone-else")
+    assert await redis_client.get("lock:quiz:generate:q5") == b"someone-else"
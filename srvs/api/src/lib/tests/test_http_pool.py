@@ -0,0 +1,58 @@
+import asyncio
+import json
+
+from src.lib.http_pool import PooledPocketBase, create_http_client, pool_stats
+
+TOKEN = "eyJhbGciOiJIUzI1NiJ9.eyJpZCI6InUxIiwiZXhwIjo0MTAyNDQ0ODAwfQ.sig"
+BODY = json.dumps({"token": TOKEN, "record": {"id": "u1"}}).encode()
+
+
+async def _serve() -> tuple[asyncio.Server, str, list[str]]:
+    seen_auth: list[str] = []
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                for line in head.decode().split("\r\n"):
+                    if line.lower().startswith("authorization:"):
+                        seen_auth.append(line.split(":", 1)[1].strip())
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: " + str(len(BODY)).encode() + b"\r\n\r\n" + BODY
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"http://127.0.0.1:{port}", seen_auth
+
+
+async def test_user_token_clients_share_one_pool():
+    server, url, seen_auth = await _serve()
+    shared = create_http_client("test-pb-user", base_url=url)
+
+    async def refresh(token: str):
+        pb = PooledPocketBase(shared)
+        pb._inners.auth.set_user({"token": token, "record": {}})
+        return await pb.collection("users").auth.refresh()
+
+    try:
+        results = await asyncio.gather(*(refresh(TOKEN) for _ in range(40)))
+        assert all(r["record"]["id"] == "u1" for r in results)
+
+        stats = pool_stats()["test-pb-user"]
+        assert stats["requests"] == 40
+        assert stats["in_use"] == 0
+        assert 0 < stats["connections"] <= 16
+        assert stats["new_connections"] <= 16
+        assert stats["wait_max_ms"] >= stats["wait_avg_ms"] >= 0
+        # auth stays per PocketBase instance even though the pool is shared
+        assert seen_auth == [TOKEN] * 40
+    finally:
+        await shared.aclose()
+        server.close()
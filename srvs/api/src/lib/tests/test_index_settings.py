@@ -0,0 +1,70 @@
+from meilisearch_python_sdk.models.settings import UserProvidedEmbedder
+
+from src.lib.index_settings import (
+    INDEX_SETTINGS_KEY,
+    apply_index_settings,
+    settings_hash,
+)
+
+
+class MemoryRedis:
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self.data.get(key)
+
+    async def set(self, key: str, value: str, ex: int | None = None) -> None:
+        self.data[key] = value.encode()
+
+
+class BrokenRedis:
+    async def get(self, key: str):
+        raise ConnectionError("redis is down")
+
+    async def set(self, key: str, value: str, ex: int | None = None):
+        raise ConnectionError("redis is down")
+
+
+PAYLOAD = {
+    "embedders": {"chunks": UserProvidedEmbedder(source="userProvided", dimensions=1024)},
+    "filterableAttributes": ["userId", "materialId"],
+}
+
+
+def _counter():
+    calls = []
+
+    async def apply():
+        calls.append(1)
+
+    return calls, apply
+
+
+def test_hash_is_stable_and_order_independent():
+    a = settings_hash({"x": [1, 2], "y": PAYLOAD})
+    b = settings_hash({"y": PAYLOAD, "x": [1, 2]})
+    assert a == b
+    assert a != settings_hash({"x": [2, 1], "y": PAYLOAD})
+
+
+async def test_applies_once_until_settings_change():
+    redis_client = MemoryRedis()
+    calls, apply = _counter()
+
+    assert await apply_index_settings(redis_client, "chunks", PAYLOAD, apply)  # type: ignore[arg-type]
+    assert not await apply_index_settings(redis_client, "chunks", PAYLOAD, apply)  # type: ignore[arg-type]
+    assert len(calls) == 1
+    assert INDEX_SETTINGS_KEY.format(index_uid="chunks") in redis_client.data
+
+    changed = {**PAYLOAD, "filterableAttributes": ["userId"]}
+    assert await apply_index_settings(redis_client, "chunks", changed, apply)  # type: ignore[arg-type]
+    assert len(calls) == 2
+
+
+async def test_applies_without_or_with_unavailable_redis():
+    calls, apply = _counter()
+
+    assert await apply_index_settings(None, "chunks", PAYLOAD, apply)
+    assert await apply_index_settings(BrokenRedis(), "chunks", PAYLOAD, apply)  # type: ignore[arg-type]
+    assert len(calls) == 2
@@ -0,0 +1,19 @@
+import fakeredis
+
+from src.lib.job_coalescer import CLAIMED_KEY, SEQ_KEY, SEQ_TTL, RedisJobCoalescer
+
+
+async def test_claim_marker_lives_as_long_as_the_seq():
+    redis_client = fakeredis.FakeAsyncRedis()
+    coalescer = RedisJobCoalescer(redis_client)
+
+    job_id = await coalescer.request("q1")
+    await coalescer.request("q1")
+    assert await coalescer.claim("q1", job_id) == 2
+    # A retry of the same job reads the marker instead of claiming again
+    await coalescer.request("q1")
+    assert await coalescer.claim("q1", job_id) == 2
+
+    claimed_ttl = await redis_client.ttl(CLAIMED_KEY.format(job_id=job_id))
+    seq_ttl = await redis_client.ttl(SEQ_KEY.format(key="q1"))
+    assert claimed_ttl == seq_ttl == SEQ_TTL
@@ -0,0 +1,24 @@
+from src.lib.utils.markers import replace_markers
+
+
+def test_replaces_all_markers():
+    text = "a {img1} b {img2} c {img1}"
+    res = replace_markers(text, {"{img1}": "X", "{img2}": "Y"})
+    assert res == "a X b Y c X"
+
+
+def test_longest_marker_wins_over_prefix():
+    text = "{img1} {img10} {img100}"
+    res = replace_markers(text, {"{img1": "A", "{img10": "B", "{img100}": "C"})
+    assert res == "A} B} C"
+
+
+def test_replacement_values_are_not_rescanned():
+    res = replace_markers("{a} {b}", {"{a}": "{b}", "{b}": "done"})
+    assert res == "{b} done"
+
+
+def test_empty_inputs_are_returned_as_is():
+    assert replace_markers("", {"{a}": "x"}) == ""
+    assert replace_markers("text", {}) == "text"
+    assert replace_markers("text", {"": "x"}) == "text"
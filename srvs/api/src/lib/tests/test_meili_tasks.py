@@ -0,0 +1,58 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from meilisearch_python_sdk.errors import MeilisearchTimeoutError
+
+from src.lib.meili_tasks import MeiliTaskTracker
+
+
+class FakeMeili:
+    """Task `uid` finishes `uid` milliseconds after it is first polled."""
+
+    def __init__(self):
+        self.polls: list[list[int]] = []
+        self.first_seen: dict[int, float] = {}
+
+    async def get_tasks(self, uids, limit):
+        now = asyncio.get_running_loop().time()
+        self.polls.append(sorted(uids))
+        results = []
+        for uid in uids:
+            started = self.first_seen.setdefault(uid, now)
+            done = uid < 1000 and now - started >= uid / 1000
+            status = "succeeded" if done else "processing"
+            results.append(SimpleNamespace(uid=uid, status=status, error=None))
+        return SimpleNamespace(results=results)
+
+
+async def test_waiters_share_polls_and_quick_tasks_return_quickly():
+    meili = FakeMeili()
+    tracker = MeiliTaskTracker(meili)
+    loop = asyncio.get_running_loop()
+
+    started = loop.time()
+    tasks = await asyncio.gather(
+        tracker.wait(5), tracker.wait(5), tracker.wait(10), tracker.wait(300)
+    )
+    assert [t.uid for t in tasks] == [5, 5, 10, 300]
+    # No 500 ms floor: the quick ones do not wait for the slow one
+    assert loop.time() - started < 0.5
+    # Every poll covers all tasks in flight, a waiter does not add requests
+    assert meili.polls[0] == [5, 10, 300]
+    assert len(meili.polls) < 20
+
+
+async def test_track_calls_back_and_times_out():
+    tracker = MeiliTaskTracker(FakeMeili())
+    results = []
+
+    tracker.track(1, on_done=results.append)
+    tracker.track(5000, on_done=results.append, timeout=0.05)
+    with pytest.raises(MeilisearchTimeoutError):
+        await tracker.wait(5001, timeout=0.05)
+    await asyncio.sleep(0.05)
+
+    assert results[0].uid == 1 and results[1] is None
+    assert tracker.stats() == {"pending": 0}
+    await tracker.aclose()
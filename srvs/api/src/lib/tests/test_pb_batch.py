@@ -0,0 +1,87 @@
+import asyncio
+import json
+
+import httpx
+
+from src.lib.http_pool import PooledPocketBase
+from src.lib.pb_batch import BATCH_MAX_REQUESTS, FALLBACK_CONCURRENCY, BatchRequest, PBBatchWriter
+
+
+def _pb(handler) -> PooledPocketBase:
+    client = httpx.AsyncClient(
+        base_url="http://pb.test", transport=httpx.MockTransport(handler)
+    )
+    return PooledPocketBase(client)
+
+
+def _requests(n: int) -> list[BatchRequest]:
+    return [
+        BatchRequest(method="POST", collection="messages", body={"id": f"m{i}"})
+        for i in range(n)
+    ]
+
+
+async def test_writes_go_through_batch_api_in_chunks():
+    batches: list[list[dict]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/api/batch"
+        batches.append(json.loads(request.content)["requests"])
+        return httpx.Response(200, json=[])
+
+    await PBBatchWriter(_pb(handler)).write(_requests(BATCH_MAX_REQUESTS + 20))
+
+    assert [len(b) for b in batches] == [BATCH_MAX_REQUESTS, 20]
+    assert batches[0][0] == {
+        "method": "POST",
+        "url": "/api/collections/messages/records",
+        "body": {"id": "m0"},
+    }
+
+
+async def test_disabled_batch_api_falls_back_to_capped_concurrency():
+    paths: list[str] = []
+    in_flight = peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        paths.append(request.url.path)
+        if request.url.path == "/api/batch":
+            return httpx.Response(403, json={"message": "Batch requests are not allowed."})
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={"id": "x"})
+
+    writer = PBBatchWriter(_pb(handler))
+    await writer.write(_requests(20))
+    await writer.write(_requests(2))
+
+    # The batch endpoint is probed once, then skipped
+    assert paths.count("/api/batch") == 1
+    assert paths.count("/api/collections/messages/records") == 22
+    assert peak == FALLBACK_CONCURRENCY
+
+
+async def test_fallback_after_partial_batch_skips_committed_chunks():
+    batch_calls = 0
+    created: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal batch_calls
+        if request.url.path == "/api/batch":
+            batch_calls += 1
+            if batch_calls == 1:
+                return httpx.Response(200, json=[])
+            return httpx.Response(403, json={"message": "Batch requests are not allowed."})
+        created.append(json.loads(request.content)["id"])
+        return httpx.Response(200, json={"id": "x"})
+
+    await PBBatchWriter(_pb(handler)).write(_requests(BATCH_MAX_REQUESTS + 3))
+
+    # The first chunk was committed by the batch call
+    assert sorted(created) == sorted(
+        f"m{i}" for i in range(BATCH_MAX_REQUESTS, BATCH_MAX_REQUESTS + 3)
+    )
+
@@ -0,0 +1,96 @@
+import asyncio
+
+import fakeredis
+
+from src.lib.progress_bus import (
+    ProgressHub,
+    ProgressKind,
+    RedisProgressBus,
+    publish_progress,
+)
+
+
+def redis_bus() -> RedisProgressBus:
+    return RedisProgressBus(fakeredis.FakeAsyncRedis())
+
+
+class CountingBus(RedisProgressBus):
+    def __init__(self):
+        super().__init__(fakeredis.FakeAsyncRedis())
+        self.reads: list[set[str]] = []
+
+    async def read(self, cursors, block):
+        self.reads.append(set(cursors))
+        return await super().read(cursors, block)
+
+
+async def take(stream, n: int) -> list:
+    return [await asyncio.wait_for(anext(stream), 1) for _ in range(n)]
+
+
+async def test_connections_share_one_reader_and_get_only_their_events():
+    bus = CountingBus()
+    hub = ProgressHub(bus, block=0.05)
+    tab_a = hub.subscribe("u1")
+    tab_b = hub.subscribe("u1")
+    other = hub.subscribe("u2")
+    pending = [asyncio.ensure_future(take(s, 1)) for s in (tab_a, tab_b, other)]
+    await asyncio.sleep(0.01)
+
+    await bus.publish("u1", ProgressKind.ITEM_READY, {"id": "i1"})
+    await bus.publish("u2", ProgressKind.QUIZ_FINALIZED, {"quiz": "q2"})
+
+    (a,), (b,), (o,) = await asyncio.gather(*pending)
+    assert a.data == b.data == {"id": "i1"}
+    assert o.kind == ProgressKind.QUIZ_FINALIZED
+    # One multiplexed read per round, not one per connection
+    assert hub.stats() == {"users": 2, "connections": 3}
+    assert max(len(keys) for keys in bus.reads) == 2
+
+    for stream in (tab_a, tab_b, other):
+        await stream.aclose()
+    assert hub.stats() == {"users": 0, "connections": 0}
+    await hub.aclose()
+
+
+async def test_reconnect_replays_missed_events_once():
+    bus = redis_bus()
+    hub = ProgressHub(bus, block=0.05)
+    first = hub.subscribe("u1")
+    first_event = asyncio.ensure_future(take(first, 1))
+    # Another tab keeps the user tracked, so the reader moves on
+    keep = hub.subscribe("u1")
+    pending = asyncio.ensure_future(take(keep, 3))
+    await asyncio.sleep(0.01)
+
+    await bus.publish("u1", ProgressKind.ITEM_READY, {"order": 0})
+    (seen,) = await first_event
+    await first.aclose()
+    await bus.publish("u1", ProgressKind.ITEM_READY, {"order": 1})
+    await bus.publish("u1", ProgressKind.ITEM_READY, {"order": 2})
+    await pending
+
+    again = hub.subscribe("u1", last_event_id=seen.id)
+    events = await take(again, 2)
+    await bus.publish("u1", ProgressKind.ITEM_READY, {"order": 3})
+    events += await take(again, 1)
+
+    assert [e.data["order"] for e in events] == [1, 2, 3]
+    await again.aclose()
+    await keep.aclose()
+    await hub.aclose()
+
+
+async def test_heartbeat_and_best_effort_publish():
+    class BrokenBus(RedisProgressBus):
+        async def publish(self, user_id, kind, data):
+            raise ConnectionError("redis down")
+
+    hub = ProgressHub(BrokenBus(fakeredis.FakeAsyncRedis()), block=0.05)
+    stream = hub.subscribe("u1", heartbeat=0.01)
+    assert await take(stream, 1) == [None]
+
+    await publish_progress(hub.bus, "u1", ProgressKind.ITEM_READY, {})
+    await publish_progress(None, "u1", ProgressKind.ITEM_READY, {})
+    await stream.aclose()
+    await hub.aclose()
@@ -0,0 +1,10 @@
+from src.lib.utils import SSETextEncoder, sse
+
+
+def test_encoder_matches_sse():
+    encoder = SSETextEncoder()
+    for ev, text in [("chunk", "Hi"), ("chunk", 'a "quoted"\nline ✓'), ("done", "")]:
+        data = {"text": text, "msg_id": "m1", "i": 0, "status": ev}
+        assert encoder.encode(ev, text, msg_id="m1", i=0, status=ev) == sse(ev, data)
+
+    assert encoder.encode("ping", "x") == sse("ping", {"text": "x"})
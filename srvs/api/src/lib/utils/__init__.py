@@ -1,4 +1,4 @@
-from .sse import sse
+from .sse import sse, SSETextEncoder, SSE_PING
 from .extract_pr import extract_pr_id_from_coolify_url
 from .cache_key import cache_key_extra_body, cache_key
 from .update_span_with_result import update_span_with_result
@@ -6,4 +6,5 @@ from .case_conversion import (
     snake_to_camel,
     camel_to_snake,
 )
-from .nanoid import genID
+from .nanoid import genID, PB_ID
+from .markers import replace_markers
@@ -0,0 +1,35 @@
+"""Single-pass marker substitution shared by text rewriting sites."""
+
+import re
+from functools import lru_cache
+from typing import Mapping
+
+
+@lru_cache(maxsize=64)
+def _compile(markers: tuple[str, ...]) -> re.Pattern[str]:
+    # Longest first so that a marker never loses to one of its own prefixes
+    # (e.g. "{img1}" must not win over "{img10}").
+    ordered = sorted(markers, key=len, reverse=True)
+    return re.compile("|".join(re.escape(m) for m in ordered))
+
+
+def replace_markers(text: str, replacements: Mapping[str, str]) -> str:
+    """
+    Replace every marker from `replacements` in one scan over `text`.
+
+    Unlike chained `str.replace`, the text is walked and copied once no matter
+    how many markers there are, and replaced values are never rescanned.
+
+    Args:
+        text: Source text
+        replacements: Mapping marker -> replacement value
+
+    Returns:
+        Text with all markers substituted
+    """
+    markers = tuple(m for m in replacements if m)
+    if not text or not markers:
+        return text
+
+    pattern = _compile(markers)
+    return pattern.sub(lambda m: replacements[m.group(0)], text)
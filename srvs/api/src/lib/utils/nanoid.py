@@ -1,5 +1,10 @@
+import re
+
 from nanoid import generate
 
+# PocketBase record ids (and genID output)
+PB_ID = re.compile(r"^[a-z0-9]{15}$")
+
 
 def genID() -> str:
     return generate("abcdefghijklmnopqrstuvwxyz0123456789", 15)
@@ -2,5 +2,36 @@ import json
 from typing import Any
 
 
-def sse(ev: str, data: dict[str, Any]) -> str:
+def sse(ev: str, data: dict[str, Any], id: str | None = None) -> str:
+    if id:
+        return f"id: {id}\nevent: {ev}\ndata: {json.dumps(data)}\n\n"
     return f"event: {ev}\ndata: {json.dumps(data)}\n\n"
+
+
+# Comment frame: keeps idle connections open through proxies
+SSE_PING = ": ping\n\n"
+
+
+class SSETextEncoder:
+    """
+    Encodes `{"text": ..., **fields}` events of one stream.
+
+    Everything around the text is serialised once per distinct event and
+    fields and reused, so a frame costs one json.dumps of the text. The
+    output is identical to sse(ev, {"text": text, **fields}).
+    """
+
+    def __init__(self):
+        self._frames: dict[tuple, tuple[str, str]] = {}
+
+    def encode(self, ev: str, text: str, **fields: Any) -> str:
+        key = (ev, *fields.items())
+        frame = self._frames.get(key)
+        if frame is None:
+            rest = json.dumps(fields)[1:]
+            frame = (
+                f'event: {ev}\ndata: {{"text": ',
+                (f", {rest}" if fields else "}") + "\n\n",
+            )
+            self._frames[key] = frame
+        return frame[0] + json.dumps(text) + frame[1]
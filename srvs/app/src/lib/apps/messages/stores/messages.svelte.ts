@@ -58,9 +58,8 @@ class MessagesStore {
 			itemId
 		});
 
+		// The API stores this message together with the AI reply
 		this.messages.push(clientMsg);
-		const msg = { ...clientMsg, status: 'final' };
-		await pb!.collection('messages').create(msg);
 
 		const es = new EventSource(
 			`${computeApiUrl()}quizes/${quizId}/attempts/${attemptId}/messages/sse?q=${encodeURIComponent(content)}&item=${itemId}`,